@@ -4,6 +4,14 @@ import pytest
 from pathlib import Path
 from datetime import date
 
+from agents.tests.lib.skill_registry import SkillRegistry
+
+pytest_plugins = [
+    "agents.tests.lib.perf_plugin",
+    "agents.tests.lib.parallel_plugin",
+    "pytester",
+]
+
 
 @pytest.fixture
 def skills_dir():
@@ -11,6 +19,12 @@ def skills_dir():
     return Path.home() / ".claude" / "skills"
 
 
+@pytest.fixture(scope="session")
+def skill_registry():
+    """Get a skill index shared by every test in the session."""
+    return SkillRegistry()
+
+
 @pytest.fixture
 def daily_log_dir():
     """Get the daily log directory path."""
@@ -97,3 +111,13 @@ Follow these steps:
 2. Generate appropriate output
 3. Return the result
 """
+
+
+@pytest.fixture
+def mock_skills_dir(tmp_path, mock_skill_content):
+    """Get a temporary skills directory containing ``test-skill``."""
+    skills_dir = tmp_path / "skills"
+    skill_dir = skills_dir / "test-skill"
+    skill_dir.mkdir(parents=True)
+    (skill_dir / "SKILL.md").write_text(mock_skill_content)
+    return skills_dir
@@ -0,0 +1 @@
+"""Tests for the agent runner library."""
@@ -0,0 +1,410 @@
+"""Tests for AgentRunner execution modes."""
+
+import asyncio
+
+import pytest
+
+from agents.tests.lib import (
+    AgentRunner,
+    FinalResult,
+    MockQuery,
+    MockSDKMessage,
+    MockTextBlock,
+    MockToolUse,
+    TextDelta,
+    ToolCallStarted,
+    create_callable_mock,
+    create_mock,
+)
+from agents.tests.lib.mock_client import MockResponse
+from agents.tests.lib.validators import (
+    SecurityValidator,
+    StreamingSecurityValidator,
+    StreamingTemplateValidator,
+)
+
+
+class SlowMockClient:
+    """Mock client that sleeps before answering and tracks concurrency.
+
+    ``events`` records ``("start", request)`` and ``("end", request)`` in
+    the order they happen.
+    """
+
+    def __init__(self, delay: float = 0.05, slow_requests=()):
+        self.delay = delay
+        self.slow_requests = set(slow_requests)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled = 0
+        self.events = []
+
+    async def submit(self, prompt: str):
+        request = prompt.rsplit("User request: ", 1)[1]
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.events.append(("start", request))
+        try:
+            await asyncio.sleep(10 if request in self.slow_requests else self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        self.events.append(("end", request))
+        return MockResponse(content=f"echo: {request}")
+
+
+async def wait_for_in_flight(client: SlowMockClient, count: int):
+    """Yield to the loop until ``count`` requests are in flight."""
+    while client.in_flight < count:
+        await asyncio.sleep(0)
+
+
+class TestExecuteMany:
+    """Test concurrent batch execution."""
+
+    @pytest.mark.asyncio
+    async def test_preserves_order_and_bounds_concurrency(self, mock_skills_dir):
+        """Results come back in input order with at most N in flight."""
+        client = SlowMockClient(delay=0.05)
+        runner = AgentRunner("test-skill", skills_dir=mock_skills_dir, mock_client=client)
+        requests = [f"req-{i}" for i in range(8)]
+
+        batch = await runner.execute_many(requests, concurrency=4)
+
+        assert [r.output for r in batch.results] == [f"echo: {r}" for r in requests]
+        assert batch.success
+        assert client.max_in_flight == 4
+        assert len(batch.latencies_ms) == 8
+        # The first four overlap (all start before any finishes) and a
+        # later request only starts once another has ended
+        assert client.events[:5] == [("start", r) for r in requests[:4]] + [("end", "req-0")]
+        running = 0
+        for kind, _ in client.events:
+            running += 1 if kind == "start" else -1
+            assert running <= 4
+
+    @pytest.mark.asyncio
+    async def test_per_request_timeout(self, mock_skills_dir):
+        """A request exceeding the timeout fails without sinking the batch."""
+        client = SlowMockClient(delay=0, slow_requests={"stuck"})
+        runner = AgentRunner("test-skill", skills_dir=mock_skills_dir, mock_client=client)
+
+        batch = await runner.execute_many(["ok-1", "stuck", "ok-2"], timeout=0.2)
+
+        assert [r.success for r in batch.results] == [True, False, True]
+        assert "Timed out" in batch.results[1].error
+        assert client.cancelled == 1
+        assert not batch.success
+
+    @pytest.mark.asyncio
+    async def test_cancellation_propagates(self, mock_skills_dir):
+        """Cancelling the batch cancels every in-flight request."""
+        client = SlowMockClient(slow_requests={"a", "b", "c"})
+        runner = AgentRunner("test-skill", skills_dir=mock_skills_dir, mock_client=client)
+
+        task = asyncio.ensure_future(runner.execute_many(["a", "b", "c"], concurrency=2))
+        await wait_for_in_flight(client, 2)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert client.cancelled == 2
+        assert client.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_zero_concurrency(self, mock_skills_dir):
+        """Concurrency must be positive."""
+        runner = AgentRunner("test-skill", skills_dir=mock_skills_dir)
+
+        with pytest.raises(ValueError):
+            await runner.execute_many(["x"], concurrency=0)
+
+
+def tool_run_query(delay: float = 0.0) -> MockQuery:
+    """Three-message SDK stream with two tool calls."""
+    return MockQuery([
+        MockSDKMessage(
+            content=[MockTextBlock("Checking the log file")],
+            tool_uses=[MockToolUse("Read", {"file_path": "daily-logs/2026/2026-03.md"}, "contents")],
+        ),
+        MockSDKMessage(
+            content=[MockTextBlock("Appending entry")],
+            tool_uses=[MockToolUse("Edit", {"file_path": "daily-logs/2026/2026-03.md"}, "ok")],
+        ),
+        MockSDKMessage(content=[MockTextBlock("Logged the session")], duration_ms=42),
+    ], delay=delay)
+
+
+class TestStream:
+    """Test incremental event streaming."""
+
+    @pytest.mark.asyncio
+    async def test_sdk_event_order(self, mock_skills_dir):
+        """Events arrive per message and tool calls finish on the next message."""
+        runner = AgentRunner("test-skill", skills_dir=mock_skills_dir, query_fn=tool_run_query())
+
+        events = [event async for event in runner.stream("log it")]
+        kinds = [
+            (type(e).__name__, getattr(e, "text", None) or getattr(getattr(e, "tool_call", None), "tool_name", None))
+            for e in events[:-1]
+        ]
+
+        assert kinds == [
+            ("TextDelta", "Checking the log file"),
+            ("ToolCallStarted", "Read"),
+            ("ToolCallFinished", "Read"),
+            ("TextDelta", "Appending entry"),
+            ("ToolCallStarted", "Edit"),
+            ("ToolCallFinished", "Edit"),
+            ("TextDelta", "Logged the session"),
+        ]
+        assert isinstance(events[-1], FinalResult)
+        result = events[-1].result
+        assert result.output == "Logged the session"
+        assert result.duration_ms == 42
+        assert [c.tool_name for c in result.tool_calls] == ["Read", "Edit"]
+        assert result.messages is None
+
+    @pytest.mark.asyncio
+    async def test_execute_matches_stream(self, mock_skills_dir):
+        """execute() returns the stream's final result, optionally with messages."""
+        runner = AgentRunner("test-skill", skills_dir=mock_skills_dir, query_fn=tool_run_query())
+
+        result = await runner.execute("log it", keep_messages=True)
+
+        assert result.success
+        assert result.output == "Logged the session"
+        assert len(result.messages) == 3
+
+    @pytest.mark.asyncio
+    async def test_early_exit_closes_sdk_stream(self, mock_skills_dir):
+        """Stopping iteration closes the underlying query stream."""
+        query = tool_run_query()
+        runner = AgentRunner("test-skill", skills_dir=mock_skills_dir, query_fn=query)
+
+        events = runner.stream("log it")
+        async for event in events:
+            if isinstance(event, ToolCallStarted):
+                break
+        await events.aclose()
+
+        assert query.closed
+        assert query.yielded == 1
+
+    @pytest.mark.asyncio
+    async def test_mock_client_stream(self, mock_skills_dir):
+        """Mock runs emit a single text delta and a final result."""
+        runner = AgentRunner("test-skill", skills_dir=mock_skills_dir, mock_client=create_mock("hi"))
+
+        events = [event async for event in runner.stream("x")]
+
+        assert [type(e) for e in events] == [TextDelta, FinalResult]
+        assert events[-1].result.output == "hi"
+
+    @pytest.mark.asyncio
+    async def test_missing_skill_reported_in_final_result(self, tmp_path):
+        """Setup errors surface as a failed final result, not an exception."""
+        runner = AgentRunner("missing", skills_dir=tmp_path)
+
+        events = [event async for event in runner.stream("x")]
+
+        assert len(events) == 1
+        assert not events[0].result.success
+        assert "Skill not found" in events[0].result.error
+
+
+class TestEarlyAbort:
+    """Test validators that stop a run on the first violation."""
+
+    @pytest.mark.security
+    @pytest.mark.asyncio
+    async def test_aborts_on_bad_tool_call(self, mock_skills_dir):
+        """A rejected tool parameter stops the stream before later messages."""
+        query = MockQuery([
+            MockSDKMessage(tool_uses=[MockToolUse("Read", {"file_path": "../../etc/passwd"})]),
+            MockSDKMessage(content=[MockTextBlock("never reached")]),
+        ])
+        runner = AgentRunner(
+            "test-skill",
+            skills_dir=mock_skills_dir,
+            query_fn=query,
+            validators=[SecurityValidator.no_path_traversal],
+        )
+
+        result = await runner.execute("read it")
+
+        assert not result.success
+        assert result.aborted.validator == "SecurityValidator.no_path_traversal"
+        assert result.aborted.target == "tool_call"
+        assert result.aborted.value == "../../etc/passwd"
+        assert result.aborted.tool_call.tool_name == "Read"
+        assert result.aborted.event_index == 0
+        assert query.yielded == 1
+        assert query.closed
+
+    @pytest.mark.security
+    @pytest.mark.asyncio
+    async def test_checks_nested_parameters(self, mock_skills_dir):
+        """Strings nested in lists and dicts are validated too."""
+        query = MockQuery([
+            MockSDKMessage(tool_uses=[
+                MockToolUse("Bash", {"command": "ls", "env": {"X": ["ok", "$(rm -rf /)"]}})
+            ]),
+        ])
+        runner = AgentRunner(
+            "test-skill",
+            skills_dir=mock_skills_dir,
+            query_fn=query,
+            validators=[SecurityValidator.no_command_injection],
+        )
+
+        result = await runner.execute("run it")
+
+        assert result.aborted.value == "$(rm -rf /)"
+
+    @pytest.mark.asyncio
+    async def test_text_validators(self, mock_skills_dir):
+        """Text validators see each delta and keep partial output."""
+        runner = AgentRunner(
+            "test-skill",
+            skills_dir=mock_skills_dir,
+            query_fn=tool_run_query(),
+            text_validators=[lambda text: "Appending" not in text],
+        )
+
+        result = await runner.execute("log it")
+
+        assert result.aborted.target == "text"
+        assert result.output == "Appending entry"
+        assert [c.tool_name for c in result.tool_calls] == ["Read"]
+        assert "Validation failed" in result.error
+
+    @pytest.mark.asyncio
+    async def test_passing_run_is_unchanged(self, mock_skills_dir):
+        """Validators that pass leave the result identical to an unchecked run."""
+        runner = AgentRunner(
+            "test-skill",
+            skills_dir=mock_skills_dir,
+            query_fn=tool_run_query(),
+            validators=[SecurityValidator.no_command_injection],
+        )
+
+        result = await runner.execute("log it")
+
+        assert result.success
+        assert result.aborted is None
+        assert result.output == "Logged the session"
+
+    @pytest.mark.asyncio
+    async def test_applies_to_mock_client(self, mock_skills_dir):
+        """Mock-client runs are validated the same way."""
+        runner = AgentRunner(
+            "test-skill",
+            skills_dir=mock_skills_dir,
+            mock_client=create_mock("run `rm -rf /`"),
+            text_validators=[SecurityValidator.no_command_injection],
+        )
+
+        result = await runner.execute("x")
+
+        assert not result.success
+        assert result.aborted.validator == "SecurityValidator.no_command_injection"
+
+    @pytest.mark.asyncio
+    async def test_streaming_validator_aborts_on_feed(self, mock_skills_dir):
+        """Streaming validators reject text as soon as it is fed."""
+        runner = AgentRunner(
+            "test-skill",
+            skills_dir=mock_skills_dir,
+            mock_client=create_mock("run `rm -rf /`"),
+            text_validators=[StreamingSecurityValidator()],
+        )
+
+        result = await runner.execute("x")
+
+        assert not result.success
+        assert result.aborted.validator == "StreamingSecurityValidator"
+
+    @pytest.mark.asyncio
+    async def test_streaming_validator_checked_at_end(self, mock_skills_dir):
+        """finish() runs when the stream ends, failing incomplete output."""
+        runner = AgentRunner(
+            "test-skill",
+            skills_dir=mock_skills_dir,
+            mock_client=create_mock("## Main Objectives\nonly one section"),
+            text_validators=[StreamingTemplateValidator()],
+        )
+
+        result = await runner.execute("x")
+
+        assert not result.success
+        assert result.aborted.validator == "StreamingTemplateValidator"
+        assert result.output == "## Main Objectives\nonly one section"
+
+    @pytest.mark.asyncio
+    async def test_streaming_validator_state_is_per_run(self, mock_skills_dir):
+        """Concurrent runs each validate with their own fresh copy."""
+        shared = StreamingTemplateValidator(["Done"])
+        runner = AgentRunner(
+            "test-skill",
+            skills_dir=mock_skills_dir,
+            mock_client=create_callable_mock(
+                lambda prompt: "Done" if prompt.endswith("ok") else "Nope"
+            ),
+            text_validators=[shared],
+        )
+
+        batch = await runner.execute_many(["ok", "bad", "ok"])
+
+        assert [r.success for r in batch.results] == [True, False, True]
+        assert not shared.found
+
+
+class TestTiming:
+    """Test the per-phase timing breakdown."""
+
+    @pytest.mark.asyncio
+    async def test_sdk_timing_breakdown(self, mock_skills_dir):
+        """SDK runs report first-message, first-tool and per-tool latency."""
+        runner = AgentRunner(
+            "test-skill", skills_dir=mock_skills_dir, query_fn=tool_run_query(delay=0.05)
+        )
+
+        result = await runner.execute("log it")
+        timing = result.timing
+
+        assert timing.skill_load_ms >= 0
+        assert timing.prompt_build_ms >= 0
+        # The first message carries the first tool call; each call lasts
+        # until the next message, which arrives after the mock's delay
+        assert timing.first_tool_call_ms == timing.first_message_ms
+        assert len(timing.tool_call_ms) == 2
+        assert all(ms >= 40 for ms in timing.tool_call_ms)
+        assert [c.duration_ms for c in result.tool_calls] == timing.tool_call_ms
+        assert timing.first_message_ms + sum(timing.tool_call_ms) <= timing.total_ms
+        # The SDK-reported duration is kept when present
+        assert result.duration_ms == 42
+
+    @pytest.mark.asyncio
+    async def test_mock_timing(self, mock_skills_dir):
+        """Mock runs are timed too, and get a measured duration_ms."""
+        runner = AgentRunner("test-skill", skills_dir=mock_skills_dir, mock_client=create_mock("ok"))
+
+        result = await runner.execute("x")
+
+        assert result.timing.first_message_ms is not None
+        assert result.timing.first_tool_call_ms is None
+        assert result.timing.tool_call_ms == []
+        assert result.timing.total_ms >= result.timing.first_message_ms
+        assert result.duration_ms == round(result.timing.total_ms)
+
+    @pytest.mark.asyncio
+    async def test_failed_setup_is_timed(self, tmp_path):
+        """Runs that fail before reaching the model still report total time."""
+        result = await AgentRunner("missing", skills_dir=tmp_path).execute("x")
+
+        assert not result.success
+        assert result.timing.total_ms is not None
+        assert result.timing.skill_load_ms is None
@@ -0,0 +1,81 @@
+"""Tests for the capture library."""
+
+import io
+import os
+from datetime import datetime
+
+import pytest
+
+from agents.tests.lib.capture import Note, capture, capture_batch, read_jsonl, slugify
+
+
+AT = datetime(2026, 4, 1, 9, 30)
+
+
+class TestNaming:
+    """Test slugs and filenames."""
+
+    def test_slugify(self):
+        """Test the slug keeps the first five words."""
+        assert slugify("Fix the CI pipeline's flaky test today please!") == "fix-the-ci-pipeline-s"
+        assert slugify("  ?? ") == "note"
+
+    def test_single_capture(self, tmp_path):
+        """Test one note gets the timestamp-slug name and frontmatter."""
+        path = capture("Read the SQLite WAL docs", tmp_path, AT)
+
+        assert path.name == "2026-04-01-0930-read-the-sqlite-wal-docs.md"
+        assert path.read_text() == "---\ncaptured: 2026-04-01 09:30\n---\n\nRead the SQLite WAL docs\n"
+
+
+class TestBatch:
+    """Test batched capture."""
+
+    def test_collisions(self, tmp_path):
+        """Test duplicate names get suffixes, including against existing files."""
+        (tmp_path / "2026-04-01-0930-same-note.md").write_text("old")
+
+        paths = capture_batch([Note("same note", AT), Note("Same note!", AT), Note("", AT)], tmp_path)
+
+        assert [p.name for p in paths] == ["2026-04-01-0930-same-note-2.md", "2026-04-01-0930-same-note-3.md"]
+        assert (tmp_path / "2026-04-01-0930-same-note.md").read_text() == "old"
+        assert paths[1].read_text().endswith("\nSame note!\n")
+
+    def test_collision_after_assignment(self, tmp_path, monkeypatch):
+        """Test a name taken after assignment moves to the next suffix, not ``-2-2``."""
+        (tmp_path / "2026-04-01-0930-same-note.md").write_text("old")
+        listdir = os.listdir
+
+        def listdir_then_race(path):
+            names = listdir(path)
+            (tmp_path / "2026-04-01-0930-same-note-2.md").write_text("racer")
+            return names
+
+        monkeypatch.setattr(os, "listdir", listdir_then_race)
+        paths = capture_batch([Note("same note", AT)], tmp_path)
+
+        assert [p.name for p in paths] == ["2026-04-01-0930-same-note-3.md"]
+        assert (tmp_path / "2026-04-01-0930-same-note-2.md").read_text() == "racer"
+
+    def test_many_notes(self, tmp_path):
+        """Test a large batch writes every note exactly once."""
+        notes = [Note(f"note number {i}", AT) for i in range(500)] + [Note("dup", AT)] * 20
+
+        paths = capture_batch(notes, tmp_path, workers=16)
+
+        assert len(set(paths)) == len(paths) == 520
+        assert len(list(tmp_path.iterdir())) == 520
+
+    def test_read_jsonl(self):
+        """Test JSON lines with and without timestamps."""
+        notes = read_jsonl(io.StringIO('{"text": "a", "captured": "2026-04-01T09:30"}\n\n{"text": "b"}\n'))
+
+        assert [(n.text, n.captured == AT) for n in notes] == [("a", True), ("b", False)]
+        with pytest.raises(ValueError, match="line 1"):
+            read_jsonl(io.StringIO('{"note": "a"}\n'))
+
+    @pytest.mark.parametrize("line", ['{"text": 5}', '{"text": null}', '{"text": ["a"]}', '"a"'])
+    def test_read_jsonl_rejects_non_string_text(self, line):
+        """Test a non-string ``text`` is reported with its line number."""
+        with pytest.raises(ValueError, match="line 2"):
+            read_jsonl(io.StringIO('{"text": "ok"}\n' + line + "\n"))
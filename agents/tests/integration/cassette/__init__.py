@@ -0,0 +1 @@
+"""Tests for the SDK record/replay cassette."""
@@ -0,0 +1,154 @@
+"""Tests for recording and replaying SDK message streams."""
+
+import time
+
+import pytest
+
+from agents.tests.lib import (
+    AgentRunner,
+    Cassette,
+    MockQuery,
+    MockSDKMessage,
+    MockTextBlock,
+    MockToolUse,
+)
+
+
+def fake_query(delay: float = 0.0) -> MockQuery:
+    """Two-message stream: a tool call, then the final answer."""
+    return MockQuery([
+        MockSDKMessage(
+            content=[MockTextBlock("Reading the log")],
+            tool_uses=[MockToolUse("Read", {"file_path": "daily-logs/2026/2026-03.md"}, "ok")],
+        ),
+        MockSDKMessage(
+            content=[MockTextBlock("Done: "), MockTextBlock("logged")],
+            duration_ms=1234,
+        ),
+    ], delay=delay)
+
+
+def make_runner(skills_dir, cassette, query_fn):
+    return AgentRunner(
+        "test-skill", skills_dir=skills_dir, cassette=cassette, query_fn=query_fn
+    )
+
+
+class TestCassette:
+    """Test cassette record and replay through AgentRunner."""
+
+    @pytest.mark.asyncio
+    async def test_record_then_replay(self, mock_skills_dir, tmp_path):
+        """A recorded run replays identically without calling the live query."""
+        cassette = Cassette(tmp_path / "cassettes", mode="auto")
+        live = fake_query()
+
+        recorded = await make_runner(mock_skills_dir, cassette, live).execute("log it")
+        replayed = await make_runner(mock_skills_dir, cassette, live).execute("log it")
+
+        assert live.calls == 1
+        assert recorded.success and replayed.success
+        assert replayed.output == recorded.output == "Done: logged"
+        assert replayed.duration_ms == 1234
+        assert [(c.tool_name, c.parameters, c.result) for c in replayed.tool_calls] == [
+            ("Read", {"file_path": "daily-logs/2026/2026-03.md"}, "ok")
+        ]
+        assert len(list((tmp_path / "cassettes").glob("*.json.gz"))) == 1
+
+    @pytest.mark.asyncio
+    async def test_different_prompt_is_a_new_recording(self, mock_skills_dir, tmp_path):
+        """Keys depend on the prompt, so new requests hit the live stream."""
+        cassette = Cassette(tmp_path, mode="auto")
+        live = fake_query()
+
+        await make_runner(mock_skills_dir, cassette, live).execute("first")
+        await make_runner(mock_skills_dir, cassette, live).execute("second")
+
+        assert live.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_replay_mode_miss_fails(self, mock_skills_dir, tmp_path):
+        """Replay-only mode reports a missing recording instead of going live."""
+        live = fake_query()
+        runner = make_runner(mock_skills_dir, Cassette(tmp_path, mode="replay"), live)
+
+        result = await runner.execute("never recorded")
+
+        assert not result.success
+        assert "No cassette recording" in result.error
+        assert live.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_record_mode_overwrites(self, mock_skills_dir, tmp_path):
+        """Record mode always goes live even when a recording exists."""
+        live = fake_query()
+        cassette = Cassette(tmp_path, mode="record")
+
+        await make_runner(mock_skills_dir, cassette, live).execute("again")
+        await make_runner(mock_skills_dir, cassette, live).execute("again")
+
+        assert live.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_time_scale(self, mock_skills_dir, tmp_path):
+        """Original delays are dropped at scale 0 and reproduced at scale 1."""
+        await make_runner(mock_skills_dir, Cassette(tmp_path), fake_query(delay=0.2)).execute("slow")
+
+        started = time.monotonic()
+        await make_runner(mock_skills_dir, Cassette(tmp_path, time_scale=0), None).execute("slow")
+        instant = time.monotonic() - started
+
+        started = time.monotonic()
+        await make_runner(mock_skills_dir, Cassette(tmp_path, time_scale=1), None).execute("slow")
+        realtime = time.monotonic() - started
+
+        assert instant < 0.1
+        assert realtime >= 0.15
+
+    @pytest.mark.asyncio
+    async def test_aborted_recording_closes_live_stream(self, tmp_path):
+        """Stopping a recording early closes the live stream and saves nothing."""
+        cassette = Cassette(tmp_path, mode="record")
+        closed = []
+
+        async def live():
+            try:
+                for n in range(3):
+                    yield n
+            finally:
+                closed.append(True)
+
+        stream = cassette.stream("p", {}, live)
+        assert await stream.__anext__() == 0
+        await stream.aclose()
+
+        assert closed == [True]
+        assert list(tmp_path.iterdir()) == []
+
+    def test_key_ignores_home_directory(self, tmp_path, monkeypatch):
+        """Recordings are portable across machines with different homes."""
+        cassette = Cassette(tmp_path)
+
+        monkeypatch.setenv("HOME", "/home/alice")
+        key_a = cassette.key("p", {"cwd": "/home/alice/.claude"})
+        monkeypatch.setenv("HOME", "/Users/bob")
+        key_b = cassette.key("p", {"cwd": "/Users/bob/.claude"})
+
+        assert key_a == key_b
+
+    def test_from_env(self, tmp_path, monkeypatch):
+        """AGENT_CASSETTE_* variables configure a default cassette."""
+        monkeypatch.delenv("AGENT_CASSETTE_DIR", raising=False)
+        assert Cassette.from_env() is None
+
+        monkeypatch.setenv("AGENT_CASSETTE_DIR", str(tmp_path))
+        monkeypatch.setenv("AGENT_CASSETTE_MODE", "replay")
+        cassette = Cassette.from_env()
+
+        assert cassette.directory == tmp_path
+        assert cassette.mode == "replay"
+
+    def test_rejects_unknown_mode(self, tmp_path):
+        """Invalid modes fail fast."""
+        with pytest.raises(ValueError):
+            Cassette(tmp_path, mode="rewind")
@@ -12,12 +12,21 @@ import pytest
 from pathlib import Path
 from datetime import date
 
-from agents.tests.lib import AgentRunner, create_mock, create_sequence_mock
+from agents.tests.lib import (
+    AgentRunner,
+    MockQuery,
+    MockSDKMessage,
+    MockTextBlock,
+    MockToolUse,
+    create_mock,
+    create_sequence_mock,
+)
 from agents.tests.lib.validators import (
     TemplateValidator,
     MarkdownValidator,
     SecurityValidator,
-    FileStructureValidator
+    FileStructureValidator,
+    AppendSnapshot,
 )
 
 
@@ -232,6 +241,30 @@ class TestDailyLogSecurity:
         # Response should not contain dangerous patterns
         assert SecurityValidator.no_command_injection(result.output)
 
+    @pytest.mark.security
+    @pytest.mark.asyncio
+    async def test_aborts_on_path_traversal_tool_call(self):
+        """Verify a traversing Write stops the run before any further turns."""
+        query = MockQuery([
+            MockSDKMessage(
+                content=[MockTextBlock("Writing the log entry")],
+                tool_uses=[MockToolUse("Write", {"file_path": "../../etc/passwd", "content": "x"})],
+            ),
+            MockSDKMessage(content=[MockTextBlock("Session logged")]),
+        ])
+
+        runner = AgentRunner(
+            skill_name="daily-log",
+            query_fn=query,
+            validators=[SecurityValidator.no_path_traversal],
+        )
+
+        result = await runner.execute("Log session ../../etc/passwd")
+
+        assert not result.success
+        assert result.aborted.tool_call.tool_name == "Write"
+        assert query.yielded == 1
+
 
 class TestDailyLogFileOperations:
     """Test file operation behaviors."""
@@ -239,14 +272,21 @@ class TestDailyLogFileOperations:
     @pytest.mark.asyncio
     async def test_appends_to_end_of_file(self, tmp_path):
         """TC-006: Verify new entries are appended to end, not inserted in middle."""
-        # This would require actual file operations
-        # For now, test the validator logic
         original = "## 2024-02-04\n\nOld content\n"
         insertion = "\n## 2024-02-05\n\nNew content\n"
         new_content = original + insertion
 
         assert MarkdownValidator.appends_to_end(original, new_content, insertion)
 
+        # Same check against the file on disk
+        log_file = tmp_path / "2024-02.md"
+        log_file.write_text(original)
+        snapshot = AppendSnapshot.capture(log_file)
+        with open(log_file, "a") as f:
+            f.write(insertion)
+
+        assert snapshot.verify(insertion, full=True)
+
     @pytest.mark.asyncio
     async def test_creates_directory_structure(self):
         """Verify skill creates YYYY/ directory if it doesn't exist."""
@@ -0,0 +1,124 @@
+"""Tests for the daily-log export."""
+
+import os
+from datetime import date
+
+import pytest
+import yaml
+
+from agents.tests.lib.daily_log_export import export_daily_logs
+
+
+MARCH = """# Daily Logs - March 2026
+
+## 2026-03-02
+
+**Duration:** 1 hour
+**Main Objective:** Fix the front-end build; add tests
+**Success Rating:** 9/10
+
+### What We Accomplished
+- Fixed the build
+
+---
+
+**Duration:** 30 minutes
+**Main Objective:** Review claude-config changes
+**Success Rating:** 8.5/10
+"""
+
+APRIL = """## 2026-04-01
+
+**Main Objective:** Plan the quarter
+"""
+
+
+@pytest.fixture
+def logs(tmp_path):
+    year = tmp_path / "logs" / "2026"
+    year.mkdir(parents=True)
+    (year / "2026-03.md").write_text(MARCH)
+    (year / "2026-04.md").write_text(APRIL)
+    return tmp_path / "logs"
+
+
+def read_session(path):
+    _, frontmatter, body = path.read_text().split("---\n", 2)
+    return yaml.safe_load(frontmatter), body
+
+
+class TestExport:
+    """Test splitting monthly logs into session files."""
+
+    def test_session_files(self, logs, tmp_path):
+        """Test each session gets a file with frontmatter."""
+        dest = tmp_path / "site"
+
+        stats = export_daily_logs(dest, logs, workers=1, repo_names=["front-end", "claude-config"])
+        assert (stats.months, stats.written) == (2, 3)
+
+        frontmatter, body = read_session(dest / "2026" / "03" / "2026-03-02-session-1.md")
+        assert frontmatter == {
+            "title": "Fix the front-end build",
+            "date": date(2026, 3, 2),
+            "session": 1,
+            "duration": "1 hour",
+            "rating": 9,
+            "objective": "Fix the front-end build; add tests",
+            "repos": ["front-end"],
+        }
+        assert "- Fixed the build" in body
+
+        second, _ = read_session(dest / "2026" / "03" / "2026-03-02-session-2.md")
+        assert (second["rating"], second["repos"]) == (8.5, ["claude-config"])
+
+        unrated, _ = read_session(dest / "2026" / "04" / "2026-04-01-session-1.md")
+        assert "rating" not in unrated and "repos" not in unrated
+
+    def test_rerun_skips_unchanged_months(self, logs, tmp_path):
+        """Test a second run reads nothing and writes nothing."""
+        dest = tmp_path / "site"
+        export_daily_logs(dest, logs, workers=1, repo_names=[])
+        manifest_mtime = (dest / ".export-manifest.json").stat().st_mtime_ns
+
+        stats = export_daily_logs(dest, logs, workers=1, repo_names=[])
+        assert (stats.months, stats.months_unchanged, stats.written) == (0, 2, 0)
+        assert (dest / ".export-manifest.json").stat().st_mtime_ns == manifest_mtime
+
+    def test_append_rewrites_only_new_session(self, logs, tmp_path):
+        """Test appending a session writes just that session's file."""
+        dest = tmp_path / "site"
+        export_daily_logs(dest, logs, workers=1, repo_names=[])
+        first = dest / "2026" / "03" / "2026-03-02-session-1.md"
+        first_mtime = first.stat().st_mtime_ns
+
+        with open(logs / "2026" / "2026-03.md", "a") as f:
+            f.write("\n## 2026-03-03\n\n**Main Objective:** Ship it\n")
+        stats = export_daily_logs(dest, logs, workers=1, repo_names=[])
+
+        assert (stats.months, stats.months_unchanged) == (1, 1)
+        assert (stats.written, stats.unchanged) == (1, 2)
+        assert (dest / "2026" / "03" / "2026-03-03-session-1.md").exists()
+        assert first.stat().st_mtime_ns == first_mtime
+
+    def test_removed_sessions_deleted(self, logs, tmp_path):
+        """Test sessions dropped from a log lose their files."""
+        dest = tmp_path / "site"
+        export_daily_logs(dest, logs, workers=1, repo_names=[])
+
+        (logs / "2026" / "2026-03.md").write_text(MARCH.split("---")[0])
+        os.remove(logs / "2026" / "2026-04.md")
+        stats = export_daily_logs(dest, logs, workers=1, repo_names=[])
+
+        assert stats.removed == 2
+        assert sorted(p.name for p in dest.rglob("*.md")) == ["2026-03-02-session-1.md"]
+
+    def test_process_pool_matches_in_process(self, logs, tmp_path):
+        """Test parallel export produces the same files."""
+        export_daily_logs(tmp_path / "serial", logs, workers=1, repo_names=["front-end"])
+        stats = export_daily_logs(tmp_path / "parallel", logs, workers=2, repo_names=["front-end"])
+
+        serial = {p.relative_to(tmp_path / "serial"): p.read_text() for p in (tmp_path / "serial").rglob("*.md")}
+        parallel = {p.relative_to(tmp_path / "parallel"): p.read_text() for p in (tmp_path / "parallel").rglob("*.md")}
+        assert stats.written == 3
+        assert serial == parallel
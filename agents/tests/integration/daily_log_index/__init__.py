@@ -0,0 +1 @@
+"""Tests for the daily-log sidecar index."""
@@ -0,0 +1,182 @@
+"""Tests for the daily-log sidecar index."""
+
+import os
+import shutil
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+from agents.tests.lib.daily_log_index import DailyLogIndex, index_path_for
+from agents.tests.lib.daily_log_parser import iter_sessions
+
+
+REPO_LOGS = Path(__file__).resolve().parents[4] / "daily-logs"
+
+SESSION = """
+### Session Overview
+**Duration:** 1 hour
+**Main Objective:** Test the index
+**Success Rating:** 8-9/10
+
+### What We Accomplished
+- Something
+"""
+
+
+@pytest.fixture
+def log_root(tmp_path):
+    """A copy of the repo's daily logs, without any local sidecars."""
+    root = tmp_path / "daily-logs"
+    shutil.copytree(REPO_LOGS, root, ignore=shutil.ignore_patterns(".*"))
+    return root
+
+
+@pytest.fixture
+def month(tmp_path):
+    """A small monthly log with two dates."""
+    path = tmp_path / "2024" / "2024-02.md"
+    path.parent.mkdir()
+    path.write_text(
+        "# Daily Logs - February 2024\n\n"
+        "## 2024-02-04\n" + SESSION + "\n---\n" + SESSION + "\n---\n"
+        "## 2024-02-05\n" + SESSION.replace("8-9/10", "10/10") + "\n---\n"
+    )
+    return path
+
+
+def append(path, text):
+    with open(path, "a") as f:
+        f.write(text)
+
+
+def snapshot(index):
+    return {day: asdict(entry) for day, entry in index.dates.items()}
+
+
+class TestDailyLogIndex:
+    """Test index building, lookups and invalidation."""
+
+    def test_indexes_dates_sessions_and_ratings(self, month):
+        """Each date records its heading offset, sessions, ratings and durations."""
+        index = DailyLogIndex(month.parent.parent)
+
+        entry = index.lookup("2024-02-04")
+
+        assert entry.sessions == 2
+        assert entry.ratings == [8.5, 8.5]
+        assert entry.durations == ["1 hour", "1 hour"]
+        assert entry.duration_minutes == [60.0, 60.0]
+        assert index.lookup("2024-02-05").ratings == [10.0]
+        assert index.load(month).sessions == 3
+        assert not index.has_date("2024-02-06")
+        assert not index.has_date("2024-03-01")
+
+    def test_offset_points_at_heading(self, month):
+        """The stored offset is a seek to the ``## date`` line."""
+        index = DailyLogIndex(month.parent.parent)
+
+        with open(month, "rb") as f:
+            f.seek(index.heading_offset("2024-02-05"))
+            assert f.readline() == b"## 2024-02-05\n"
+
+    def test_sidecar_is_reused(self, month):
+        """A new process reads the sidecar instead of rescanning."""
+        DailyLogIndex(month.parent.parent).load(month)
+        assert index_path_for(month).exists()
+
+        index = DailyLogIndex(month.parent.parent)
+        index.load(month)
+
+        assert index.rebuilds == 0
+        assert index.updates == 0
+
+    def test_appends_update_incrementally(self, month):
+        """Appending sessions and dates updates the index without a rebuild."""
+        index = DailyLogIndex(month.parent.parent)
+        index.load(month)
+
+        append(month, SESSION + "\n---\n")
+        assert index.lookup("2024-02-05").sessions == 2
+
+        append(month, "## 2024-02-06\n" + SESSION)
+        assert index.has_date("2024-02-06")
+
+        assert index.rebuilds == 1
+        assert index.updates == 2
+        incremental = snapshot(index.load(month))
+        assert incremental == snapshot(index.rebuild(month))
+
+    def test_edits_trigger_rebuild(self, month):
+        """Changes before the end of the file rebuild the index."""
+        index = DailyLogIndex(month.parent.parent)
+        index.load(month)
+
+        month.write_text(month.read_text().replace("## 2024-02-04", "## 2024-02-03"))
+
+        assert index.has_date("2024-02-03")
+        assert not index.has_date("2024-02-04")
+        assert index.rebuilds == 2
+
+    def test_same_size_edit_triggers_rebuild(self, month):
+        """An in-place edit that keeps the size is not mistaken for an append."""
+        append(month, "## 2024-02-06\n" + (SESSION + "\n---\n") * 50)  # edit well before the end
+        DailyLogIndex(month.parent.parent).load(month)
+        stat = month.stat()
+
+        month.write_text(month.read_text().replace("10/10", " 3/10"))
+        assert month.stat().st_size == stat.st_size
+        os.utime(month, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        index = DailyLogIndex(month.parent.parent)
+        assert index.lookup("2024-02-05").ratings == [3.0]
+        assert index.rebuilds == 1
+
+    def test_earlier_edit_plus_append_triggers_rebuild(self, month):
+        """A file that grew but changed before the old end is rebuilt."""
+        append(month, "## 2024-02-06\n" + (SESSION + "\n---\n") * 50)
+        DailyLogIndex(month.parent.parent).load(month)
+
+        month.write_text(month.read_text().replace("8-9/10", "3.0/10", 1) + "## 2024-02-07\n" + SESSION)
+
+        index = DailyLogIndex(month.parent.parent)
+        assert index.lookup("2024-02-04").ratings == [3.0, 8.5]
+        assert index.has_date("2024-02-07")
+        assert index.rebuilds == 1
+        assert index.updates == 0
+
+    def test_duplicate_headings(self, month):
+        """Repeated date headings are counted and force full rebuilds."""
+        index = DailyLogIndex(month.parent.parent)
+        append(month, "## 2024-02-04\n" + SESSION)
+
+        assert index.has_duplicate_heading("2024-02-04")
+        assert index.lookup("2024-02-04").sessions == 3
+
+        append(month, SESSION)  # a new "### Session Overview" starts a session
+        assert index.lookup("2024-02-04").sessions == 4
+        assert index.rebuilds == 2
+
+    def test_missing_file(self, tmp_path):
+        """Months without a log file have no dates."""
+        index = DailyLogIndex(tmp_path)
+
+        assert index.load(tmp_path / "2024" / "2024-01.md") is None
+        assert not index.has_date("2024-01-01")
+
+    def test_repo_logs(self, log_root):
+        """The real logs index cleanly, including known duplicate headings."""
+        index = DailyLogIndex(log_root)
+
+        assert index.lookup("2026-02-10").sessions > 1
+        assert index.has_duplicate_heading("2025-08-20")
+        assert not index.has_duplicate_heading("2026-02-05")
+        assert index.load(log_root / "2026" / "2026-02.md").sessions >= 20
+
+    def test_repo_counts_match_parser(self, log_root):
+        """Session counts agree with the parser, including unseparated sessions."""
+        index = DailyLogIndex(log_root)
+
+        for path in sorted(log_root.glob("*/*-*.md")):
+            assert index.load(path).sessions == sum(1 for _ in iter_sessions(path)), path.name
+        assert index.load(log_root / "2025" / "2025-08.md").sessions == 38
@@ -0,0 +1,191 @@
+"""Tests for the daily-log parser."""
+
+from pathlib import Path
+
+import pytest
+
+from agents.tests.lib.daily_log_parser import (
+    SessionRecord,
+    iter_all_sessions,
+    iter_sessions,
+    parse_duration_minutes,
+    parse_rating,
+    strip_emoji,
+)
+
+
+REPO_LOGS = Path(__file__).resolve().parents[4] / "daily-logs"
+
+# Sessions per checked-in month, counted by hand
+REPO_MONTH_SESSIONS = {
+    "2025-08": 38, "2025-09": 23, "2025-10": 2, "2025-11": 3, "2025-12": 27,
+    "2026-01": 10, "2026-02": 25, "2026-03": 37, "2026-04": 11,
+}
+
+UNSEPARATED = """## 2025-08-15
+
+### Session Overview
+**Duration:** 1 hour
+**Success Rating:** 8/10
+
+### Session Rating: 8/10 - stays in this session
+
+### Session 2 - Layout Fix
+**Duration:** 30 minutes
+**Success Rating:** 10/10
+
+### Session: Component Work
+**Success Rating:** 6/10
+"""
+
+MONTH = """# Daily Logs - February 2024
+
+## 2024-02-04
+
+### Session Overview
+**Duration:** 30-45 minutes
+**Main Objective:** Fix the build
+**Success Rating:** 8-9/10
+
+### What We Accomplished ✅
+- Fixed the build
+- [x] Added a test
+
+### Key Insight
+Small steps
+help a lot.
+
+---
+
+---
+
+### Session Overview
+- Duration: ~2 hours
+- Success Rating: 10/10
+
+### Follow-Up Items 📝
+- [ ] Push
+
+---
+## 2024-02-05
+
+### Session Rating: 4/10 - too much hand holding
+**Duration:** All day
+"""
+
+
+@pytest.fixture
+def month(tmp_path):
+    path = tmp_path / "2024" / "2024-02.md"
+    path.parent.mkdir()
+    path.write_text(MONTH)
+    return path
+
+
+class TestFieldParsers:
+    """Test duration, rating and heading helpers."""
+
+    @pytest.mark.parametrize("text,minutes", [
+        ("1 hour", 60),
+        ("~45 minutes", 45),
+        ("30-45 minutes", 37.5),
+        ("1.5-2 hours", 105),
+        ("2+ hours", 120),
+        ("30-60 min", 45),
+        ("~10 mins", 10),
+        ("1 hour 30 min", 90),
+        ("~3 hours total (morning + afternoon sessions)", 180),
+        ("All day", None),
+        ("Moderate length session", None),
+    ])
+    def test_parse_duration_minutes(self, text, minutes):
+        assert parse_duration_minutes(text) == minutes
+
+    @pytest.mark.parametrize("text,rating", [
+        ("8/10", 8),
+        ("8-9/10", 8.5),
+        ("8.5/10", 8.5),
+        ('10/10 - "Felt like real pair today"', 10),
+        ("0/10 - Worst performance to date", 0),
+        ("great", None),
+    ])
+    def test_parse_rating(self, text, rating):
+        assert parse_rating(text) == rating
+
+    def test_strip_emoji(self):
+        assert strip_emoji("Challenges Encountered 🔧") == "Challenges Encountered"
+        assert strip_emoji("Tools & Technologies Used 🛠️") == "Tools & Technologies Used"
+
+
+class TestIterSessions:
+    """Test streaming session records out of monthly files."""
+
+    def test_splits_sessions_and_parses_fields(self, month):
+        """Sessions split on date headings and ---, skipping empty chunks."""
+        sessions = list(iter_sessions(month))
+
+        assert [(s.date, s.session) for s in sessions] == [
+            ("2024-02-04", 1), ("2024-02-04", 2), ("2024-02-05", 1),
+        ]
+        first, second, third = sessions
+        assert first.duration == "30-45 minutes"
+        assert first.duration_minutes == 37.5
+        assert first.rating == 8.5
+        assert first.objective == "Fix the build"
+        assert second.duration_minutes == 120
+        assert second.rating == 10
+        assert third.rating == 4
+        assert third.duration_minutes is None
+
+    def test_sections_are_emoji_free_bullet_lists(self, month):
+        """Bullets (including checkboxes) and paragraphs become section items."""
+        first, second, _ = iter_sessions(month)
+
+        assert first.sections["What We Accomplished"] == ["Fixed the build", "Added a test"]
+        assert first.sections["Key Insight"] == ["Small steps help a lot."]
+        assert second.sections["Follow-Up Items"] == ["Push"]
+
+    def test_offsets_and_bodies(self, month):
+        """Each record points back at its source and can keep its markdown."""
+        sessions = list(iter_sessions(month, keep_body=True))
+        raw = month.read_bytes()
+
+        assert raw[sessions[0].offset:].startswith(b"## 2024-02-04")
+        assert raw[sessions[2].offset:].startswith(b"## 2024-02-05")
+        assert "Push" in sessions[1].body
+        assert next(iter_sessions(month)).body is None
+
+    def test_records_use_slots(self, month):
+        record = next(iter_sessions(month))
+
+        assert isinstance(record, SessionRecord)
+        assert not hasattr(record, "__dict__")
+
+    def test_session_headings_without_separator(self, tmp_path):
+        """A new session heading starts a session even without ``---``."""
+        path = tmp_path / "2025-08.md"
+        path.write_text(UNSEPARATED)
+
+        sessions = list(iter_sessions(path))
+
+        assert [(s.session, s.rating, s.duration_minutes) for s in sessions] == [
+            (1, 8, 60), (2, 10, 30), (3, 6, None),
+        ]
+        assert "Session Rating: 8/10 - stays in this session" in sessions[0].sections
+
+    def test_repo_month_counts(self):
+        """Per-month session counts of the checked-in logs."""
+        counts = {}
+        for session in iter_all_sessions(REPO_LOGS):
+            counts[session.date[:7]] = counts.get(session.date[:7], 0) + 1
+
+        assert counts == REPO_MONTH_SESSIONS
+
+    def test_repo_logs(self):
+        """Every session in the repo's logs has a date and a rating."""
+        sessions = list(iter_all_sessions(REPO_LOGS))
+
+        assert len(sessions) > 100
+        assert all(s.rating is not None for s in sessions)
+        assert [s.date for s in sessions] == sorted(s.date for s in sessions)
+        assert sum(s.duration_minutes is not None for s in sessions) > 0.9 * len(sessions)
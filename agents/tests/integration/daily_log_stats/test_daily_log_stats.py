@@ -0,0 +1,215 @@
+"""Tests for the daily-log statistics."""
+
+import math
+import re
+import shutil
+import warnings
+from pathlib import Path
+
+import pytest
+
+from agents.tests.lib.daily_log_parser import iter_all_sessions
+from agents.tests.lib.daily_log_stats import (
+    SessionColumns,
+    known_repos,
+    main,
+    update_index_files,
+    update_year_index,
+)
+
+
+REPO_LOGS = Path(__file__).resolve().parents[4] / "daily-logs"
+
+JANUARY = """# Daily Logs - January 2024
+
+## 2024-01-02
+
+**Duration:** 1 hour
+**Success Rating:** 8/10
+### What We Accomplished
+- Fixed front-end build
+
+---
+
+**Duration:** 30 minutes
+**Success Rating:** 9/10
+### What We Accomplished
+- Docs for claude-config
+
+## 2024-01-03
+
+**Duration:** All day
+### What We Accomplished
+- Reviewed front-end-infra changes
+"""
+
+FEBRUARY = """## 2024-02-01
+
+**Duration:** 2 hours
+**Success Rating:** 10/10
+"""
+
+INDEX = """# 2024 Daily Logs
+
+## Monthly Files
+
+- **[2024-01.md](2024-01.md)** - January 2024 (~2 sessions)
+
+## Monthly Summaries
+
+### January 2024 Summary
+**Total Sessions:** ~2 sessions across 1 days  
+**Average Rating:** ~9/10
+
+**Repos Worked On:**
+front-end, claude-config, front-end-infra
+
+## Statistics
+
+- **Total sessions**: 2+ sessions (January - January 2024)
+"""
+
+
+@pytest.fixture
+def logs(tmp_path):
+    year = tmp_path / "2024"
+    year.mkdir()
+    (year / "2024-01.md").write_text(JANUARY)
+    (year / "2024-02.md").write_text(FEBRUARY)
+    (year / "index.md").write_text(INDEX)
+    return tmp_path
+
+
+class TestSessionColumns:
+    """Test column building and aggregation."""
+
+    def test_monthly_stats(self, logs):
+        """Test per-month counts, averages and durations."""
+        columns = SessionColumns.from_index(logs)
+
+        january, february = columns.stats("month")
+        assert (january.period, january.sessions, january.days) == ("2024-01", 3, 2)
+        assert january.rated == 2
+        assert january.average_rating == 8.5
+        assert january.rating_distribution == {8.0: 1, 9.0: 1}
+        assert (january.timed, january.total_minutes) == (2, 90)
+        assert (february.sessions, february.average_rating) == (1, 10)
+
+    def test_year_and_overall_stats(self, logs):
+        """Test grouping by year and over all sessions."""
+        columns = SessionColumns.from_index(logs)
+
+        (year,) = columns.stats("year")
+        (overall,) = columns.stats("all")
+        assert year.period == "2024"
+        assert overall.period == "all"
+        assert year.sessions == overall.sessions == 4
+        assert year.average_rating == pytest.approx(9)
+        assert year.total_minutes == 210
+
+    def test_from_sessions_tags_repos(self, logs):
+        """Test repo tags only match whole repo names."""
+        repos = known_repos(logs)
+        columns = SessionColumns.from_sessions(iter_all_sessions(logs), repos)
+
+        (january, _) = columns.stats("month")
+        assert repos == ["front-end", "claude-config", "front-end-infra"]
+        assert january.repos == {"front-end": 1, "claude-config": 1, "front-end-infra": 1}
+
+    def test_out_of_order_rows(self):
+        """Test rows appended out of month order are grouped correctly."""
+        columns = SessionColumns()
+        columns.append("2024-02-01", 6)
+        columns.append("2024-01-05", None, 20)
+        columns.append("2024-02-03", 8)
+
+        january, february = columns.stats("month")
+        assert (january.sessions, january.rated) == (1, 0)
+        assert january.average_rating is None
+        assert (february.sessions, february.days, february.average_rating) == (2, 2, 7)
+
+    def test_unknown_grouping(self):
+        """Test invalid grouping is rejected."""
+        with pytest.raises(ValueError):
+            SessionColumns().stats("week")
+
+    def test_repo_logs_match_parser(self, tmp_path):
+        """Test index-backed and parser-backed columns agree on repo logs."""
+        if not REPO_LOGS.exists():
+            pytest.skip("daily-logs not present")
+        root = tmp_path / "daily-logs"  # the index writes sidecars; keep them out of the repo
+        shutil.copytree(REPO_LOGS, root, ignore=shutil.ignore_patterns(".*"))
+
+        from_index = SessionColumns.from_index(root).stats("month")
+        from_parser = SessionColumns.from_sessions(iter_all_sessions(root)).stats("month")
+
+        for a, b in zip(from_index, from_parser):
+            assert (a.period, a.sessions, a.days, a.rated) == (b.period, b.sessions, b.days, b.rated)
+            assert math.isclose(a.total_minutes, b.total_minutes)
+        assert len(from_index) == len(from_parser)
+
+
+class TestIndexRegeneration:
+    """Test rewriting the computed lines of year index files."""
+
+    def test_update_year_index(self, logs):
+        """Test counts, averages and the month list are regenerated."""
+        months = {s.period: s for s in SessionColumns.from_index(logs).stats("month")}
+
+        text = update_year_index(INDEX, months)
+        assert "- **[2024-01.md](2024-01.md)** - January 2024 (3 sessions)" in text
+        assert "- **[2024-02.md](2024-02.md)** - February 2024 (1 session)" in text
+        assert "**Total Sessions:** 3 sessions across 2 days  \n" in text
+        assert "**Average Rating:** 8.5/10\n" in text
+        assert "- **Total sessions**: 4 sessions (January - February 2024)" in text
+        assert "front-end, claude-config, front-end-infra" in text
+
+    def test_real_2025_index(self):
+        """Test the checked-in 2025 index's stale hand counts are regenerated."""
+        columns = SessionColumns.from_sessions(iter_all_sessions(REPO_LOGS), known_repos(REPO_LOGS))
+        months = {s.period: s for s in columns.stats("month") if s.period.startswith("2025-")}
+        text = (REPO_LOGS / "2025" / "index.md").read_text()
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")  # every "20+" is below the logged count
+            updated = update_year_index(text, months)
+
+        assert "August 2025 (38 sessions)" in updated
+        assert "September 2025 (23 sessions)" in updated
+        assert "**Total Sessions:** 23 sessions across 9 days" in updated
+        assert re.search(r"^\*\*Total Sessions:\*\* 38 sessions across \d+ days", updated, re.M)
+        assert "- **Total sessions**: 93 logged sessions" in updated
+
+    def test_keeps_higher_hand_counts(self, logs):
+        """Test larger approximate counts survive; exact ones are replaced."""
+        months = {s.period: s for s in SessionColumns.from_index(logs).stats("month")}
+        text = (
+            INDEX.replace("(~2 sessions)", "(~5 sessions)")
+            .replace("~2 sessions across 1 days", "5+ sessions across 9 days")
+            .replace("2+ sessions", "5+ sessions")
+        )
+
+        with pytest.warns(UserWarning, match="is lower") as caught:
+            updated = update_year_index(text, months)
+
+        assert len(caught) == 3
+        assert "January 2024 (~5 sessions)" in updated
+        assert "**Total Sessions:** 5+ sessions across 2 days" in updated
+        assert "- **Total sessions**: 5+ sessions" in updated
+        assert "**Average Rating:** 8.5/10" in updated
+
+    def test_update_is_idempotent(self, logs):
+        """Test a second update changes nothing."""
+        first = update_index_files(logs)
+        second = update_index_files(logs)
+
+        assert first == [logs / "2024" / "index.md"]
+        assert second == []
+
+    def test_cli_json(self, logs, capsys):
+        """Test the CLI prints JSON stats."""
+        assert main(["--root", str(logs), "--by", "year", "--json"]) == 0
+
+        out = capsys.readouterr().out
+        assert '"period": "2024"' in out
+        assert '"sessions": 4' in out
@@ -0,0 +1,179 @@
+"""Tests for the daily-log writer."""
+
+import re
+from collections import Counter
+
+import pytest
+
+from agents.tests.lib.daily_log_index import DailyLogIndex
+from agents.tests.lib.daily_log_parser import iter_sessions
+from agents.tests.lib.daily_log_writer import DailyLogWriter, normalize_session, stress
+
+
+SESSION = """### Session Overview
+**Duration:** 1 hour
+**Main Objective:** {objective}
+**Success Rating:** 9/10
+
+### What We Accomplished
+- Something
+
+---
+"""
+
+INDEX = """# 2026 Daily Logs
+
+## Monthly Files
+
+- **[2026-03.md](2026-03.md)** - March 2026 (0 sessions)
+
+## Statistics
+
+- **Total sessions**: 0 sessions (March – March 2026)
+"""
+
+
+@pytest.fixture
+def root(tmp_path):
+    (tmp_path / "2026").mkdir()
+    (tmp_path / "2026" / "index.md").write_text(INDEX)
+    return tmp_path
+
+
+def log_text(root):
+    return (root / "2026" / "2026-03.md").read_text()
+
+
+class TestAppend:
+    """Test heading and separator handling."""
+
+    def test_new_month_file(self, root):
+        """Test the first session creates the title and date heading."""
+        result = DailyLogWriter(root).append(SESSION.format(objective="first"), "2026-03-02")
+
+        assert (result.session, result.offset, result.created_heading) == (1, 0, True)
+        assert log_text(root).startswith("# Daily Logs - March 2026\n\n## 2026-03-02\n\n### Session Overview\n")
+        assert not log_text(root).rstrip().endswith("---")
+
+    def test_second_session_same_day(self, root):
+        """Test a second session is separated and numbered under the same heading."""
+        writer = DailyLogWriter(root)
+        writer.append(SESSION.format(objective="first"), "2026-03-02")
+
+        result = writer.append(SESSION.format(objective="second"), "2026-03-02")
+        text = log_text(root)
+        assert (result.session, result.created_heading) == (2, False)
+        assert text.count("## 2026-03-02") == 1
+        assert "- Something\n\n---\n\n### Session 2 Overview\n" in text
+        assert [s.objective for s in iter_sessions(root / "2026" / "2026-03.md")] == ["first", "second"]
+
+    def test_new_day_heading(self, root):
+        """Test a new date gets a heading after a separator."""
+        writer = DailyLogWriter(root)
+        writer.append(SESSION.format(objective="first"), "2026-03-02")
+
+        result = writer.append(SESSION.format(objective="next"), "2026-03-03")
+        assert result.created_heading
+        assert "- Something\n\n---\n\n## 2026-03-03\n\n### Session Overview\n" in log_text(root)
+
+    def test_earlier_date_inserted_before_next_heading(self, root):
+        """Test a session for an earlier date stays under its own heading."""
+        writer = DailyLogWriter(root)
+        writer.append(SESSION.format(objective="first"), "2026-03-02")
+        writer.append(SESSION.format(objective="next"), "2026-03-03")
+
+        result = writer.append(SESSION.format(objective="late"), "2026-03-02")
+        sessions = list(iter_sessions(root / "2026" / "2026-03.md"))
+        assert result.session == 2
+        assert [(s.date, s.session, s.objective) for s in sessions] == [
+            ("2026-03-02", 1, "first"),
+            ("2026-03-02", 2, "late"),
+            ("2026-03-03", 1, "next"),
+        ]
+
+    def test_new_earlier_date_keeps_order(self, root):
+        """Test a new date before existing ones gets its heading in order."""
+        writer = DailyLogWriter(root)
+        writer.append(SESSION.format(objective="second"), "2026-03-02")
+        writer.append(SESSION.format(objective="fourth"), "2026-03-04")
+
+        middle = writer.append(SESSION.format(objective="third"), "2026-03-03")
+        first = writer.append(SESSION.format(objective="first"), "2026-03-01")
+
+        assert middle.created_heading and first.created_heading
+        text = log_text(root)
+        assert text.startswith("# Daily Logs - March 2026\n\n## 2026-03-01\n\n### Session Overview\n")
+        assert "- Something\n\n---\n\n## 2026-03-03\n\n### Session Overview\n" in text
+        sessions = list(iter_sessions(root / "2026" / "2026-03.md"))
+        assert [(s.date, s.session, s.objective) for s in sessions] == [
+            ("2026-03-01", 1, "first"),
+            ("2026-03-02", 1, "second"),
+            ("2026-03-03", 1, "third"),
+            ("2026-03-04", 1, "fourth"),
+        ]
+        assert writer.append(SESSION.format(objective="again"), "2026-03-01").session == 2
+
+    @pytest.mark.parametrize("day", ["2026-13-01", "../2026-03-01", "2026-03", "today"])
+    def test_rejects_malformed_date(self, root, day):
+        """Test a bad date fails before any file is created."""
+        with pytest.raises(ValueError):
+            DailyLogWriter(root).append(SESSION.format(objective="x"), day)
+
+        assert sorted(p.name for p in root.rglob("*")) == ["2026", "index.md"]
+
+    def test_updates_year_index(self, root):
+        """Test the year index counters follow the log when asked to."""
+        writer = DailyLogWriter(root, update_index_md=True)
+        writer.append(SESSION.format(objective="first"), "2026-03-02")
+        writer.append(SESSION.format(objective="second"), "2026-03-02")
+
+        index_md = (root / "2026" / "index.md").read_text()
+        assert "March 2026 (2 sessions)" in index_md
+        assert "- **Total sessions**: 2 sessions" in index_md
+
+    def test_year_index_untouched_by_default(self, root):
+        """Test a plain append leaves the hand-maintained index alone."""
+        DailyLogWriter(root).append(SESSION.format(objective="first"), "2026-03-02")
+
+        assert (root / "2026" / "index.md").read_text() == INDEX
+
+    def test_date_from_heading(self, root):
+        """Test the body's date heading sets the date and must agree with it."""
+        writer = DailyLogWriter(root)
+
+        result = writer.append("## 2026-03-04\n\n" + SESSION.format(objective="x"))
+        assert result.date == "2026-03-04"
+        assert log_text(root).count("## 2026-03-04") == 1
+        with pytest.raises(ValueError):
+            writer.append("## 2026-03-04\n\n" + SESSION.format(objective="y"), "2026-03-05")
+
+    def test_normalize_session(self):
+        """Test heading and trailing separators are stripped."""
+        text = normalize_session("## 2026-03-02\n\n" + SESSION.format(objective="x"), "2026-03-02", 3)
+
+        assert text.startswith("### Session 3 Overview\n")
+        assert text.endswith("- Something\n")
+
+
+class TestConcurrentWriters:
+    """Test many processes appending to the same month."""
+
+    def test_stress(self, root):
+        """Test every session lands exactly once with one heading per date."""
+        days = ["2026-03-02", "2026-03-03"]
+
+        total = stress(root, processes=6, sessions=8, days=days)
+
+        sessions = list(iter_sessions(root / "2026" / "2026-03.md"))
+        objectives = Counter(s.objective for s in sessions)
+        assert total == len(sessions) == 48
+        assert all(count == 1 for count in objectives.values())
+        assert Counter(s.date for s in sessions) == {"2026-03-02": 24, "2026-03-03": 24}
+        for day in days:
+            numbers = [s.session for s in sessions if s.date == day]
+            assert numbers == list(range(1, 25))
+
+        index = DailyLogIndex(root)
+        month = index.rebuild(root / "2026" / "2026-03.md")
+        assert all(entry.headings == 1 for entry in month.dates.values())
+        assert re.search(r"March 2026 \(48 sessions\)", (root / "2026" / "index.md").read_text())
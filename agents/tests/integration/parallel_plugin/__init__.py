@@ -0,0 +1 @@
+"""Tests for the parallel-run plugin."""
@@ -0,0 +1,114 @@
+"""Tests for the parallel-run plugin."""
+
+import json
+import os
+import shutil
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from agents.tests.lib.parallel_plugin import DURATIONS_KEY, make_worker_home, order_by_duration
+
+
+REPO_ROOT = Path(__file__).resolve().parents[4]
+
+INNER_CONFTEST = 'pytest_plugins = ["agents.tests.lib.perf_plugin", "agents.tests.lib.parallel_plugin"]'
+
+INNER_TEST = '''
+import asyncio
+import os
+import time
+from pathlib import Path
+
+from agents.tests.lib import AgentRunner, create_mock
+
+SKILL = "---\\nname: inner\\n---\\n\\nInner skill body\\n"
+
+def test_slow(tmp_path):
+    time.sleep(0.05)
+    (tmp_path / "inner").mkdir()
+    (tmp_path / "inner" / "SKILL.md").write_text(SKILL)
+    runner = AgentRunner("inner", skills_dir=tmp_path, mock_client=create_mock("ok"))
+    assert asyncio.run(runner.execute("go")).success
+
+def test_fast(request):
+    if hasattr(request.config, "workerinput"):
+        assert Path.home().name.startswith("agents-tests-gw")
+'''
+
+
+class TestHelpers:
+    """Test ordering and worker homes."""
+
+    def test_order_slowest_first(self):
+        """Test unknown tests lead, then known ones by descending duration."""
+        items = [SimpleNamespace(nodeid=name) for name in ["a", "b", "c", "d"]]
+
+        order_by_duration(items, {"a": 0.1, "b": 2.0, "d": 0.5})
+
+        assert [item.nodeid for item in items] == ["c", "b", "d", "a"]
+
+    def test_worker_home_links_real_entries(self, tmp_path):
+        """Test the worker home sees the real ~/.claude through symlinks."""
+        real = tmp_path / "real"
+        (real / ".claude" / "skills" / "demo").mkdir(parents=True)
+        (real / ".claude" / "settings.json").write_text("{}")
+
+        home = make_worker_home(real, "gw0")
+
+        try:
+            assert (home / ".claude" / "skills" / "demo").is_dir()
+            assert (home / ".claude" / "settings.json").is_symlink()
+            (home / ".claude" / "new-file").write_text("x")
+            assert not (real / ".claude" / "new-file").exists()
+        finally:
+            shutil.rmtree(home)
+
+    def test_worker_home_new_skill_stays_private(self, tmp_path):
+        """Test a skill created in the worker home doesn't reach the real skills dir."""
+        real = tmp_path / "real"
+        (real / ".claude" / "skills" / "demo").mkdir(parents=True)
+        (real / ".claude" / "skills" / "demo" / "SKILL.md").write_text("demo")
+
+        home = make_worker_home(real, "gw0")
+
+        try:
+            skills = home / ".claude" / "skills"
+            assert skills.is_dir() and not skills.is_symlink()
+            assert (skills / "demo" / "SKILL.md").read_text() == "demo"
+            (skills / "new").mkdir()
+            (skills / "new" / "SKILL.md").write_text("new")
+            assert sorted(p.name for p in (real / ".claude" / "skills").iterdir()) == ["demo"]
+        finally:
+            shutil.rmtree(home)
+        assert (real / ".claude" / "skills" / "demo" / "SKILL.md").read_text() == "demo"
+
+
+class TestPlugin:
+    """Test the plugin in isolated pytest runs."""
+
+    def test_records_durations(self, pytester):
+        """Test a serial run stores call durations in the cache."""
+        pytester.makeconftest(INNER_CONFTEST)
+        pytester.makepyfile(test_inner=INNER_TEST)
+
+        pytester.runpytest_inprocess().assert_outcomes(passed=2)
+
+        durations = json.loads((pytester.path / ".pytest_cache" / "v" / DURATIONS_KEY).read_text())
+        assert set(durations) == {"test_inner.py::test_slow", "test_inner.py::test_fast"}
+        assert durations["test_inner.py::test_slow"] > durations["test_inner.py::test_fast"]
+
+    def test_xdist_workers(self, pytester, monkeypatch):
+        """Test workers run with their own HOME and forward perf records."""
+        pytest.importorskip("xdist")
+        monkeypatch.setenv("PYTHONPATH", os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")])))
+        pytester.makeconftest(INNER_CONFTEST)
+        pytester.makepyfile(test_inner=INNER_TEST)
+
+        result = pytester.runpytest_subprocess("-n", "2", "--perf-report=report.json")
+
+        result.assert_outcomes(passed=2)
+        report = json.loads((pytester.path / "report.json").read_text())
+        assert report["skills"]["inner"]["calls"] == 1
+        assert len(json.loads((pytester.path / ".pytest_cache" / "v" / DURATIONS_KEY).read_text())) == 2
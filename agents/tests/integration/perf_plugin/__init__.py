@@ -0,0 +1 @@
+"""Tests for the agent performance pytest plugin."""
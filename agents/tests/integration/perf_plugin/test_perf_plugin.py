@@ -0,0 +1,114 @@
+"""Tests for per-skill latency reporting."""
+
+import json
+
+from agents.tests.lib import perf_plugin
+from agents.tests.lib.perf_plugin import build_report, find_regressions, percentile
+
+
+def make_record(skill, total_ms, markers=(), prompt_bytes=100, success=True):
+    return {
+        "test": "t",
+        "skill": skill,
+        "markers": list(markers),
+        "success": success,
+        "total_ms": total_ms,
+        "first_message_ms": total_ms / 2,
+        "tool_calls": 1,
+        "prompt_bytes": prompt_bytes,
+        "input_tokens": 10,
+        "output_tokens": 5,
+    }
+
+
+INNER_TEST = '''
+import asyncio
+import pytest
+from agents.tests.lib import AgentRunner, create_mock
+
+SKILL = "---\\nname: inner\\n---\\n\\nInner skill body\\n"
+
+@pytest.mark.critical
+def test_runs_skill(tmp_path):
+    (tmp_path / "inner").mkdir()
+    (tmp_path / "inner" / "SKILL.md").write_text(SKILL)
+    runner = AgentRunner("inner", skills_dir=tmp_path, mock_client=create_mock("ok"))
+    for _ in range(3):
+        assert asyncio.run(runner.execute("go")).success
+'''
+
+INNER_INI = '''
+[pytest]
+markers =
+    critical: critical
+'''
+
+
+class TestAggregation:
+    """Test report aggregation helpers."""
+
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 101))
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile([7.0], 95) == 7.0
+        assert percentile([], 95) == 0.0
+
+    def test_groups_by_skill_and_marker(self):
+        records = [
+            make_record("daily-log", 10, markers=["critical"]),
+            make_record("daily-log", 30, prompt_bytes=300, success=False),
+            make_record("capture", 5, markers=["critical", "security"]),
+        ]
+
+        report = build_report(records)
+
+        assert report["total"]["calls"] == 3
+        daily = report["skills"]["daily-log"]
+        assert daily["calls"] == 2
+        assert daily["failures"] == 1
+        assert daily["max_ms"] == 30
+        assert daily["prompt_bytes_mean"] == 200
+        assert daily["input_tokens"] == 20
+        assert report["markers"]["critical"]["calls"] == 2
+        assert report["markers"]["security"]["calls"] == 1
+
+    def test_regressions_respect_threshold(self):
+        baseline = build_report([make_record("a", 100), make_record("b", 100), make_record("c", 1)])
+        current = build_report([make_record("a", 120), make_record("b", 200), make_record("c", 3)])
+
+        regressions = find_regressions(current, baseline, threshold=0.25)
+
+        assert len(regressions) == 1
+        assert regressions[0].startswith("b:")
+
+
+class TestPlugin:
+    """Test the plugin end to end in an isolated pytest run."""
+
+    def test_writes_report_and_summary(self, pytester):
+        pytester.makeconftest('pytest_plugins = ["agents.tests.lib.perf_plugin"]')
+        pytester.makeini(INNER_INI)
+        pytester.makepyfile(test_inner=INNER_TEST)
+
+        result = pytester.runpytest_inprocess("--perf-report=report.json")
+
+        result.assert_outcomes(passed=1)
+        result.stdout.fnmatch_lines(["*agent performance*", "inner*3*", "@critical*3*"])
+        report = json.loads((pytester.path / "report.json").read_text())
+        assert report["skills"]["inner"]["calls"] == 3
+        assert report["skills"]["inner"]["prompt_bytes_max"] > 0
+
+    def test_baseline_regression_fails_session(self, pytester, monkeypatch):
+        pytester.makeconftest('pytest_plugins = ["agents.tests.lib.perf_plugin"]')
+        pytester.makeini(INNER_INI)
+        pytester.makepyfile(test_inner=INNER_TEST)
+        baseline = {"skills": {"inner": {"p95_ms": 0.0}}}
+        (pytester.path / "baseline.json").write_text(json.dumps(baseline))
+
+        monkeypatch.setattr(perf_plugin, "MIN_REGRESSION_MS", 0.0)
+
+        result = pytester.runpytest_inprocess("--perf-baseline=baseline.json")
+
+        assert result.ret == 1
+        result.stdout.fnmatch_lines(["*performance regressions*", "inner: p95*"])
@@ -0,0 +1 @@
+"""Tests for the permission-rule matcher."""
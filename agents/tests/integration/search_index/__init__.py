@@ -0,0 +1 @@
+"""Tests for the search index."""
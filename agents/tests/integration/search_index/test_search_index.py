@@ -0,0 +1,156 @@
+"""Tests for the search index."""
+
+import os
+
+import pytest
+
+from agents.tests.lib.search_index import SearchIndex, parse_query, tokenize
+
+
+LOG = """# Daily Logs - March 2026
+
+## 2026-03-02
+
+**Main Objective:** Speed up the test runner
+**Success Rating:** 9/10
+
+Profiled the runner and cached skill parsing.
+
+---
+
+**Main Objective:** Review the front-end tunnel proxy
+**Success Rating:** 6/10
+
+Left comments on the proxy config.
+
+## 2026-03-05
+
+**Main Objective:** Cache warmup for the runner
+**Success Rating:** 10/10
+
+Runner cache hits went up.
+"""
+
+SKILL = """---
+name: capture
+description: Capture quick notes into the inbox
+---
+
+# Capture
+
+Write a note file for later triage.
+"""
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    (tmp_path / "daily-logs" / "2026").mkdir(parents=True)
+    (tmp_path / "daily-logs" / "2026" / "2026-03.md").write_text(LOG)
+    (tmp_path / "skills" / "capture").mkdir(parents=True)
+    (tmp_path / "skills" / "capture" / "SKILL.md").write_text(SKILL)
+    (tmp_path / "commands").mkdir()
+    (tmp_path / "commands" / "daily-log.md").write_text("# Daily Log\n\nAppend a session to the daily log.\n")
+    return tmp_path
+
+
+@pytest.fixture
+def index(corpus):
+    with SearchIndex(root=corpus) as index:
+        index.update()
+        yield index
+
+
+class TestQueryParsing:
+    """Test tokenizing and query clauses."""
+
+    def test_tokenize(self):
+        """Test tokens are lowercase and split on punctuation."""
+        assert tokenize("Front-end CLI_tool, v2!") == ["front", "end", "cli", "tool", "v2"]
+
+    def test_parse_query(self):
+        """Test quoted text and hyphenated words become phrases."""
+        assert parse_query('runner "skill parsing" front-end') == [
+            ("runner",), ("skill", "parsing"), ("front", "end"),
+        ]
+
+
+class TestSearch:
+    """Test ranked queries and filters."""
+
+    def test_documents_per_session_and_file(self, index, corpus):
+        """Test each session and definition file is one document."""
+        assert len(index) == 5
+        assert (corpus / "search-index" / ".gitignore").read_text() == "*\n"
+
+    def test_bm25_ranking(self, index):
+        """Test documents with more occurrences rank higher."""
+        hits = index.search("runner")
+
+        assert [hit.date for hit in hits] == ["2026-03-05", "2026-03-02"]
+        assert hits[0].score > hits[1].score
+        assert hits[0].title == "2026-03-05 session 1: Cache warmup for the runner"
+
+    def test_all_clauses_required(self, index):
+        """Test every query word must match."""
+        assert [hit.date for hit in index.search("runner warmup")] == ["2026-03-05"]
+        assert index.search("runner nonexistent") == []
+
+    def test_phrase_query(self, index):
+        """Test phrases must appear as consecutive tokens."""
+        assert len(index.search('"skill parsing"')) == 1
+        assert index.search('"parsing skill"') == []
+        assert [hit.rating for hit in index.search("front-end")] == [6]
+
+    def test_filters(self, index):
+        """Test kind, date and rating filters."""
+        assert [hit.kind for hit in index.search("capture")] == ["skill"]
+        assert [hit.kind for hit in index.search("daily log", kinds=["command"])] == ["command"]
+        assert index.search("runner", since="2026-03-03")[0].date == "2026-03-05"
+        assert len(index.search("runner", until="2026-03-02")) == 1
+        assert index.search("proxy", min_rating=7) == []
+        assert len(index.search("proxy", max_rating=7)) == 1
+
+    def test_session_offset(self, index, corpus):
+        """Test hits point at the session's bytes in the log."""
+        (hit,) = index.search("proxy")
+
+        with open(hit.path, "rb") as f:
+            f.seek(hit.offset)
+            assert b"front-end tunnel proxy" in f.read(200)
+
+
+class TestIncrementalUpdate:
+    """Test that only changed files are re-indexed."""
+
+    def test_unchanged_files_skipped(self, index):
+        """Test a second update touches nothing."""
+        stats = index.update()
+
+        assert (stats.indexed, stats.removed, stats.unchanged) == (0, 0, 3)
+
+    def test_appended_log_reindexed(self, index, corpus):
+        """Test an appended session becomes searchable."""
+        log = corpus / "daily-logs" / "2026" / "2026-03.md"
+        with open(log, "a") as f:
+            f.write("\n---\n\n**Main Objective:** Migrate the zeppelin\n")
+
+        stats = index.update()
+        assert (stats.indexed, stats.unchanged, stats.documents) == (1, 2, 4)
+        assert len(index.search("zeppelin")) == 1
+        assert len(index) == 6
+
+    def test_deleted_file_removed(self, index, corpus):
+        """Test documents of deleted files are dropped."""
+        os.remove(corpus / "skills" / "capture" / "SKILL.md")
+
+        stats = index.update()
+        assert stats.removed == 1
+        assert index.search("capture") == []
+
+    def test_index_persists(self, index, corpus):
+        """Test a reopened index answers queries without re-indexing."""
+        index.close()
+
+        with SearchIndex(root=corpus) as reopened:
+            assert reopened.update().indexed == 0
+            assert len(reopened.search("runner")) == 2
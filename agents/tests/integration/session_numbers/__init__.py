@@ -0,0 +1 @@
+"""Tests for the session-number allocator."""
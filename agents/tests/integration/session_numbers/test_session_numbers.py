@@ -0,0 +1,90 @@
+"""Tests for the session-number allocator."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from agents.tests.lib.session_numbers import COUNTER_NAME, allocate, stress
+
+
+class TestAllocate:
+    """Test numbering and the counter file."""
+
+    def test_numbers_per_day(self, tmp_path):
+        """Test numbers start at 1 and count per date."""
+        first = allocate("2026-04-01", tmp_path)
+        second = allocate("2026-04-01", tmp_path)
+        other = allocate("2026-04-02", tmp_path)
+
+        assert (first.session, second.session, other.session) == (1, 2, 1)
+        assert second.path == tmp_path / "2026" / "04" / "2026-04-01-session-2.md"
+        assert not second.path.exists()
+        counter = json.loads((tmp_path / "2026" / "04" / COUNTER_NAME).read_text())
+        assert counter == {"2026-04-01": 2, "2026-04-02": 1}
+
+    def test_scans_when_counter_missing(self, tmp_path):
+        """Test existing session files seed a missing counter."""
+        month = tmp_path / "2026" / "04"
+        month.mkdir(parents=True)
+        for name in ["2026-04-01-session-1.md", "2026-04-01-session-3.md", "notes.md"]:
+            (month / name).touch()
+
+        assert allocate("2026-04-01", tmp_path).session == 4
+        assert allocate("2026-04-05", tmp_path).session == 1
+
+    def test_skips_existing_files(self, tmp_path):
+        """Test a file written without the allocator isn't overwritten."""
+        allocate("2026-04-01", tmp_path)
+        (tmp_path / "2026" / "04" / "2026-04-01-session-2.md").touch()
+
+        assert allocate("2026-04-01", tmp_path).session == 3
+
+    def test_invalid_date(self, tmp_path):
+        """Test malformed dates are rejected."""
+        with pytest.raises(ValueError):
+            allocate("2026-13-01", tmp_path)
+
+
+class TestConcurrentAllocation:
+    """Test many processes allocating in the same month."""
+
+    def test_stress(self, tmp_path):
+        """Test every process gets distinct, gapless numbers."""
+        days = ["2026-04-01", "2026-04-02"]
+
+        names = stress(tmp_path, processes=6, sessions=10, days=days)
+
+        assert len(names) == len(set(names)) == 60
+        counter = json.loads((tmp_path / "2026" / "04" / COUNTER_NAME).read_text())
+        assert counter == {"2026-04-01": 30, "2026-04-02": 30}
+        for day in days:
+            assert {f"{day}-session-{n}.md" for n in range(1, 31)} <= set(names)
+
+
+class TestCli:
+    """Test the command-line entry point the skill calls."""
+
+    def test_cli_imports_only_what_it_needs(self, tmp_path):
+        """Test ``python -m`` runs warning-free without the stress pool or daily-log modules."""
+        repo = Path(__file__).resolve().parents[4]
+        code = (
+            "import runpy, sys\n"
+            f"sys.argv = ['session_numbers', '--root', {str(tmp_path)!r}, '--date', '2026-04-01']\n"
+            "try:\n"
+            "    runpy.run_module('agents.tests.lib.session_numbers', run_name='__main__', alter_sys=True)\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print(sorted(m for m in sys.modules if m == 'concurrent.futures' or m.startswith('agents.tests.lib.daily_log')))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-W", "error", "-c", code],
+            cwd=repo, env={**os.environ, "PYTHONPATH": str(repo)},
+            capture_output=True, text=True, check=True,
+        )
+
+        assert result.stdout.splitlines() == ["1", "[]"]
+        assert result.stderr == ""
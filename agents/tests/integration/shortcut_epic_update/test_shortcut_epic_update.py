@@ -6,39 +6,37 @@ Tests verify the skill documentation for updating epics via Shortcut API.
 import pytest
 from pathlib import Path
 
-from agents.tests.lib.skill_loader import load_skill
-
 
 class TestShortcutEpicUpdateContent:
     """Test shortcut-epic-update skill content."""
 
-    def test_skill_loads(self):
+    def test_skill_loads(self, skill_registry):
         """Verify skill file loads without errors."""
-        frontmatter, content = load_skill("shortcut-epic-update")
+        frontmatter, content = skill_registry.load("shortcut-epic-update")
 
         assert frontmatter["name"] == "shortcut-epic-update"
         assert "user_invocable" in frontmatter
         assert len(content) > 0
 
-    def test_contains_api_token_instructions(self):
+    def test_contains_api_token_instructions(self, skill_registry):
         """Verify skill documents token configuration."""
-        _, content = load_skill("shortcut-epic-update")
+        _, content = skill_registry.load("shortcut-epic-update")
 
         # Should reference the token config file
         assert "shortcut-tokens.json" in content
         assert "shortcut-tokens.sample.json" in content
 
-    def test_contains_curl_examples(self):
+    def test_contains_curl_examples(self, skill_registry):
         """Verify skill contains curl command examples."""
-        _, content = load_skill("shortcut-epic-update")
+        _, content = skill_registry.load("shortcut-epic-update")
 
         assert "curl -X PUT" in content
         assert "api.app.shortcut.com" in content
         assert "Shortcut-Token" in content
 
-    def test_documents_common_operations(self):
+    def test_documents_common_operations(self, skill_registry):
         """Verify skill documents common update operations."""
-        _, content = load_skill("shortcut-epic-update")
+        _, content = skill_registry.load("shortcut-epic-update")
 
         # Should document common operations
         assert "Link to Objective" in content
@@ -46,26 +44,26 @@ class TestShortcutEpicUpdateContent:
         assert "Update Owner" in content
         assert "objective_ids" in content
 
-    def test_documents_json_formatting(self):
+    def test_documents_json_formatting(self, skill_registry):
         """Verify skill documents proper JSON formatting for bash."""
-        _, content = load_skill("shortcut-epic-update")
+        _, content = skill_registry.load("shortcut-epic-update")
 
         # Should warn about JSON formatting issues
         assert "CRITICAL JSON Formatting" in content or "JSON" in content
         # Should mention using variables for payloads
         assert "PAYLOAD" in content
 
-    def test_documents_permissions(self):
+    def test_documents_permissions(self, skill_registry):
         """Verify skill documents required permissions."""
-        _, content = load_skill("shortcut-epic-update")
+        _, content = skill_registry.load("shortcut-epic-update")
 
         # Should document Bash permission requirement
         assert "Bash" in content or "curl" in content
         assert "jq" in content
 
-    def test_no_hardcoded_tokens(self):
+    def test_no_hardcoded_tokens(self, skill_registry):
         """Verify skill doesn't contain hardcoded API tokens."""
-        _, content = load_skill("shortcut-epic-update")
+        _, content = skill_registry.load("shortcut-epic-update")
 
         # Should NOT contain actual token values (starting with sct_ or UUID format)
         assert "sct_rw_coherentpath_" not in content
@@ -76,9 +74,9 @@ class TestShortcutEpicUpdateContent:
 class TestShortcutEpicUpdateMetadata:
     """Test skill metadata and configuration."""
 
-    def test_skill_metadata(self):
+    def test_skill_metadata(self, skill_registry):
         """Verify skill has correct metadata."""
-        frontmatter, _ = load_skill("shortcut-epic-update")
+        frontmatter = skill_registry.get("shortcut-epic-update").frontmatter
 
         assert frontmatter["user_invocable"] is False
         assert "description" in frontmatter
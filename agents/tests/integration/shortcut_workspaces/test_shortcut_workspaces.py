@@ -3,41 +3,44 @@
 Tests verify the static reference data for Shortcut workspaces is loaded correctly.
 """
 
+import os
+
 import pytest
 from pathlib import Path
 
-from agents.tests.lib.skill_loader import load_skill
+from agents.tests.lib import shortcut_workspaces
+from agents.tests.lib.shortcut_workspaces import WorkspaceDirectory, index_path_for, load_workspaces, main
 
 
 class TestShortcutWorkspacesContent:
     """Test shortcut-workspaces skill content."""
 
-    def test_skill_loads(self):
+    def test_skill_loads(self, skill_registry):
         """Verify skill file loads without errors."""
-        frontmatter, content = load_skill("shortcut-workspaces")
+        frontmatter, content = skill_registry.load("shortcut-workspaces")
 
         assert frontmatter["name"] == "shortcut-workspaces"
         assert "user_invocable" in frontmatter
         assert len(content) > 0
 
-    def test_contains_workspace_references(self):
+    def test_contains_workspace_references(self, skill_registry):
         """Verify skill contains both workspace references."""
-        _, content = load_skill("shortcut-workspaces")
+        _, content = skill_registry.load("shortcut-workspaces")
 
         # Should reference both workspaces in examples/docs
         assert "CoherentPath" in content or "coherentpath" in content
         assert "Movable Ink" in content or "movableink" in content
 
-    def test_contains_mcp_tool_prefixes(self):
+    def test_contains_mcp_tool_prefixes(self, skill_registry):
         """Verify MCP tool prefixes are documented."""
-        _, content = load_skill("shortcut-workspaces")
+        _, content = skill_registry.load("shortcut-workspaces")
 
         assert "mcp__shortcut__" in content
         assert "mcp__shortcut-mi__" in content
 
-    def test_contains_team_data(self):
+    def test_contains_team_data(self, skill_registry):
         """Verify skill documents how to access team data."""
-        _, content = load_skill("shortcut-workspaces")
+        _, content = skill_registry.load("shortcut-workspaces")
 
         # Should reference the data file and show structure
         assert "shortcut-workspaces-data.json" in content
@@ -45,9 +48,9 @@ class TestShortcutWorkspacesContent:
         assert "uuid" in content or "UUID" in content
         assert "mention" in content
 
-    def test_contains_user_info(self):
+    def test_contains_user_info(self, skill_registry):
         """Verify skill documents how to access user information."""
-        _, content = load_skill("shortcut-workspaces")
+        _, content = skill_registry.load("shortcut-workspaces")
 
         # Should show how to get user data from JSON file
         assert "user" in content
@@ -57,10 +60,97 @@ class TestShortcutWorkspacesContent:
 class TestShortcutWorkspacesMetadata:
     """Test skill metadata and configuration."""
 
-    def test_skill_metadata(self):
+    def test_skill_metadata(self, skill_registry):
         """Verify skill has correct metadata."""
-        frontmatter, _ = load_skill("shortcut-workspaces")
+        frontmatter = skill_registry.get("shortcut-workspaces").frontmatter
 
         assert frontmatter["user_invocable"] is True
         assert "description" in frontmatter
         assert len(frontmatter["description"]) > 0
+
+
+SAMPLE_DATA = Path(__file__).resolve().parents[4] / "skills" / "shortcut-workspaces-data.sample.json"
+
+
+@pytest.fixture
+def sample_data(tmp_path):
+    """A copy of the sample data, so its index sidecar stays out of the repo."""
+    data = tmp_path / SAMPLE_DATA.name
+    data.write_text(SAMPLE_DATA.read_text())
+    return data
+
+
+class TestWorkspaceLookup:
+    """Test the compiled workspace lookup table."""
+
+    def test_lookup_by_every_identifier(self, sample_data):
+        """Verify teams resolve by name, mention, UUID and workflow_id."""
+        directory = load_workspaces(sample_data)
+
+        team = directory.team("team-mention-a")
+        assert team.workspace == "movableink"
+        assert directory.team("@Team-Mention-A") == team
+        assert directory.team("example   team a") == team
+        assert directory.team("TEAM-UUID-A") == team
+        assert directory.team(500000010) == team
+        assert directory.team("500000010") == team
+
+    def test_workspace_filter_and_errors(self, sample_data):
+        """Verify lookups can be scoped and fail loudly."""
+        directory = load_workspaces(sample_data)
+
+        assert directory.find("team-mention-1", workspace="movableink") == []
+        assert [t.name for t in directory.teams("coherentpath")] == ["Example Team 1", "Example Team 2"]
+        assert directory.workspace("movableink").mcp_prefix == "mcp__shortcut-mi__"
+        with pytest.raises(KeyError):
+            directory.team("nope")
+        with pytest.raises(KeyError):
+            directory.workspace("nope")
+
+    def test_compiled_form_cached_by_mtime(self, tmp_path):
+        """Verify the file is re-indexed only after it changes."""
+        data = tmp_path / "data.json"
+        data.write_text(SAMPLE_DATA.read_text())
+
+        first = load_workspaces(data)
+        assert load_workspaces(data) is first
+
+        data.write_text(SAMPLE_DATA.read_text().replace("Example Team 1", "Renamed Team"))
+        os.utime(data, ns=(0, 1))
+        updated = load_workspaces(data)
+        assert updated is not first
+        assert updated.team("team-mention-1").name == "Renamed Team"
+
+    def test_compiled_form_persisted(self, tmp_path, monkeypatch):
+        """Verify a new process loads the sidecar instead of re-indexing."""
+        data = tmp_path / "data.json"
+        data.write_text(SAMPLE_DATA.read_text())
+        expected = load_workspaces(data).teams()
+        assert index_path_for(data).exists()
+
+        monkeypatch.setattr(shortcut_workspaces, "_cache", {})
+        monkeypatch.setattr(WorkspaceDirectory, "__init__", lambda self, data: pytest.fail("re-indexed"))
+        reloaded = load_workspaces(data)
+
+        assert reloaded.teams() == expected
+        assert reloaded.team("team-mention-1", "coherentpath") == expected[0]
+        assert reloaded.find(expected[0].workflow_id) == [expected[0]]
+
+    def test_workspace_filter_before_fallthrough(self):
+        """Verify a mention in another workspace doesn't hide a name match."""
+        directory = WorkspaceDirectory({
+            "a": {"teams": [{"name": "Platform", "uuid": "ua", "mention": "plat-a"}]},
+            "b": {"teams": [{"name": "Other", "uuid": "ub", "mention": "platform"}]},
+        })
+
+        assert directory.team("platform", "a").uuid == "ua"
+        assert directory.team("platform").uuid == "ub"
+
+    def test_cli_field_output(self, sample_data, capsys):
+        """Verify the CLI prints bare field values like jq -r."""
+        assert main(["--data", str(sample_data), "team", "team-mention-2", "-f", "uuid"]) == 0
+        assert main(["--data", str(sample_data), "user", "-w", "movableink", "-f", "uuid"]) == 0
+        assert main(["--data", str(sample_data), "team", "missing"]) == 1
+
+        out = capsys.readouterr().out
+        assert out == "team-uuid-2\nyour-user-uuid-here\n"
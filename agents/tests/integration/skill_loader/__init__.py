@@ -0,0 +1 @@
+"""Tests for the skill loader library."""
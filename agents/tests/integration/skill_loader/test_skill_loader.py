@@ -0,0 +1,230 @@
+"""Tests for skill loading and the parsed-skill cache."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from agents.tests.lib.skill_loader import (
+    SkillCache,
+    build_skill_prompt,
+    compile_skill_prompt,
+    get_skill_cache,
+    iter_frontmatter,
+    load_skill,
+    parse_skill_frontmatter,
+    read_frontmatter,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[4]
+
+
+@pytest.fixture
+def skill_file(tmp_path, mock_skill_content):
+    """A directory-format skill in a temporary skills dir."""
+    skill_dir = tmp_path / "test-skill"
+    skill_dir.mkdir()
+    path = skill_dir / "SKILL.md"
+    path.write_text(mock_skill_content)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    """Start every test with an empty process-wide cache."""
+    get_skill_cache().clear()
+    yield
+    get_skill_cache().clear()
+
+
+class TestSkillCache:
+    """Test parsed-skill caching and invalidation."""
+
+    def test_repeat_loads_hit_cache(self, skill_file):
+        """Second load of an unchanged skill is served from cache."""
+        first = load_skill("test-skill", skill_file.parent.parent)
+        second = load_skill("test-skill", skill_file.parent.parent)
+
+        assert first == second
+        info = get_skill_cache().info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_modified_file_is_reparsed(self, skill_file):
+        """Changing size or mtime invalidates the cached entry."""
+        skills_dir = skill_file.parent.parent
+        load_skill("test-skill", skills_dir)
+
+        skill_file.write_text("---\nname: changed\n---\n\nNew body\n")
+        frontmatter, content = load_skill("test-skill", skills_dir)
+
+        assert frontmatter["name"] == "changed"
+        assert content.strip() == "New body"
+        assert get_skill_cache().info().misses == 2
+
+    def test_same_size_new_mtime_is_reparsed(self, skill_file):
+        """An edit that keeps the size is still detected via mtime_ns."""
+        skills_dir = skill_file.parent.parent
+        load_skill("test-skill", skills_dir)
+
+        original = skill_file.read_text()
+        skill_file.write_text(original.replace("test-skill", "tset-skill"))
+        stat = skill_file.stat()
+        os.utime(skill_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        frontmatter, _ = load_skill("test-skill", skills_dir)
+        assert frontmatter["name"] == "tset-skill"
+
+    def test_returned_frontmatter_is_a_copy(self, skill_file):
+        """Mutating a returned frontmatter dict doesn't poison the cache."""
+        skills_dir = skill_file.parent.parent
+        frontmatter, _ = load_skill("test-skill", skills_dir)
+        frontmatter["name"] = "mutated"
+
+        frontmatter, _ = load_skill("test-skill", skills_dir)
+        assert frontmatter["name"] == "test-skill"
+
+    def test_lru_eviction(self, tmp_path):
+        """Least recently used entries are evicted past maxsize."""
+        cache = SkillCache(maxsize=2)
+        paths = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / f"{name}.md"
+            path.write_text(f"---\nname: {name}\n---\nbody\n")
+            paths.append(path)
+
+        cache.get(paths[0])
+        cache.get(paths[1])
+        cache.get(paths[0])  # a is now most recent
+        cache.get(paths[2])  # evicts b
+
+        assert cache.info().currsize == 2
+        cache.get(paths[0])
+        assert cache.info().hits == 2
+        cache.get(paths[1])
+        assert cache.info().misses == 4
+
+    def test_flat_file_fallback(self, tmp_path, mock_skill_content):
+        """Old-format flat skill files are still found."""
+        (tmp_path / "flat-skill.md").write_text(mock_skill_content)
+
+        frontmatter, _ = load_skill("flat-skill", tmp_path)
+        assert frontmatter["name"] == "test-skill"
+
+    def test_missing_skill_raises(self, tmp_path):
+        """Missing skills raise FileNotFoundError and aren't cached."""
+        with pytest.raises(FileNotFoundError):
+            load_skill("nope", tmp_path)
+        assert get_skill_cache().info().currsize == 0
+
+
+class TestCompiledSkillPrompt:
+    """Test compiled prompt templates."""
+
+    def test_render_matches_build_skill_prompt(self, skill_file, mock_skill_content):
+        """Rendering produces exactly the prompt build_skill_prompt returns."""
+        skills_dir = skill_file.parent.parent
+        compiled = compile_skill_prompt("test-skill", skills_dir)
+
+        _, body = parse_skill_frontmatter(mock_skill_content)
+        expected = f"{body.strip()}\n\nUser request: Do the thing"
+
+        assert compiled.render("Do the thing") == expected
+        assert build_skill_prompt("test-skill", "Do the thing", skills_dir) == expected
+
+    def test_compiled_once_per_file_version(self, skill_file):
+        """Unchanged skills reuse the compiled object; edits recompile."""
+        skills_dir = skill_file.parent.parent
+        first = compile_skill_prompt("test-skill", skills_dir)
+        assert compile_skill_prompt("test-skill", skills_dir) is first
+
+        skill_file.write_text("---\nname: test-skill\n---\n\nRewritten\n")
+        second = compile_skill_prompt("test-skill", skills_dir)
+        assert second is not first
+        assert second.render("x") == "Rewritten\n\nUser request: x"
+
+    def test_compiled_frontmatter_cannot_corrupt_cache(self, skill_file):
+        """The shared compiled prompt exposes a read-only copy of the frontmatter."""
+        skills_dir = skill_file.parent.parent
+        compiled = compile_skill_prompt("test-skill", skills_dir)
+
+        with pytest.raises(TypeError):
+            compiled.frontmatter["name"] = "mutated"
+        assert compile_skill_prompt("test-skill", skills_dir).frontmatter["name"] == "test-skill"
+        assert load_skill("test-skill", skills_dir)[0]["name"] == "test-skill"
+
+    def test_render_many_is_lazy_and_ordered(self, skill_file):
+        """render_many streams prompts in input order."""
+        compiled = compile_skill_prompt("test-skill", skill_file.parent.parent)
+
+        prompts = compiled.render_many(f"request {i}" for i in range(3))
+        assert not isinstance(prompts, list)
+        rendered = list(prompts)
+
+        assert len(rendered) == 3
+        assert [p.rsplit("User request: ", 1)[1] for p in rendered] == [
+            "request 0", "request 1", "request 2"
+        ]
+        assert all(p.startswith(compiled.prefix) for p in rendered)
+
+
+class TestReadFrontmatter:
+    """Test frontmatter-only parsing with lazily loaded bodies."""
+
+    @pytest.mark.parametrize("content", [
+        "---\nname: a\n---\nBody\n",
+        "---\nname: a\n---\n\n  \nBody after blank lines",
+        "No frontmatter at all\n",
+        "---\nname: a\n---",
+        "---\nname: a\nnever closed\n",
+        "---\nname: [broken\n---\nBody",
+        "---  \nname: a\n---  \n  Indented body\n",
+    ])
+    def test_matches_full_parse(self, tmp_path, content):
+        """Results are identical to parse_skill_frontmatter on the whole file."""
+        path = tmp_path / "skill.md"
+        path.write_text(content)
+
+        frontmatter, body = read_frontmatter(path)
+
+        assert (frontmatter, body.read()) == parse_skill_frontmatter(content)
+
+    def test_matches_full_parse_for_repo_files(self):
+        """Every skill, agent and command in the repo parses identically."""
+        paths = [
+            *REPO_ROOT.glob("skills/**/*.md"),
+            *REPO_ROOT.glob("agents/*.md"),
+            *REPO_ROOT.glob("commands/*.md"),
+        ]
+        assert paths
+
+        for path in paths:
+            frontmatter, body = read_frontmatter(path)
+            assert (frontmatter, body.read()) == parse_skill_frontmatter(path.read_text()), path
+
+    def test_body_is_not_read_until_accessed(self, tmp_path):
+        """The body offset points past the header and is only read on demand."""
+        path = tmp_path / "big.md"
+        path.write_text("---\nname: big\n---\n" + "x" * 100_000)
+
+        frontmatter, body = read_frontmatter(path)
+
+        assert frontmatter == {"name": "big"}
+        assert not body.loaded
+        assert body.offset == len("---\nname: big\n---\n")
+
+        assert len(str(body)) == 100_000
+        assert body.loaded
+
+    def test_iter_frontmatter_indexes_directory(self, tmp_path):
+        """Agent/command files are indexed by name without reading bodies."""
+        (tmp_path / "reviewer.md").write_text("---\nname: reviewer\n---\nLong prompt\n")
+        (tmp_path / "plain.md").write_text("# Command without frontmatter\n")
+        (tmp_path / "notes.txt").write_text("---\nname: ignored\n---\n")
+
+        index = {path.name: (fm, body) for path, fm, body in iter_frontmatter(tmp_path)}
+
+        assert sorted(index) == ["plain.md", "reviewer.md"]
+        assert index["reviewer.md"][0] == {"name": "reviewer"}
+        assert index["plain.md"][0] == {}
+        assert not any(body.loaded for _, body in index.values())
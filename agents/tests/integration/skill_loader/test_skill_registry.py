@@ -0,0 +1,168 @@
+"""Tests for the skill registry index."""
+
+import os
+import time
+
+import pytest
+
+from agents.tests.lib import (
+    AgentRunner,
+    SkillRegistry,
+    create_mock,
+    find_local_skills_dir,
+    get_skill_cache,
+)
+
+
+def write_skill(path, name, body="Body"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(f"---\nname: {name}\ndescription: {name} skill\n---\n\n{body}\n")
+
+
+def bump_mtime(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def two_scopes(tmp_path):
+    """Global and repo-local skills directories with an overlapping skill."""
+    global_dir = tmp_path / "home" / ".claude" / "skills"
+    local_dir = tmp_path / "repo" / ".claude" / "skills"
+    write_skill(global_dir / "daily-log" / "SKILL.md", "daily-log")
+    write_skill(global_dir / "legacy.md", "legacy")
+    write_skill(global_dir / "shared" / "SKILL.md", "shared", body="global")
+    write_skill(local_dir / "shared" / "SKILL.md", "shared", body="local")
+    (global_dir / "README.md").write_text("# Skills\n")
+    return global_dir, local_dir
+
+
+class TestSkillRegistry:
+    """Test scanning, lookup and refresh."""
+
+    def test_indexes_both_formats_and_scopes(self, two_scopes):
+        """Directory and flat skills from every scope are indexed once."""
+        global_dir, local_dir = two_scopes
+        registry = SkillRegistry([(global_dir, "global"), (local_dir, "local")])
+
+        assert registry.names() == ["daily-log", "legacy", "shared"]
+        assert registry.get("legacy").frontmatter["name"] == "legacy"
+        assert registry.get("daily-log").scope == "global"
+        assert registry.scans == 1
+
+    def test_local_overrides_global(self, two_scopes):
+        """Later (repo-local) directories win for the same skill name."""
+        registry = SkillRegistry([(two_scopes[0], "global"), (two_scopes[1], "local")])
+
+        entry = registry.get("shared")
+        _, content = registry.load("shared")
+
+        assert entry.scope == "local"
+        assert content.strip() == "local"
+
+    def test_directory_format_wins_over_flat(self, tmp_path):
+        """As in load_skill, <name>/SKILL.md beats <name>.md."""
+        write_skill(tmp_path / "dup.md", "flat")
+        write_skill(tmp_path / "dup" / "SKILL.md", "dir")
+
+        assert SkillRegistry([(tmp_path, "global")]).get("dup").frontmatter["name"] == "dir"
+
+    def test_missing_skill(self, two_scopes):
+        """Unknown names raise FileNotFoundError like load_skill."""
+        registry = SkillRegistry([(two_scopes[0], "global")])
+
+        with pytest.raises(FileNotFoundError):
+            registry.get("nope")
+        assert "nope" not in registry
+
+    def test_refresh_only_when_directories_change(self, two_scopes):
+        """refresh() is a no-op until a skill is added."""
+        global_dir, _ = two_scopes
+        registry = SkillRegistry([(global_dir, "global")])
+
+        assert not registry.refresh()
+
+        write_skill(global_dir / "new-skill" / "SKILL.md", "new-skill")
+        bump_mtime(global_dir)
+
+        assert registry.refresh()
+        assert "new-skill" in registry
+        assert registry.scans == 2
+
+    def test_skill_added_to_existing_directory(self, tmp_path):
+        """Creating SKILL.md in an existing subdirectory is detected."""
+        (tmp_path / "pending").mkdir()
+        registry = SkillRegistry([(tmp_path, "global")])
+        assert "pending" not in registry
+
+        write_skill(tmp_path / "pending" / "SKILL.md", "pending")
+        bump_mtime(tmp_path / "pending")
+
+        assert registry.refresh()
+        assert "pending" in registry
+
+    def test_automatic_refresh_interval(self, tmp_path):
+        """With refresh_interval, lookups pick up new skills on their own."""
+        registry = SkillRegistry([(tmp_path, "global")], refresh_interval=0.01)
+        write_skill(tmp_path / "later.md", "later")
+        bump_mtime(tmp_path)
+        time.sleep(0.02)
+
+        assert registry.get("later").name == "later"
+
+    def test_content_edits_are_not_stale(self, tmp_path):
+        """Loads go through the skill cache, so edits show up without a rescan."""
+        write_skill(tmp_path / "edit" / "SKILL.md", "edit", body="v1")
+        registry = SkillRegistry([(tmp_path, "global")])
+        registry.load("edit")
+
+        write_skill(tmp_path / "edit" / "SKILL.md", "edit", body="version 2")
+
+        assert registry.load("edit")[1].strip() == "version 2"
+        assert registry.scans == 1
+
+    def test_frontmatter_edits_are_not_stale(self, tmp_path):
+        """Editing a SKILL.md in place refreshes its metadata without a rescan."""
+        skill = tmp_path / "edit" / "SKILL.md"
+        skill.parent.mkdir()
+        skill.write_text("---\nname: edit\ndescription: old\n---\n\nbody\n")
+        registry = SkillRegistry([(tmp_path, "global")])
+        assert registry.get("edit").frontmatter["description"] == "old"
+
+        skill.write_text("---\nname: edit\ndescription: new text\n---\n\nbody\n")
+        bump_mtime(skill)
+
+        assert registry.get("edit").frontmatter["description"] == "new text"
+        assert [e.frontmatter["description"] for e in registry] == ["new text"]
+        assert registry.scans == 1
+
+    def test_scan_reads_frontmatter_only(self, tmp_path):
+        """Scanning never parses skill bodies or fills the skill cache."""
+        write_skill(tmp_path / "meta" / "SKILL.md", "meta", body="x" * 10_000)
+        get_skill_cache().clear()
+
+        registry = SkillRegistry([(tmp_path, "global")])
+        entry = registry.get("meta")
+
+        assert entry.frontmatter["name"] == "meta"
+        assert not entry.body.loaded
+        assert get_skill_cache().info().currsize == 0
+
+    def test_find_local_skills_dir(self, two_scopes):
+        """The nearest .claude/skills above the start directory is found."""
+        _, local_dir = two_scopes
+        nested = local_dir.parent.parent / "src" / "deep"
+        nested.mkdir(parents=True)
+
+        assert find_local_skills_dir(nested) == local_dir.resolve()
+
+    @pytest.mark.asyncio
+    async def test_agent_runner_uses_registry(self, two_scopes):
+        """AgentRunner resolves skills through a shared registry."""
+        registry = SkillRegistry([(two_scopes[0], "global"), (two_scopes[1], "local")])
+        runner = AgentRunner("shared", registry=registry, mock_client=create_mock("ok"))
+
+        result = await runner.execute("go")
+
+        assert result.success
+        assert runner.mock_client.prompts_received[0].startswith("local")
@@ -0,0 +1,306 @@
+"""Tests for the single-pass validation engine."""
+
+import re
+
+import pytest
+
+from agents.tests.lib.validators import (
+    AppendSnapshot,
+    COMMAND_INJECTION_RULES,
+    PATH_TRAVERSAL_PATTERNS,
+    SESSION_TEMPLATE_SECTIONS,
+    MarkdownValidator,
+    PatternMatch,
+    SecurityValidator,
+    StreamingMarkdownValidator,
+    StreamingPathTraversalValidator,
+    StreamingSecurityValidator,
+    StreamingTemplateValidator,
+    StreamingValidator,
+    TemplateValidator,
+    ValidationEngine,
+    default_engine,
+    feed_file,
+)
+
+
+SAMPLES = [
+    "",
+    "plain text with nothing interesting",
+    "cat ~/.ssh/id_rsa",
+    "../../ETC/passwd",
+    "/Root/secrets and /var/log",
+    "echo $(whoami)",
+    "run `ls`",
+    "a; rm -rf /",
+    "curl x |  sh",
+    "echo hi >  /dev/null",
+    "#Bad heading\n## Good heading",
+    "text\n###NoSpace",
+    "## Main Objectives\n## What Went Well\n## Challenges\n## Key Decisions\n## Follow-up Items",
+    "Main Objectives only",
+    "a ;     \n\n    rm later",
+    "x |" + " " * 40 + "sh",
+    "####### seven hashes\n#######x",
+    "## 2024-02-05\ntext\n## 2024-02-05\n",
+]
+
+
+def naive_no_path_traversal(path):
+    return not any(p in path.lower() for p in PATH_TRAVERSAL_PATTERNS)
+
+
+def naive_no_command_injection(content):
+    return not any(re.search(p, content) for _, p in COMMAND_INJECTION_RULES)
+
+
+def naive_has_valid_headings(content):
+    return not re.findall(r'^#{1,6}[^\s#]', content, re.MULTILINE)
+
+
+class TestValidationEngine:
+    """Test combined-pattern scanning."""
+
+    def test_reports_every_match_with_offsets(self):
+        """Matches are ordered by offset and carry the matched text."""
+        engine = ValidationEngine([("dollar", r"\$\("), ("tick", r"`")])
+
+        matches = engine.scan("a `b` $(c)")
+
+        assert matches == [
+            PatternMatch("tick", 2, 3, "`"),
+            PatternMatch("tick", 4, 5, "`"),
+            PatternMatch("dollar", 6, 8, "$("),
+        ]
+
+    def test_overlapping_and_same_offset_matches(self):
+        """Rules starting at the same offset, or inside another match, are all found."""
+        engine = ValidationEngine.from_literals(["Key", "Key Decisions", "Decisions"])
+
+        matches = engine.scan("Key Decisions")
+
+        assert [(m.rule, m.start) for m in matches] == [
+            ("Key", 0),
+            ("Key Decisions", 0),
+            ("Decisions", 4),
+        ]
+
+    def test_scoped_flags_apply_per_rule(self):
+        """Case-insensitive and multiline rules coexist in one engine."""
+        engine = ValidationEngine([
+            ("etc", r"(?i:/etc/)"),
+            ("heading", r"(?m:^#[^\s#])"),
+            ("exact", r"Challenges"),
+        ])
+
+        assert engine.matched_rules("/ETC/\n#x\nchallenges") == {"etc", "heading"}
+
+    def test_matched_rules_for_template_sections(self):
+        """matched_rules reports which sections are present."""
+        engine = ValidationEngine.from_literals(SESSION_TEMPLATE_SECTIONS)
+
+        found = engine.matched_rules("## Challenges\n## Key Decisions")
+
+        assert found == {"Challenges", "Key Decisions"}
+
+    def test_default_engine_answers_all_checks_in_one_scan(self):
+        """The built-in engine covers security, headings and template sections."""
+        content = "#Title\n## Main Objectives\nrun `ls ~/`"
+
+        rules = {m.rule for m in default_engine().scan(content)}
+
+        assert rules == {
+            "markdown:malformed_heading",
+            "section:Main Objectives",
+            "injection:backtick",
+            "path_traversal:~",
+        }
+        assert default_engine() is default_engine()
+
+
+class TestValidatorEquivalence:
+    """Validators routed through the engine behave as before."""
+
+    @pytest.mark.parametrize("content", SAMPLES)
+    def test_security_validators(self, content):
+        assert SecurityValidator.no_path_traversal(content) == naive_no_path_traversal(content)
+        assert SecurityValidator.no_command_injection(content) == naive_no_command_injection(content)
+
+    @pytest.mark.parametrize("content", SAMPLES)
+    def test_markdown_and_template_validators(self, content):
+        assert MarkdownValidator.has_valid_headings(content) == naive_has_valid_headings(content)
+        assert TemplateValidator.has_complete_template(content) == all(
+            section in content for section in SESSION_TEMPLATE_SECTIONS
+        )
+
+    def test_required_sections_edge_cases(self):
+        """Empty and duplicated section lists keep their original meaning."""
+        assert TemplateValidator.has_required_sections("anything", [])
+        assert TemplateValidator.has_required_sections("A B", ["A", "A", "B"])
+        assert not TemplateValidator.has_required_sections("A", ["A", "B"])
+
+
+def feed_in_chunks(validator, content, size):
+    validator.reset()
+    for i in range(0, len(content), size):
+        validator.feed(content[i:i + size])
+    return validator.finish()
+
+
+class TestStreamingValidators:
+    """Chunk-fed validators agree with their whole-content counterparts."""
+
+    @pytest.mark.parametrize("content", SAMPLES)
+    @pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+    def test_matches_whole_content_results(self, content, size):
+        """Any chunking gives the same answer as validating the full string."""
+        date = "2024-02-05"
+        markdown_ok = (
+            MarkdownValidator.has_valid_headings(content)
+            and MarkdownValidator.no_duplicate_date_headings(content, date)
+        )
+
+        assert feed_in_chunks(StreamingSecurityValidator(), content, size) == (
+            SecurityValidator.no_command_injection(content)
+        )
+        assert feed_in_chunks(StreamingPathTraversalValidator(), content, size) == (
+            SecurityValidator.no_path_traversal(content)
+        )
+        assert feed_in_chunks(StreamingTemplateValidator(), content, size) == (
+            TemplateValidator.has_complete_template(content)
+        )
+        assert feed_in_chunks(StreamingMarkdownValidator(date), content, size) == markdown_ok
+
+    def test_pattern_split_across_whitespace_and_chunks(self):
+        """A pattern broken by a long whitespace run and a chunk edge is found."""
+        validator = StreamingSecurityValidator()
+
+        assert validator.feed("cleanup ;")
+        assert validator.feed(" " * 500)
+        assert not validator.feed("rm -rf /")
+        assert validator.violation.rule == "chained_rm"
+        assert validator.violation.start == len("cleanup ")
+
+    def test_path_traversal_split_across_chunks(self):
+        """A traversal literal split over chunks fails like the whole-file check."""
+        validator = StreamingPathTraversalValidator()
+
+        assert validator.feed("cat /ro")
+        assert not validator.feed("OT/secrets")
+        assert validator.violation.start == len("cat ")
+        assert validator("read ./notes.md") and not validator("cd ../up")
+
+    def test_template_reports_missing_and_stops_early(self):
+        """The template validator passes mid-stream and reports what is missing."""
+        validator = StreamingTemplateValidator(["Alpha", "Beta"])
+
+        assert validator.feed("## Alp")
+        assert validator.feed("ha\n")
+        assert validator.missing == ["Beta"]
+        assert not validator.finish()
+
+        validator.reset()
+        validator.feed("Alpha Beta")
+        assert validator._done
+        assert validator.finish()
+
+    def test_carried_buffer_stays_small(self):
+        """Only a short tail is kept between chunks."""
+        validator = StreamingTemplateValidator()
+
+        for _ in range(1000):
+            validator.feed("plain words without any headings " * 10)
+
+        assert len(validator._buffer) < 64
+
+    def test_callable_and_fresh(self):
+        """Instances work as plain validators and copy cleanly."""
+        validator = StreamingSecurityValidator()
+        validator.feed("$(x)")
+
+        assert validator("safe text")
+        assert not validator("echo $(id)")
+        assert validator.fresh().ok
+
+    def test_base_class_is_abstract(self):
+        """The base class can't be instantiated without ok and _on_match."""
+        with pytest.raises(TypeError):
+            StreamingValidator(ValidationEngine([]), 8)
+
+    def test_feed_file(self, tmp_path):
+        """Large files are validated block by block."""
+        path = tmp_path / "2024-02.md"
+        body = "## 2024-02-05\n### Session 1\nNotes\n" + "words " * 50_000
+        path.write_text(body + "\n## 2024-02-05\n")
+
+        assert feed_file(StreamingSecurityValidator(), path, block_size=4096)
+        assert not feed_file(StreamingMarkdownValidator("2024-02-05"), path, block_size=4096)
+
+
+def naive_appends_to_end(original, new_content, insertion):
+    if not new_content.endswith(insertion):
+        return False
+    return original.strip() == new_content[:-len(insertion)].strip()
+
+
+class TestAppendVerification:
+    """Test in-memory and file-based append checks."""
+
+    @pytest.mark.parametrize("original,new_content,insertion", [
+        ("old\n", "old\nnew\n", "new\n"),
+        ("old\n\n", "old\n\n\nnew", "new"),
+        ("old\n", "oldnew", "new"),
+        ("old\n", "new\nold\n", "old\n"),
+        ("old", "olx\nnew", "new"),
+        ("old", "old\nnew", "nope"),
+        ("  old  ", "old new", "new"),
+        ("", "new", "new"),
+        ("", "anything", ""),
+        ("   ", "anything", ""),
+        ("old", "old", ""),
+    ])
+    def test_in_memory_matches_original_semantics(self, original, new_content, insertion):
+        """The copy-free check agrees with the slicing implementation."""
+        assert MarkdownValidator.appends_to_end(original, new_content, insertion) == (
+            naive_appends_to_end(original, new_content, insertion)
+        )
+
+    def test_file_append_verifies(self, tmp_path):
+        """A real append passes, with or without the full-prefix digest."""
+        log = tmp_path / "2024-02.md"
+        log.write_text("## 2024-02-04\n\nOld content\n")
+        snapshot = AppendSnapshot.capture(log)
+
+        with open(log, "a") as f:
+            f.write("\n## 2024-02-05\n\nNew content\n")
+
+        assert snapshot.verify("## 2024-02-05\n\nNew content\n")
+        assert snapshot.verify()
+        assert snapshot.verify(full=True)
+        assert not snapshot.verify("## 2024-02-06\n")
+
+    def test_detects_edits_to_original(self, tmp_path):
+        """Boundary edits fail fast; earlier edits need the full check."""
+        log = tmp_path / "2024-02.md"
+        original = "Header line\n" + "filler\n" * 2000 + "Last entry\n"
+        log.write_text(original)
+        snapshot = AppendSnapshot.capture(log, boundary_bytes=64)
+
+        log.write_text(original.replace("Last entry", "Last entrx") + "new\n")
+        assert not snapshot.verify("new\n")
+
+        log.write_text(original.replace("Header", "Headex") + "new\n")
+        assert snapshot.verify("new\n")
+        assert not snapshot.verify("new\n", full=True)
+
+        log.write_text("Header line\n")
+        assert not snapshot.verify()
+
+    def test_new_and_empty_files(self, tmp_path):
+        """A missing file is an empty original."""
+        log = tmp_path / "2024-03.md"
+        snapshot = AppendSnapshot.capture(log)
+
+        assert not snapshot.verify()
+        log.write_text("## 2024-03-01\n")
+        assert snapshot.verify("## 2024-03-01\n", full=True)
@@ -1,22 +1,90 @@
-"""Shared testing utilities for Claude Code agents."""
-
-from .mock_client import MockLLMClient, create_mock, create_sequence_mock, create_callable_mock
-from .skill_loader import load_skill, parse_skill_frontmatter, build_skill_prompt
-from .agent_runner import AgentRunner, AgentResult
-from .base_test import BaseSkillTest, TestCase
-from . import validators
-
-__all__ = [
-    "MockLLMClient",
-    "create_mock",
-    "create_sequence_mock",
-    "create_callable_mock",
-    "load_skill",
-    "parse_skill_frontmatter",
-    "build_skill_prompt",
-    "AgentRunner",
-    "AgentResult",
-    "BaseSkillTest",
-    "TestCase",
-    "validators",
-]
+"""Shared testing utilities for Claude Code agents.
+
+Submodules are imported on first attribute access, so ``python -m
+agents.tests.lib.<module>`` and ``from agents.tests.lib.<module> import ...``
+load only what they use.
+"""
+
+import importlib
+from typing import Any, Dict, Optional, Tuple
+
+# Public name -> (submodule, attribute); attribute None means the submodule itself
+_EXPORTS: Dict[str, Tuple[str, Optional[str]]] = {
+    "MockLLMClient": ("mock_client", "MockLLMClient"),
+    "MockQuery": ("mock_client", "MockQuery"),
+    "MockSDKMessage": ("mock_client", "MockSDKMessage"),
+    "MockTextBlock": ("mock_client", "MockTextBlock"),
+    "MockToolUse": ("mock_client", "MockToolUse"),
+    "create_mock": ("mock_client", "create_mock"),
+    "create_sequence_mock": ("mock_client", "create_sequence_mock"),
+    "create_callable_mock": ("mock_client", "create_callable_mock"),
+    "load_skill": ("skill_loader", "load_skill"),
+    "parse_skill_frontmatter": ("skill_loader", "parse_skill_frontmatter"),
+    "build_skill_prompt": ("skill_loader", "build_skill_prompt"),
+    "compile_skill_prompt": ("skill_loader", "compile_skill_prompt"),
+    "read_frontmatter": ("skill_loader", "read_frontmatter"),
+    "iter_frontmatter": ("skill_loader", "iter_frontmatter"),
+    "LazyBody": ("skill_loader", "LazyBody"),
+    "CompiledSkillPrompt": ("skill_loader", "CompiledSkillPrompt"),
+    "SkillCache": ("skill_loader", "SkillCache"),
+    "get_skill_cache": ("skill_loader", "get_skill_cache"),
+    "SkillRegistry": ("skill_registry", "SkillRegistry"),
+    "SkillEntry": ("skill_registry", "SkillEntry"),
+    "find_local_skills_dir": ("skill_registry", "find_local_skills_dir"),
+    "AgentRunner": ("agent_runner", "AgentRunner"),
+    "AgentResult": ("agent_runner", "AgentResult"),
+    "AgentTiming": ("agent_runner", "AgentTiming"),
+    "BatchResult": ("agent_runner", "BatchResult"),
+    "ToolCall": ("agent_runner", "ToolCall"),
+    "TextDelta": ("agent_runner", "TextDelta"),
+    "ToolCallStarted": ("agent_runner", "ToolCallStarted"),
+    "ToolCallFinished": ("agent_runner", "ToolCallFinished"),
+    "FinalResult": ("agent_runner", "FinalResult"),
+    "ValidationFailure": ("agent_runner", "ValidationFailure"),
+    "Cassette": ("cassette", "Cassette"),
+    "CassetteMissError": ("cassette", "CassetteMissError"),
+    "SessionRecord": ("daily_log_parser", "SessionRecord"),
+    "iter_sessions": ("daily_log_parser", "iter_sessions"),
+    "iter_all_sessions": ("daily_log_parser", "iter_all_sessions"),
+    "DailyLogIndex": ("daily_log_index", "DailyLogIndex"),
+    "DateEntry": ("daily_log_index", "DateEntry"),
+    "MonthIndex": ("daily_log_index", "MonthIndex"),
+    "PeriodStats": ("daily_log_stats", "PeriodStats"),
+    "SessionColumns": ("daily_log_stats", "SessionColumns"),
+    "ExportStats": ("daily_log_export", "ExportStats"),
+    "export_daily_logs": ("daily_log_export", "export_daily_logs"),
+    "AppendResult": ("daily_log_writer", "AppendResult"),
+    "DailyLogWriter": ("daily_log_writer", "DailyLogWriter"),
+    "SearchHit": ("search_index", "SearchHit"),
+    "SearchIndex": ("search_index", "SearchIndex"),
+    "Team": ("shortcut_workspaces", "Team"),
+    "WorkspaceDirectory": ("shortcut_workspaces", "WorkspaceDirectory"),
+    "load_workspaces": ("shortcut_workspaces", "load_workspaces"),
+    "PermissionMatcher": ("permissions", "PermissionMatcher"),
+    "PermissionRule": ("permissions", "PermissionRule"),
+    "SessionSlot": ("session_numbers", "SessionSlot"),
+    "allocate_session": ("session_numbers", "allocate"),
+    "Note": ("capture", "Note"),
+    "capture": ("capture", "capture"),
+    "capture_batch": ("capture", "capture_batch"),
+    "BaseSkillTest": ("base_test", "BaseSkillTest"),
+    "TestCase": ("base_test", "TestCase"),
+    "validators": ("validators", None),
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attribute = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    module = importlib.import_module(f".{module_name}", __name__)
+    value = module if attribute is None else getattr(module, attribute)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,11 +1,14 @@
 """Agent runner that executes skills using Claude Agent SDK."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, Callable, Iterable, Iterator, List, Optional, Dict, Any, Union
 import asyncio
+import time
 
-from .skill_loader import build_skill_prompt
+from .cassette import Cassette
+from .skill_loader import compile_skill_prompt
+from .skill_registry import SkillRegistry
 
 
 @dataclass
@@ -14,6 +17,42 @@ class ToolCall:
     tool_name: str
     parameters: Dict[str, Any]
     result: Optional[str] = None
+    duration_ms: Optional[float] = None
+
+
+@dataclass
+class AgentTiming:
+    """Monotonic-clock timing breakdown of a run, in milliseconds.
+
+    ``first_message_ms`` and ``first_tool_call_ms`` are measured from the
+    start of the run. A tool call's latency runs from the message that
+    requested it to the arrival of the next message (or the end of stream).
+    """
+    skill_load_ms: Optional[float] = None
+    prompt_build_ms: Optional[float] = None
+    first_message_ms: Optional[float] = None
+    first_tool_call_ms: Optional[float] = None
+    tool_call_ms: List[float] = field(default_factory=list)
+    total_ms: Optional[float] = None
+
+
+def _elapsed_ms(since: float) -> float:
+    return (time.monotonic() - since) * 1000
+
+
+# Callables notified with (runner, result) whenever a run finishes
+_result_listeners: List[Callable[["AgentRunner", "AgentResult"], None]] = []
+
+
+def add_result_listener(listener: Callable[["AgentRunner", "AgentResult"], None]):
+    """Register a callable to receive every finished (runner, result) pair."""
+    _result_listeners.append(listener)
+
+
+def remove_result_listener(listener: Callable[["AgentRunner", "AgentResult"], None]):
+    """Unregister a listener added with ``add_result_listener``."""
+    if listener in _result_listeners:
+        _result_listeners.remove(listener)
 
 
 @dataclass
@@ -24,6 +63,106 @@ class AgentResult:
     duration_ms: Optional[int] = None
     success: bool = True
     error: Optional[str] = None
+    messages: Optional[List[Any]] = None
+    aborted: Optional["ValidationFailure"] = None
+    timing: Optional[AgentTiming] = None
+    prompt_bytes: Optional[int] = None
+    usage: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class ValidationFailure:
+    """Where and why a run was stopped by a validator."""
+    validator: str
+    target: str  # "text" or "tool_call"
+    value: str
+    event_index: int
+    tool_call: Optional[ToolCall] = None
+
+
+@dataclass
+class TextDelta:
+    """Text emitted by the agent in a single message."""
+    text: str
+
+
+@dataclass
+class ToolCallStarted:
+    """A tool call appeared in the agent's output."""
+    tool_call: ToolCall
+
+
+@dataclass
+class ToolCallFinished:
+    """A tool call completed (the next message arrived or the stream ended)."""
+    tool_call: ToolCall
+
+
+@dataclass
+class FinalResult:
+    """The run is over; carries the complete AgentResult."""
+    result: AgentResult
+
+
+AgentEvent = Union[TextDelta, ToolCallStarted, ToolCallFinished, FinalResult]
+
+
+def _validator_name(validator: Callable) -> str:
+    if hasattr(validator, 'feed'):
+        return type(validator).__qualname__
+    return getattr(validator, '__qualname__', None) or repr(validator)
+
+
+def _validation_error(failure: ValidationFailure) -> str:
+    return (
+        f"Validation failed: {failure.validator} rejected "
+        f"{failure.target} {failure.value!r}"
+    )
+
+
+def _parameter_strings(value: Any) -> Iterator[str]:
+    """Yield every string nested in tool-call parameters."""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _parameter_strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _parameter_strings(item)
+
+
+def _message_text(message: Any) -> str:
+    """Concatenate the text blocks of an SDK message."""
+    text = ""
+    if hasattr(message, 'content'):
+        for block in message.content:
+            if hasattr(block, 'text'):
+                text += block.text
+    return text
+
+
+@dataclass
+class BatchResult:
+    """Results from executing a batch of requests concurrently."""
+    results: List[AgentResult]
+    latencies_ms: List[float]
+    wall_ms: float
+
+    @property
+    def total_latency_ms(self) -> float:
+        """Sum of per-request latencies (the cost of running serially)."""
+        return sum(self.latencies_ms)
+
+    @property
+    def speedup(self) -> float:
+        """Summed latency divided by wall-clock time."""
+        return self.total_latency_ms / self.wall_ms if self.wall_ms else 0.0
+
+    @property
+    def success(self) -> bool:
+        """True if every request succeeded."""
+        return all(result.success for result in self.results)
 
 
 class AgentRunner:
@@ -37,6 +176,11 @@ class AgentRunner:
         skill_name: str,
         skills_dir: Optional[Path] = None,
         mock_client=None,
+        cassette: Optional[Cassette] = None,
+        query_fn=None,
+        validators: Optional[List[Callable[[str], bool]]] = None,
+        text_validators: Optional[List[Any]] = None,
+        registry: Optional[SkillRegistry] = None,
     ):
         """Initialize the agent runner.
 
@@ -44,47 +188,326 @@ class AgentRunner:
             skill_name: Name of the skill to run
             skills_dir: Directory containing skills (defaults to ~/.claude/skills)
             mock_client: Optional mock LLM client for testing
+            cassette: Optional record/replay cassette for SDK runs
+                (defaults to one configured via AGENT_CASSETTE_DIR)
+            query_fn: Optional stand-in for ``claude_agent_sdk.query``; called
+                with ``prompt`` and the options dict
+            validators: Checks applied to every string in each tool call's
+                parameters as it arrives (e.g.
+                ``SecurityValidator.no_path_traversal``); the run is aborted
+                on the first one returning False
+            text_validators: Checks applied to each piece of agent text as it
+                arrives, with the same abort behavior. Streaming validators
+                (objects with ``feed``/``finish``, e.g.
+                ``StreamingSecurityValidator()``) are fed the text as one
+                continuous stream, checked again with ``finish`` when the run
+                ends, and copied with ``fresh()`` for every run
+            registry: Optional SkillRegistry to resolve the skill from instead
+                of probing ``skills_dir``
         """
         self.skill_name = skill_name
         self.skills_dir = skills_dir or Path.home() / ".claude" / "skills"
         self.mock_client = mock_client
+        self.cassette = cassette if cassette is not None else Cassette.from_env()
+        self.query_fn = query_fn
+        self.validators = list(validators or [])
+        self.text_validators = list(text_validators or [])
+        self.registry = registry
 
-    async def execute(self, user_request: str) -> AgentResult:
+    async def execute(self, user_request: str, keep_messages: bool = False) -> AgentResult:
         """Execute the skill with a user request.
 
         Args:
             user_request: The user's input/request to the skill
+            keep_messages: Retain raw SDK messages on ``AgentResult.messages``
 
         Returns:
             AgentResult containing output and metadata
         """
+        result = None
+        async for event in self.stream(user_request, keep_messages=keep_messages):
+            if isinstance(event, FinalResult):
+                result = event.result
+        return result
+
+    async def stream(
+        self,
+        user_request: str,
+        keep_messages: bool = False,
+    ) -> AsyncIterator[AgentEvent]:
+        """Execute the skill and yield events as they arrive.
+
+        Yields ``TextDelta``, ``ToolCallStarted`` and ``ToolCallFinished``
+        events while the agent runs, and always ends with a ``FinalResult``.
+        Errors are reported through the final result rather than raised.
+        Raw SDK messages are not retained unless ``keep_messages`` is set.
+
+        If any configured validator rejects a tool call or text, the
+        offending event is yielded, the SDK stream is closed and the final
+        result is a failure with ``aborted`` describing where it stopped.
+
+        Args:
+            user_request: The user's input/request to the skill
+            keep_messages: Retain raw SDK messages on ``AgentResult.messages``
+
+        Yields:
+            AgentEvent instances
+        """
+        started = time.monotonic()
+        timing = AgentTiming()
+        prompt_bytes = None
         try:
             # Build prompt from skill + user request
-            prompt = build_skill_prompt(
-                self.skill_name,
-                user_request,
-                self.skills_dir
-            )
-
-            # If using mock client, return mock response
-            if self.mock_client:
-                response = await self.mock_client.submit(prompt)
-                return AgentResult(
-                    output=response.content,
-                    tool_calls=[],
-                    success=True
-                )
+            if self.registry is not None:
+                compiled = self.registry.compile(self.skill_name)
+            else:
+                compiled = compile_skill_prompt(self.skill_name, self.skills_dir)
+            timing.skill_load_ms = _elapsed_ms(started)
+
+            build_started = time.monotonic()
+            prompt = compiled.render(user_request)
+            timing.prompt_build_ms = _elapsed_ms(build_started)
+            prompt_bytes = len(prompt.encode("utf-8"))
+        except Exception as e:
+            yield self._finish(AgentResult(
+                output="",
+                tool_calls=[],
+                success=False,
+                error=str(e)
+            ), timing, started, prompt_bytes)
+            return
+
+        # If using mock client, return mock response; otherwise use real SDK
+        if self.mock_client:
+            events = self._stream_mock(prompt, timing, started)
+        else:
+            events = self._stream_sdk(prompt, keep_messages, timing, started)
+
+        check = bool(self.validators or self.text_validators)
+        text_validators = [
+            v.fresh() if hasattr(v, "feed") else v for v in self.text_validators
+        ]
+        output = ""
+        tool_calls = []
+        index = -1
+        try:
+            async for event in events:
+                index += 1
+                if isinstance(event, FinalResult):
+                    result = event.result
+                    if check and result.success:
+                        failure = self._validate_end(text_validators, result.output, index)
+                        if failure is not None:
+                            result.success = False
+                            result.error = _validation_error(failure)
+                            result.aborted = failure
+                    yield self._finish(result, timing, started, prompt_bytes)
+                    continue
+                if not check:
+                    yield event
+                    continue
+
+                if isinstance(event, TextDelta):
+                    output = event.text
+                elif isinstance(event, ToolCallStarted):
+                    tool_calls.append(event.tool_call)
+
+                failure = self._validate(event, index, text_validators)
+                yield event
+                if failure is not None:
+                    yield self._finish(AgentResult(
+                        output=output,
+                        tool_calls=tool_calls,
+                        success=False,
+                        error=_validation_error(failure),
+                        aborted=failure
+                    ), timing, started, prompt_bytes)
+                    return
+        finally:
+            await events.aclose()
+
+    def _finish(
+        self,
+        result: AgentResult,
+        timing: AgentTiming,
+        started: float,
+        prompt_bytes: Optional[int],
+    ) -> FinalResult:
+        """Attach timing to a result, notify listeners and wrap it as the final event."""
+        timing.total_ms = _elapsed_ms(started)
+        result.timing = timing
+        result.prompt_bytes = prompt_bytes
+        if result.duration_ms is None:
+            result.duration_ms = round(timing.total_ms)
+        for listener in list(_result_listeners):
+            listener(self, result)
+        return FinalResult(result)
 
-            # Otherwise use real Claude Agent SDK
-            return await self._execute_with_sdk(prompt)
+    def _validate(
+        self,
+        event: AgentEvent,
+        index: int,
+        text_validators: List[Any],
+    ) -> Optional[ValidationFailure]:
+        """Run configured validators against a single event."""
+        if isinstance(event, TextDelta):
+            for validator in text_validators:
+                if hasattr(validator, "feed"):
+                    # Separate messages so patterns never join across them
+                    ok = validator.feed(event.text + "\n")
+                else:
+                    ok = validator(event.text)
+                if not ok:
+                    return ValidationFailure(
+                        validator=_validator_name(validator),
+                        target="text",
+                        value=event.text,
+                        event_index=index,
+                    )
+        elif isinstance(event, ToolCallStarted):
+            for value in _parameter_strings(event.tool_call.parameters):
+                for validator in self.validators:
+                    if not validator(value):
+                        return ValidationFailure(
+                            validator=_validator_name(validator),
+                            target="tool_call",
+                            value=value,
+                            event_index=index,
+                            tool_call=event.tool_call,
+                        )
+        return None
 
+    def _validate_end(
+        self,
+        text_validators: List[Any],
+        output: str,
+        index: int,
+    ) -> Optional[ValidationFailure]:
+        """Finish streaming text validators once the run is complete."""
+        for validator in text_validators:
+            if hasattr(validator, "finish") and not validator.finish():
+                return ValidationFailure(
+                    validator=_validator_name(validator),
+                    target="text",
+                    value=output,
+                    event_index=index,
+                )
+        return None
+
+    async def _stream_mock(
+        self,
+        prompt: str,
+        timing: Optional[AgentTiming] = None,
+        started: Optional[float] = None,
+    ) -> AsyncIterator[AgentEvent]:
+        """Stream events from the mock LLM client."""
+        try:
+            response = await self.mock_client.submit(prompt)
+            if timing is not None:
+                timing.first_message_ms = _elapsed_ms(started)
         except Exception as e:
-            return AgentResult(
+            yield FinalResult(AgentResult(
                 output="",
                 tool_calls=[],
                 success=False,
                 error=str(e)
-            )
+            ))
+            return
+
+        if response.content:
+            yield TextDelta(response.content)
+        yield FinalResult(AgentResult(
+            output=response.content,
+            tool_calls=[],
+            success=True
+        ))
+
+    async def execute_many(
+        self,
+        user_requests: Iterable[str],
+        concurrency: int = 4,
+        timeout: Optional[float] = None,
+    ) -> BatchResult:
+        """Execute many user requests concurrently.
+
+        At most ``concurrency`` requests are in flight at once. Results are
+        returned in input order. Cancelling the awaiting task cancels every
+        in-flight and pending request.
+
+        Args:
+            user_requests: User requests to run against the skill
+            concurrency: Maximum number of simultaneous executions
+            timeout: Optional per-request timeout in seconds; a request that
+                exceeds it yields a failed AgentResult instead of raising
+
+        Returns:
+            BatchResult with ordered results, per-request latency and
+            wall-clock time for the whole batch
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        user_requests = list(user_requests)
+        latencies_ms = [0.0] * len(user_requests)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(index: int, user_request: str) -> AgentResult:
+            async with semaphore:
+                started = time.monotonic()
+                try:
+                    if timeout is None:
+                        result = await self.execute(user_request)
+                    else:
+                        result = await asyncio.wait_for(
+                            self.execute(user_request), timeout
+                        )
+                except asyncio.TimeoutError:
+                    result = AgentResult(
+                        output="",
+                        tool_calls=[],
+                        success=False,
+                        error=f"Timed out after {timeout}s"
+                    )
+                latencies_ms[index] = (time.monotonic() - started) * 1000
+                return result
+
+        started = time.monotonic()
+        tasks = [
+            asyncio.ensure_future(run_one(index, user_request))
+            for index, user_request in enumerate(user_requests)
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        return BatchResult(
+            results=list(results),
+            latencies_ms=latencies_ms,
+            wall_ms=(time.monotonic() - started) * 1000,
+        )
+
+    def _sdk_options(self) -> Dict[str, Any]:
+        """Options passed to ``ClaudeAgentOptions``, as a plain dict."""
+        return {
+            "allowed_tools": ["Read", "Write", "Edit", "Bash", "Glob", "Grep"],
+            "cwd": str(Path.home() / ".claude"),
+            "model": "haiku",  # Fast model for testing
+            "max_turns": 10,
+        }
+
+    def _live_query(self, prompt: str, options: Dict[str, Any]):
+        """Start a live SDK (or stand-in) query stream."""
+        if self.query_fn is not None:
+            return self.query_fn(prompt=prompt, options=options)
+
+        # Import SDK here to avoid requiring it for mock tests
+        from claude_agent_sdk import ClaudeAgentOptions, query
+
+        return query(prompt=prompt, options=ClaudeAgentOptions(**options))
 
     async def _execute_with_sdk(self, prompt: str) -> AgentResult:
         """Execute using real Claude Agent SDK.
@@ -95,59 +518,125 @@ class AgentRunner:
         Returns:
             AgentResult with SDK execution results
         """
+        result = None
+        async for event in self._stream_sdk(prompt):
+            if isinstance(event, FinalResult):
+                result = event.result
+        return result
+
+    async def _stream_sdk(
+        self,
+        prompt: str,
+        keep_messages: bool = False,
+        timing: Optional[AgentTiming] = None,
+        started: Optional[float] = None,
+    ) -> AsyncIterator[AgentEvent]:
+        """Stream events from a real Claude Agent SDK run.
+
+        When a cassette is configured, the stream is recorded or replayed
+        through it; replays don't require the SDK to be installed. If the
+        consumer stops iterating early, the underlying SDK stream is closed.
+
+        Args:
+            prompt: Complete prompt to send
+            keep_messages: Retain raw SDK messages on the final result
+            timing: Optional AgentTiming to fill in as messages arrive
+            started: Monotonic start time of the run (defaults to now)
+
+        Yields:
+            AgentEvent instances, ending with a FinalResult
+        """
+        if timing is None:
+            timing = AgentTiming()
+        if started is None:
+            started = time.monotonic()
+
+        messages = [] if keep_messages else None
+        tool_calls = []
+        pending = []
+        pending_since = 0.0
+        output = ""
+        last_message = None
+        usage = None
+        stream = None
+
         try:
-            # Import SDK here to avoid requiring it for mock tests
-            from claude_agent_sdk import ClaudeAgentOptions, query
+            options = self._sdk_options()
+            if self.cassette is not None:
+                stream = self.cassette.stream(
+                    prompt, options, lambda: self._live_query(prompt, options)
+                )
+            else:
+                stream = self._live_query(prompt, options)
 
-            options = ClaudeAgentOptions(
-                allowed_tools=["Read", "Write", "Edit", "Bash", "Glob", "Grep"],
-                cwd=str(Path.home() / ".claude"),
-                model="haiku",  # Fast model for testing
-                max_turns=10,
-            )
+            async for message in stream:
+                arrived = time.monotonic()
+                if timing.first_message_ms is None:
+                    timing.first_message_ms = (arrived - started) * 1000
 
-            messages = []
-            tool_calls = []
+                # Tools from the previous message have returned by now
+                for tool_call in pending:
+                    tool_call.duration_ms = (arrived - pending_since) * 1000
+                    timing.tool_call_ms.append(tool_call.duration_ms)
+                    yield ToolCallFinished(tool_call)
+                pending = []
 
-            async for message in query(prompt=prompt, options=options):
-                messages.append(message)
+                if messages is not None:
+                    messages.append(message)
+                last_message = message
+                usage = getattr(message, 'usage', None) or usage
+
+                # Output is the text of the final message
+                output = _message_text(message)
+                if output:
+                    yield TextDelta(output)
 
                 # Extract tool calls from message
                 if hasattr(message, 'tool_uses'):
                     for tool_use in message.tool_uses:
-                        tool_calls.append(ToolCall(
+                        tool_call = ToolCall(
                             tool_name=tool_use.name,
                             parameters=tool_use.input,
                             result=getattr(tool_use, 'result', None)
-                        ))
-
-            # Extract final text output
-            output = ""
-            if messages:
-                last_message = messages[-1]
-                if hasattr(last_message, 'content'):
-                    for block in last_message.content:
-                        if hasattr(block, 'text'):
-                            output += block.text
-
-            return AgentResult(
-                output=output,
-                tool_calls=tool_calls,
-                duration_ms=getattr(messages[-1], 'duration_ms', None) if messages else None,
-                success=True
-            )
+                        )
+                        if timing.first_tool_call_ms is None:
+                            timing.first_tool_call_ms = (arrived - started) * 1000
+                        tool_calls.append(tool_call)
+                        pending.append(tool_call)
+                        pending_since = arrived
+                        yield ToolCallStarted(tool_call)
+
+            ended = time.monotonic()
+            for tool_call in pending:
+                tool_call.duration_ms = (ended - pending_since) * 1000
+                timing.tool_call_ms.append(tool_call.duration_ms)
+                yield ToolCallFinished(tool_call)
 
         except ImportError:
-            return AgentResult(
+            yield FinalResult(AgentResult(
                 output="",
                 tool_calls=[],
                 success=False,
                 error="claude-agent-sdk not installed. Run: pip install claude-agent-sdk"
-            )
+            ))
+            return
         except Exception as e:
-            return AgentResult(
+            yield FinalResult(AgentResult(
                 output="",
                 tool_calls=[],
                 success=False,
                 error=str(e)
-            )
+            ))
+            return
+        finally:
+            if stream is not None and hasattr(stream, 'aclose'):
+                await stream.aclose()
+
+        yield FinalResult(AgentResult(
+            output=output,
+            tool_calls=tool_calls,
+            duration_ms=getattr(last_message, 'duration_ms', None),
+            success=True,
+            messages=messages,
+            usage=usage
+        ))
@@ -0,0 +1,228 @@
+"""Quick-capture notes into the second-brain inbox.
+
+Each note becomes ``00-inbox/YYYY-MM-DD-HHmm-<slug>.md`` (slug from the
+first five words) with a ``captured:`` frontmatter line, as described in
+``skills/capture/SKILL.md``. ``capture`` writes one note durably.
+``capture_batch`` is for bursts and imports: it lists the inbox once,
+assigns every filename (with ``-2``, ``-3`` suffixes on collisions) in
+memory, writes the files from a thread pool and fsyncs the directory once
+at the end instead of once per note.
+
+Usage:
+    python -m agents.tests.lib.capture "note text" [--inbox DIR]
+    python -m agents.tests.lib.capture --batch [--inbox DIR] [--workers N] < notes.txt
+    python -m agents.tests.lib.capture --jsonl notes.jsonl [--inbox DIR] [--workers N]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Set, TextIO, Tuple
+
+DEFAULT_INBOX = Path.home() / "github" / "nicksteffens" / "second-brain" / "00-inbox"
+
+SLUG_WORDS = 5
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _now() -> datetime:
+    return datetime.now().replace(second=0, microsecond=0)
+
+
+@dataclass
+class Note:
+    """One note to capture."""
+    text: str
+    captured: datetime = field(default_factory=_now)
+
+
+def slugify(text: str, words: int = SLUG_WORDS) -> str:
+    """Slug from the first ``words`` words, e.g. ``"Fix the CI!"`` -> ``"fix-the-ci"``."""
+    slug = "-".join(_WORD.findall(text.lower())[:words])
+    return slug or "note"
+
+
+def base_name(note: Note) -> str:
+    """Filename stem before collision handling, e.g. ``2026-04-01-0930-fix-the-ci``."""
+    return f"{note.captured:%Y-%m-%d-%H%M}-{slugify(note.text)}"
+
+
+def render(note: Note) -> str:
+    """File contents for a note."""
+    return f"---\ncaptured: {note.captured:%Y-%m-%d %H:%M}\n---\n\n{note.text.strip()}\n"
+
+
+def _name(stem: str, n: int) -> str:
+    return f"{stem}.md" if n == 1 else f"{stem}-{n}.md"
+
+
+def _assign(notes: Iterable[Note], existing: Set[str]) -> List[Tuple[str, int]]:
+    slots = []
+    for note in notes:
+        stem, n = base_name(note), 1
+        while _name(stem, n) in existing:
+            n += 1
+        existing.add(_name(stem, n))
+        slots.append((stem, n))
+    return slots
+
+
+def assign_names(notes: Iterable[Note], existing: Set[str]) -> List[str]:
+    """Pick a unique filename for each note.
+
+    Args:
+        notes: Notes in order
+        existing: Names already in the inbox; updated with the new names
+
+    Returns:
+        One filename per note
+    """
+    return [_name(stem, n) for stem, n in _assign(notes, existing)]
+
+
+def _create(directory: Path, stem: str, data: bytes, fsync: bool, n: int = 1) -> Path:
+    """Create ``<stem>[-n].md`` exclusively, bumping ``n`` if another writer won."""
+    while True:
+        path = directory / _name(stem, n)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            break
+        except FileExistsError:
+            n += 1
+    try:
+        os.write(fd, data)
+        if fsync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+    return path
+
+
+def _fsync_dir(directory: Path):
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def capture(text: str, inbox: Optional[Path] = None, captured: Optional[datetime] = None) -> Path:
+    """Capture a single note, fsyncing the file and the inbox.
+
+    Returns:
+        Path of the new file
+    """
+    note = Note(text, captured) if captured else Note(text)
+    inbox = Path(inbox) if inbox else DEFAULT_INBOX
+    inbox.mkdir(parents=True, exist_ok=True)
+    path = _create(inbox, base_name(note), render(note).encode("utf-8"), fsync=True)
+    _fsync_dir(inbox)
+    return path
+
+
+def capture_batch(
+    notes: Iterable[Note],
+    inbox: Optional[Path] = None,
+    workers: int = 8,
+    fsync_files: bool = False,
+) -> List[Path]:
+    """Capture many notes with one inbox listing and one directory fsync.
+
+    Filenames are assigned up front; if another process creates one of
+    them in the meantime the write moves to the next free suffix.
+
+    Args:
+        notes: Notes to write, in order
+        inbox: Inbox directory (defaults to second-brain ``00-inbox``)
+        workers: Writer threads
+        fsync_files: Also fsync every file (slower; the directory is
+            always fsynced once)
+
+    Returns:
+        Paths of the new files, in input order
+    """
+    notes = [note for note in notes if note.text.strip()]
+    inbox = Path(inbox) if inbox else DEFAULT_INBOX
+    inbox.mkdir(parents=True, exist_ok=True)
+    if not notes:
+        return []
+
+    slots = _assign(notes, set(os.listdir(inbox)))
+    payloads = [render(note).encode("utf-8") for note in notes]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        paths = list(pool.map(
+            lambda slot, data: _create(inbox, slot[0], data, fsync_files, slot[1]), slots, payloads
+        ))
+    _fsync_dir(inbox)
+    return paths
+
+
+def read_lines(stream: TextIO) -> List[Note]:
+    """One note per non-empty line, all captured now."""
+    now = _now()
+    return [Note(line.strip(), now) for line in stream if line.strip()]
+
+
+def read_jsonl(stream: TextIO) -> List[Note]:
+    """Notes from JSON lines with ``text`` and an optional ISO ``captured``.
+
+    Raises:
+        ValueError: On malformed lines or a missing or non-string ``text``
+    """
+    notes = []
+    now = _now()
+    for number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            text, captured = record["text"], record.get("captured")
+            if not isinstance(text, str):
+                raise TypeError(f"text must be a string, not {type(text).__name__}")
+            notes.append(Note(text, datetime.fromisoformat(captured) if captured else now))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"line {number}: {e!r}") from None
+    return notes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Capture notes into the second-brain inbox")
+    parser.add_argument("text", nargs="*", help="Note text (single capture)")
+    parser.add_argument("--inbox", type=Path, default=None,
+                        help="Inbox directory (default ~/github/nicksteffens/second-brain/00-inbox)")
+    parser.add_argument("--batch", action="store_true", help="Read one note per line from stdin")
+    parser.add_argument("--jsonl", help="Read notes from a JSON-lines file ('-' for stdin)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--fsync-files", action="store_true", help="fsync every file in batch mode")
+    args = parser.parse_args(argv)
+
+    if args.jsonl or args.batch:
+        try:
+            if args.jsonl and args.jsonl != "-":
+                with open(args.jsonl, encoding="utf-8") as f:
+                    notes = read_jsonl(f)
+            else:
+                notes = read_jsonl(sys.stdin) if args.jsonl else read_lines(sys.stdin)
+        except (OSError, ValueError) as e:
+            print(e, file=sys.stderr)
+            return 1
+        paths = capture_batch(notes, args.inbox, args.workers, args.fsync_files)
+        print(f"captured {len(paths)} notes")
+        return 0
+
+    text = " ".join(args.text).strip()
+    if not text:
+        parser.error("nothing to capture")
+    print(capture(text, args.inbox).name)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
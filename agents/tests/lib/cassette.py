@@ -0,0 +1,235 @@
+"""Record/replay cassettes for Claude Agent SDK runs.
+
+A cassette stores the messages streamed by ``claude_agent_sdk.query()`` for a
+given (prompt, options) pair, so later runs can replay them offline through
+the same message-parsing code path in ``AgentRunner``.
+"""
+
+import asyncio
+import dataclasses
+import gzip
+import hashlib
+import itertools
+import json
+import os
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+
+MODES = ("record", "replay", "auto")
+
+FORMAT_VERSION = 1
+
+# Distinguishes temp files written concurrently by one process
+_tmp_ids = itertools.count()
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when no recording exists for a request."""
+
+
+class ReplayedMessage(SimpleNamespace):
+    """Attribute-access stand-in for an SDK object rebuilt from a cassette."""
+
+    def __init__(self, type_name: str, **attrs):
+        super().__init__(**attrs)
+        self._type_name = type_name
+
+    def __repr__(self) -> str:
+        attrs = ", ".join(
+            f"{key}={value!r}" for key, value in vars(self).items()
+            if key != "_type_name"
+        )
+        return f"{self._type_name}({attrs})"
+
+
+def _encode(value: Any) -> Any:
+    """Convert an SDK message into JSON-serializable data."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return {str(key): _encode(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    if dataclasses.is_dataclass(value):
+        attrs = {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+    elif hasattr(value, "__dict__"):
+        attrs = {k: v for k, v in vars(value).items() if not k.startswith("_")}
+    else:
+        return repr(value)
+    encoded = {key: _encode(item) for key, item in attrs.items()}
+    encoded["__type__"] = type(value).__name__
+    return encoded
+
+
+def _decode(value: Any) -> Any:
+    """Rebuild attribute-accessible objects from cassette data."""
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if isinstance(value, dict):
+        if "__type__" in value:
+            attrs = {k: _decode(v) for k, v in value.items() if k != "__type__"}
+            return ReplayedMessage(value["__type__"], **attrs)
+        return {key: _decode(item) for key, item in value.items()}
+    return value
+
+
+def _normalize_options(options: Dict[str, Any]) -> Dict[str, Any]:
+    """Make options machine-independent so cassettes are portable."""
+    home = str(Path.home())
+    normalized = {}
+    for key, value in options.items():
+        if isinstance(value, str) and value.startswith(home):
+            value = "~" + value[len(home):]
+        normalized[key] = value
+    return normalized
+
+
+class Cassette:
+    """On-disk store of recorded SDK message streams.
+
+    Modes:
+        record: always call the live SDK and (re)write the recording
+        replay: only replay; a missing recording raises CassetteMissError
+        auto:   replay when a recording exists, otherwise record
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        mode: str = "auto",
+        time_scale: float = 0.0,
+    ):
+        """Initialize a cassette store.
+
+        Args:
+            directory: Directory holding recordings (created on first write)
+            mode: One of "record", "replay" or "auto"
+            time_scale: Multiplier for recorded inter-message delays on
+                replay; 0 replays instantly, 1 reproduces original timing
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}; expected one of {MODES}")
+        self.directory = Path(directory)
+        self.mode = mode
+        self.time_scale = time_scale
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        """Build a cassette from AGENT_CASSETTE_* environment variables.
+
+        Returns:
+            Cassette if AGENT_CASSETTE_DIR is set, otherwise None
+        """
+        directory = os.environ.get("AGENT_CASSETTE_DIR")
+        if not directory:
+            return None
+        return cls(
+            Path(directory).expanduser(),
+            mode=os.environ.get("AGENT_CASSETTE_MODE", "auto"),
+            time_scale=float(os.environ.get("AGENT_CASSETTE_TIME_SCALE", "0")),
+        )
+
+    def key(self, prompt: str, options: Dict[str, Any]) -> str:
+        """Return the recording key for a prompt and options."""
+        payload = json.dumps(
+            {"prompt": prompt, "options": _normalize_options(options)},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, prompt: str, options: Dict[str, Any]) -> Path:
+        """Return the recording path for a prompt and options."""
+        return self.directory / f"{self.key(prompt, options)}.json.gz"
+
+    def has(self, prompt: str, options: Dict[str, Any]) -> bool:
+        """Check whether a recording exists."""
+        return self.path_for(prompt, options).exists()
+
+    def stream(
+        self,
+        prompt: str,
+        options: Dict[str, Any],
+        live: Callable[[], AsyncIterator[Any]],
+    ) -> AsyncIterator[Any]:
+        """Return the message stream for a request according to the mode.
+
+        Args:
+            prompt: Complete prompt
+            options: SDK options as a plain dict
+            live: Zero-argument callable returning the live SDK stream;
+                only called when the request is not replayed
+
+        Returns:
+            Async iterator of SDK (or replayed) messages
+        """
+        if self.mode != "record" and self.has(prompt, options):
+            return self.replay(prompt, options)
+        if self.mode == "replay":
+            return self._miss(prompt, options)
+        return self.record(prompt, options, live)
+
+    async def replay(self, prompt: str, options: Dict[str, Any]) -> AsyncIterator[Any]:
+        """Yield recorded messages, sleeping for scaled original delays."""
+        with gzip.open(self.path_for(prompt, options), "rt", encoding="utf-8") as f:
+            recording = json.load(f)
+
+        for entry in recording["messages"]:
+            delay = entry["delay"] * self.time_scale
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield _decode(entry["message"])
+
+    async def record(
+        self,
+        prompt: str,
+        options: Dict[str, Any],
+        live: Callable[[], AsyncIterator[Any]],
+    ) -> AsyncIterator[Any]:
+        """Pass through the live stream and save it once fully consumed.
+
+        Incomplete streams (errors or early exit) are not saved, and the
+        live stream is closed however this generator ends.
+        """
+        entries = []
+        last = time.monotonic()
+        stream = live()
+        try:
+            async for message in stream:
+                now = time.monotonic()
+                entries.append({"delay": round(now - last, 4), "message": _encode(message)})
+                last = now
+                yield message
+        finally:
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+        self._write(prompt, options, entries)
+
+    async def _miss(self, prompt: str, options: Dict[str, Any]) -> AsyncIterator[Any]:
+        raise CassetteMissError(
+            f"No cassette recording for request (key {self.key(prompt, options)[:12]}) "
+            f"in {self.directory}"
+        )
+        yield  # pragma: no cover - makes this an async generator
+
+    def _write(self, prompt: str, options: Dict[str, Any], entries) -> None:
+        path = self.path_for(prompt, options)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        recording = {
+            "version": FORMAT_VERSION,
+            "options": _normalize_options(options),
+            "messages": entries,
+        }
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{next(_tmp_ids)}.tmp")
+        try:
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump(recording, f, separators=(",", ":"), default=str)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
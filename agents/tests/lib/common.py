@@ -0,0 +1,31 @@
+"""Small helpers shared by the file-writing tools.
+
+Kept free of other ``agents.tests.lib`` imports so short-lived CLIs such
+as ``session_numbers`` can lock files without loading the daily-log
+modules.
+"""
+
+import fcntl
+import os
+from contextlib import contextmanager
+from datetime import date as Date
+from pathlib import Path
+from typing import Iterator, Union
+
+DateLike = Union[str, Date]
+
+
+@contextmanager
+def locked(lock_path: Path) -> Iterator[None]:
+    """Hold an exclusive ``flock`` on ``lock_path`` (created if missing)."""
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)  # releases the lock
+
+
+def lock_path_for(path: Path) -> Path:
+    """Return the lock file guarding writes to ``path``."""
+    return path.with_name(f".{path.name}.lock")
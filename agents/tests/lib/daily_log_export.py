@@ -0,0 +1,254 @@
+"""Incremental export of daily logs to one file per session.
+
+Splits each monthly ``daily-logs/YYYY/YYYY-MM.md`` into
+``<dest>/YYYY/MM/YYYY-MM-DD-session-N.md`` files with frontmatter (title,
+date, session, duration, rating, objective, repos), the layout planned in
+``docs/superpowers/specs/2026-04-13-daily-logs-standalone-site-design.md``.
+
+A manifest (``<dest>/.export-manifest.json``) records each monthly file's
+size and mtime and the sha256 of every exported file. Re-running skips
+unchanged months without reading them, only rewrites sessions whose output
+changed, and removes files for sessions that no longer exist. Changed
+months are exported in parallel with a process pool; every file is written
+atomically.
+
+Usage:
+    python -m agents.tests.lib.daily_log_export DEST [--root DIR]
+        [--workers N] [--force]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date as Date
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import yaml
+
+from .daily_log_parser import SessionRecord, iter_sessions, monthly_files
+from .daily_log_stats import known_repos, mentioned_repos
+
+MANIFEST_NAME = ".export-manifest.json"
+MANIFEST_VERSION = 1
+
+
+@dataclass
+class ExportStats:
+    """What an ``export_daily_logs`` run did."""
+    months: int = 0            # monthly files exported
+    months_unchanged: int = 0  # monthly files skipped by size/mtime
+    written: int = 0           # session files (re)written
+    unchanged: int = 0         # session files whose content was unchanged
+    removed: int = 0           # session files deleted
+
+
+def session_filename(session: SessionRecord) -> str:
+    """Relative output path for a session, e.g. ``2026/04/2026-04-01-session-1.md``."""
+    year, month, _ = session.date.split("-")
+    return f"{year}/{month}/{session.date}-session-{session.session}.md"
+
+
+def _title(session: SessionRecord) -> str:
+    if session.objective:
+        return session.objective.split(";")[0].strip().rstrip(".")
+    return f"Session {session.session} on {session.date}"
+
+
+def render_session(session: SessionRecord, repo_names: Sequence[str] = ()) -> str:
+    """Render a session as a markdown file with frontmatter.
+
+    Fields the log doesn't record (e.g. an unrated session) are omitted.
+
+    Args:
+        session: Session parsed with ``keep_body=True``
+        repo_names: Repo vocabulary for the ``repos`` field
+    """
+    frontmatter = {
+        "title": _title(session),
+        "date": Date.fromisoformat(session.date),
+        "session": session.session,
+    }
+    if session.duration:
+        frontmatter["duration"] = session.duration
+    if session.rating is not None:
+        rating = session.rating
+        frontmatter["rating"] = int(rating) if rating.is_integer() else rating
+    if session.objective:
+        frontmatter["objective"] = session.objective
+    repos = mentioned_repos(session, repo_names)
+    if repos:
+        frontmatter["repos"] = repos
+
+    header = yaml.safe_dump(frontmatter, sort_keys=False, allow_unicode=True, width=1000)
+    return f"---\n{header}---\n\n{(session.body or '').strip()}\n"
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _write_atomic(path: Path, data: str):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _export_month(
+    log_path: Path,
+    dest: Path,
+    repo_names: Sequence[str],
+    previous: Dict[str, str],
+) -> Tuple[Dict[str, str], int, int, int]:
+    """Export one monthly file (runs in a worker process).
+
+    Args:
+        log_path: Monthly log file
+        dest: Export root
+        repo_names: Repo vocabulary for the ``repos`` field
+        previous: Output path -> sha256 from the last export of this month
+
+    Returns:
+        (output path -> sha256, written, unchanged, removed)
+    """
+    hashes: Dict[str, str] = {}
+    written = unchanged = 0
+    for session in iter_sessions(log_path, keep_body=True):
+        name = session_filename(session)
+        text = render_session(session, repo_names)
+        digest = hashes[name] = _digest(text)
+        if previous.get(name) == digest and (dest / name).exists():
+            unchanged += 1
+            continue
+        _write_atomic(dest / name, text)
+        written += 1
+
+    removed = 0
+    for name in previous.keys() - hashes.keys():
+        try:
+            (dest / name).unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+    return hashes, written, unchanged, removed
+
+
+def _read_manifest(dest: Path) -> Dict:
+    try:
+        data = json.loads((dest / MANIFEST_NAME).read_text())
+        if data.get("version") == MANIFEST_VERSION:
+            return data
+    except (OSError, ValueError):
+        pass
+    return {"version": MANIFEST_VERSION, "months": {}}
+
+
+def export_daily_logs(
+    dest: Path,
+    root: Optional[Path] = None,
+    workers: Optional[int] = None,
+    repo_names: Optional[Sequence[str]] = None,
+    force: bool = False,
+) -> ExportStats:
+    """Export changed sessions under a daily-log root to ``dest``.
+
+    Args:
+        dest: Export root (e.g. the site's ``src/content/docs``)
+        root: Daily-log directory (defaults to ~/.claude/daily-logs)
+        workers: Process pool size; None lets the pool decide. A single
+            changed month is exported in-process.
+        repo_names: Repo vocabulary; defaults to the repos listed in the
+            year index files
+        force: Re-export every month even if its size and mtime match
+
+    Returns:
+        ExportStats for the run
+    """
+    dest = Path(dest)
+    root = Path(root) if root else Path.home() / ".claude" / "daily-logs"
+    repo_names = list(known_repos(root) if repo_names is None else repo_names)
+    manifest = _read_manifest(dest)
+    previous_months = manifest["months"]
+    if manifest.get("repos") != repo_names:
+        force = True  # frontmatter depends on the repo vocabulary
+
+    stats = ExportStats()
+    months: Dict[str, Dict] = {}
+    jobs = []
+    for log_path in monthly_files(root):
+        key = log_path.relative_to(root).as_posix()
+        stat = log_path.stat()
+        entry = previous_months.pop(key, None)
+        if (
+            not force
+            and entry is not None
+            and (entry["size"], entry["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns)
+        ):
+            months[key] = entry
+            stats.months_unchanged += 1
+            continue
+        months[key] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        jobs.append((key, log_path, (entry or {}).get("files", {})))
+
+    if len(jobs) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                (key, pool.submit(_export_month, log_path, dest, repo_names, files))
+                for key, log_path, files in jobs
+            ]
+            results = [(key, future.result()) for key, future in futures]
+    else:
+        results = [
+            (key, _export_month(log_path, dest, repo_names, files))
+            for key, log_path, files in jobs
+        ]
+
+    for key, (hashes, written, unchanged, removed) in results:
+        months[key]["files"] = hashes
+        stats.months += 1
+        stats.written += written
+        stats.unchanged += unchanged
+        stats.removed += removed
+
+    # Monthly files that disappeared take their sessions with them
+    for entry in previous_months.values():
+        for name in entry.get("files", {}):
+            try:
+                (dest / name).unlink()
+                stats.removed += 1
+            except FileNotFoundError:
+                pass
+
+    if jobs or previous_months or not (dest / MANIFEST_NAME).exists():
+        manifest = {"version": MANIFEST_VERSION, "repos": repo_names, "months": months}
+        _write_atomic(dest / MANIFEST_NAME, json.dumps(manifest, indent=1, sort_keys=True))
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export daily logs to one file per session")
+    parser.add_argument("dest", type=Path, help="Export directory")
+    parser.add_argument("--root", type=Path, default=None,
+                        help="Daily-log directory (default ~/.claude/daily-logs)")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size")
+    parser.add_argument("--force", action="store_true", help="Re-export every month")
+    args = parser.parse_args(argv)
+
+    stats = export_daily_logs(args.dest, args.root, args.workers, force=args.force)
+    print(
+        f"{stats.months} months exported ({stats.months_unchanged} unchanged): "
+        f"{stats.written} written, {stats.unchanged} unchanged, {stats.removed} removed"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+"""Sidecar index of daily-log monthly files.
+
+Each ``daily-logs/YYYY/YYYY-MM.md`` file gets a hidden
+``.YYYY-MM.md.idx.json`` next to it recording, per date heading, the byte
+offset of ``## YYYY-MM-DD`` plus session count, ratings and durations.
+Checking whether a date already has a heading (before appending a session)
+is then a dictionary lookup and a seek instead of a scan of the month.
+
+The index stores the file size, mtime and a SHA-256 of the indexed bytes.
+A file that grew and still starts with exactly the indexed bytes (checked
+against that hash) was only appended to, and the index is updated from the
+start of the last date section. Anything else with a new size or mtime,
+including an in-place edit that keeps the size, triggers a full rebuild.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional
+
+from .common import DateLike
+from .daily_log_parser import (
+    DATE_HEADING,
+    SESSION_HEADING,
+    is_separator,
+    parse_duration_minutes,
+    parse_field,
+    parse_rating,
+)
+
+INDEX_VERSION = 4
+
+# Read size when hashing log contents
+_HASH_CHUNK = 1 << 20
+
+
+@dataclass
+class DateEntry:
+    """Index record for one date in a monthly log."""
+    date: str
+    offset: int  # byte offset of the first "## YYYY-MM-DD" heading
+    headings: int = 1  # more than one means duplicate date headings
+    sessions: int = 0
+    ratings: List[float] = field(default_factory=list)
+    durations: List[str] = field(default_factory=list)
+    duration_minutes: List[float] = field(default_factory=list)
+
+
+@dataclass
+class MonthIndex:
+    """Index of one monthly log file."""
+    path: Path
+    size: int
+    mtime_ns: int
+    content_hash: str
+    dates: Dict[str, DateEntry]
+    last_date: Optional[str] = None  # date of the last heading in the file
+
+    @property
+    def sessions(self) -> int:
+        """Total sessions in the month."""
+        return sum(entry.sessions for entry in self.dates.values())
+
+
+def index_path_for(log_path: Path) -> Path:
+    """Return the sidecar index path for a monthly log file."""
+    return log_path.with_name(f".{log_path.name}.idx.json")
+
+
+def _digest(f: BinaryIO, start: int, end: int, digest=None):
+    """Feed bytes ``start:end`` of ``f`` into ``digest`` (a new SHA-256 by default)."""
+    digest = digest or hashlib.sha256()
+    f.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        chunk = f.read(min(remaining, _HASH_CHUNK))
+        if not chunk:
+            break
+        digest.update(chunk)
+        remaining -= len(chunk)
+    return digest
+
+
+def _scan(f: BinaryIO, offset: int, dates: Dict[str, DateEntry]) -> Optional[str]:
+    """Index date sections from ``offset`` (a heading or 0) to end of file.
+
+    Returns:
+        Date of the last heading seen, or None
+    """
+    f.seek(offset)
+    pos = offset
+    entry: Optional[DateEntry] = None
+    has_content = has_body = rated = timed = False
+
+    def close_session():
+        if entry is not None and has_content:
+            entry.sessions += 1
+
+    for raw in f:
+        line = raw.decode("utf-8")
+        heading = DATE_HEADING.match(line)
+        if heading:
+            close_session()
+            day = heading.group(1)
+            entry = dates.get(day)
+            if entry is None:
+                entry = dates[day] = DateEntry(day, pos)
+            else:
+                entry.headings += 1
+            has_content = has_body = rated = timed = False
+        elif is_separator(line):
+            close_session()
+            has_content = has_body = rated = timed = False
+        elif entry is not None and line.strip():
+            if SESSION_HEADING.match(line):
+                if has_body:
+                    # Next session without a "---" (same rule as the parser)
+                    close_session()
+                    has_body = rated = timed = False
+            else:
+                has_body = True
+            has_content = True
+            name, value = parse_field(line) or (None, None)
+            if name == "rating" and not rated:
+                entry.ratings.append(parse_rating(value))
+                rated = True
+            elif name == "duration" and not timed:
+                entry.durations.append(value)
+                minutes = parse_duration_minutes(value)
+                if minutes is not None:
+                    entry.duration_minutes.append(minutes)
+                timed = True
+        pos += len(raw)
+
+    close_session()
+    return entry.date if entry is not None else None
+
+
+class DailyLogIndex:
+    """Maintains sidecar indexes for the monthly files under a log root."""
+
+    def __init__(self, root: Optional[Path] = None):
+        """Initialize the index.
+
+        Args:
+            root: Daily-log directory (defaults to ~/.claude/daily-logs)
+        """
+        self.root = Path(root) if root else Path.home() / ".claude" / "daily-logs"
+        self.rebuilds = 0
+        self.updates = 0
+        self._months: Dict[Path, MonthIndex] = {}
+
+    def month_path(self, day: DateLike) -> Path:
+        """Return the monthly log file that holds ``day``."""
+        day = str(day)
+        return self.root / day[:4] / f"{day[:7]}.md"
+
+    def load(self, log_path: Path) -> Optional[MonthIndex]:
+        """Return an up-to-date index for a monthly file.
+
+        Uses, in order: the in-memory copy, the sidecar on disk, an
+        incremental update if the file was only appended to, or a full
+        rebuild. The sidecar is rewritten whenever the index changes.
+
+        Returns:
+            MonthIndex, or None if the log file doesn't exist
+        """
+        log_path = Path(log_path)
+        try:
+            stat = log_path.stat()
+        except FileNotFoundError:
+            self._months.pop(log_path, None)
+            return None
+
+        index = self._months.get(log_path) or self._read_sidecar(log_path)
+        if index is not None and (index.size, index.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            self._months[log_path] = index
+            return index
+
+        with open(log_path, "rb") as f:
+            # Only a file that grew can have been appended to; a same-size
+            # change is always an edit
+            digest = None
+            if index is not None and stat.st_size > index.size and self._can_extend(index):
+                digest = _digest(f, 0, index.size)
+                if digest.hexdigest() != index.content_hash:
+                    digest = None
+            if digest is not None:
+                self._extend(index, f)
+                self.updates += 1
+                _digest(f, index.size, stat.st_size, digest)
+            else:
+                index = self._build(log_path, f)
+                self.rebuilds += 1
+                digest = _digest(f, 0, stat.st_size)
+            index.size = stat.st_size
+            index.mtime_ns = stat.st_mtime_ns
+            index.content_hash = digest.hexdigest()
+
+        self._months[log_path] = index
+        self._write_sidecar(index)
+        return index
+
+    def rebuild(self, log_path: Path) -> Optional[MonthIndex]:
+        """Discard any existing index for a file and rebuild it."""
+        log_path = Path(log_path)
+        self._months.pop(log_path, None)
+        index_path_for(log_path).unlink(missing_ok=True)
+        return self.load(log_path)
+
+    def lookup(self, day: DateLike) -> Optional[DateEntry]:
+        """Return the index entry for a date, or None if it has no heading."""
+        index = self.load(self.month_path(day))
+        return index.dates.get(str(day)) if index else None
+
+    def has_date(self, day: DateLike) -> bool:
+        """Check whether the monthly log already has a ``## <day>`` heading."""
+        return self.lookup(day) is not None
+
+    def heading_offset(self, day: DateLike) -> Optional[int]:
+        """Byte offset of the first ``## <day>`` heading, or None."""
+        entry = self.lookup(day)
+        return entry.offset if entry else None
+
+    def has_duplicate_heading(self, day: DateLike) -> bool:
+        """Check whether ``## <day>`` appears more than once."""
+        entry = self.lookup(day)
+        return entry is not None and entry.headings > 1
+
+    def _build(self, log_path: Path, f: BinaryIO) -> MonthIndex:
+        dates: Dict[str, DateEntry] = {}
+        last_date = _scan(f, 0, dates)
+        return MonthIndex(log_path, 0, 0, "", dates, last_date)
+
+    @staticmethod
+    def _can_extend(index: MonthIndex) -> bool:
+        # Appended text may continue the last section, which is re-indexed
+        # from its heading; that only works if the heading isn't repeated
+        if index.last_date is None:
+            return not index.dates
+        return index.dates[index.last_date].headings == 1
+
+    def _extend(self, index: MonthIndex, f: BinaryIO):
+        if index.last_date is None:
+            resume = 0
+        else:
+            resume = index.dates.pop(index.last_date).offset
+        index.last_date = _scan(f, resume, index.dates) or index.last_date
+
+    def _read_sidecar(self, log_path: Path) -> Optional[MonthIndex]:
+        try:
+            data = json.loads(index_path_for(log_path).read_text())
+            if data.get("version") != INDEX_VERSION:
+                return None
+            return MonthIndex(
+                path=log_path,
+                size=data["size"],
+                mtime_ns=data["mtime_ns"],
+                content_hash=data["content_hash"],
+                dates={day: DateEntry(**entry) for day, entry in data["dates"].items()},
+                last_date=data["last_date"],
+            )
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            # Missing or unreadable sidecar: rebuild
+            return None
+
+    def _write_sidecar(self, index: MonthIndex):
+        path = index_path_for(index.path)
+        data = {
+            "version": INDEX_VERSION,
+            "size": index.size,
+            "mtime_ns": index.mtime_ns,
+            "content_hash": index.content_hash,
+            "dates": {day: asdict(entry) for day, entry in index.dates.items()},
+            "last_date": index.last_date,
+        }
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data, separators=(",", ":")))
+        os.replace(tmp_path, path)
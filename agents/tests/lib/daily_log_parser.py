@@ -0,0 +1,306 @@
+"""Streaming parser for daily-log markdown.
+
+Monthly files (``daily-logs/YYYY/YYYY-MM.md``) contain ``## YYYY-MM-DD``
+date headings, each followed by one or more sessions. Sessions are
+separated by ``---`` or, in older logs, simply start with a new
+``### Session N - ...`` / ``### Session: ...`` / ``### Session N Overview``
+heading.
+``iter_sessions`` reads a file line by line and yields one ``SessionRecord``
+per session, so whole months are never held in memory.
+"""
+
+import re
+import unicodedata
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+DATE_HEADING = re.compile(r"^## (\d{4}-\d{2}-\d{2})\b")
+# Headings that open a session ("### Session Rating: ..." does not)
+SESSION_HEADING = re.compile(r"^###\s+Session(?:\s+\d+)?(?:\s+Overview\b|\s*[-–—:]|\s*$)")
+
+_FIELD = re.compile(r"^(Duration|Main Objectives?|Objective):\s*(.*)$", re.IGNORECASE)
+_RATING_FIELD = re.compile(r"\bRating:\s*(.*)$", re.IGNORECASE)
+_RATING = re.compile(r"(\d+(?:\.\d+)?)(?:\s*-\s*(\d+(?:\.\d+)?))?\s*/\s*10\b")
+_DURATION = re.compile(
+    r"(\d+(?:\.\d+)?)(?:\s*-\s*(\d+(?:\.\d+)?))?\+?\s*"
+    r"(hours?|hrs?|h|minutes?|mins?|m)\b"
+    r"(?:\s*(\d+)\s*(?:minutes?|mins?|m)\b)?",
+    re.IGNORECASE,
+)
+_EMOJI_JOINERS = {"\ufe0f", "\ufe0e", "\u200d"}
+_BULLET = re.compile(r"^\s*(?:[-*+]|\d+\.)\s+(?:\[[ xX]\]\s+)?(.*)$")
+
+
+class SessionRecord:
+    """One logged session."""
+
+    __slots__ = (
+        "date",
+        "session",
+        "duration",
+        "duration_minutes",
+        "rating",
+        "objective",
+        "sections",
+        "path",
+        "offset",
+        "body",
+    )
+
+    def __init__(
+        self,
+        date: str,
+        session: int,
+        path: Optional[Path] = None,
+        offset: int = 0,
+    ):
+        """Create an empty record.
+
+        Args:
+            date: Session date (YYYY-MM-DD)
+            session: 1-based session number within the date
+            path: Monthly file the session came from
+            offset: Byte offset of the session's first line in ``path``
+        """
+        self.date = date
+        self.session = session
+        self.duration: Optional[str] = None
+        self.duration_minutes: Optional[float] = None
+        self.rating: Optional[float] = None
+        self.objective: Optional[str] = None
+        self.sections: Dict[str, List[str]] = {}
+        self.path = path
+        self.offset = offset
+        self.body: Optional[str] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"SessionRecord({self.date!r}, session={self.session}, "
+            f"rating={self.rating}, duration_minutes={self.duration_minutes})"
+        )
+
+
+def parse_rating(text: str) -> Optional[float]:
+    """Parse a ``N/10`` rating; ranges like ``8-9/10`` give the midpoint.
+
+    Returns:
+        Rating out of 10, or None if the text has none
+    """
+    match = _RATING.search(text)
+    if not match:
+        return None
+    low = float(match.group(1))
+    high = float(match.group(2)) if match.group(2) else low
+    return (low + high) / 2
+
+
+def parse_duration_minutes(text: str) -> Optional[float]:
+    """Parse a free-form duration into minutes.
+
+    Handles ``1 hour``, ``~45 minutes``, ``2+ hours``, ``1 hour 30 min`` and
+    ranges such as ``30-45 minutes`` or ``1.5-2 hours`` (midpoint).
+
+    Returns:
+        Minutes, or None for durations like "All day"
+    """
+    match = _DURATION.search(text)
+    if not match:
+        return None
+    low = float(match.group(1))
+    high = float(match.group(2)) if match.group(2) else low
+    value = (low + high) / 2
+    if match.group(3).lower().startswith("h"):
+        value *= 60
+    if match.group(4):
+        value += float(match.group(4))
+    return value
+
+
+def strip_emoji(text: str) -> str:
+    """Remove emoji and other pictographs, e.g. from ``### Challenges 🔧``."""
+    return " ".join(
+        "".join(
+            c for c in text
+            if c not in _EMOJI_JOINERS and unicodedata.category(c) not in ("So", "Cs")
+        ).split()
+    )
+
+
+def parse_field(line: str) -> Optional[Tuple[str, str]]:
+    """Recognize a session overview field on a single line.
+
+    Returns:
+        ``("duration" | "objective" | "rating", value)`` or None
+    """
+    clean = line.replace("**", "").strip().lstrip("-*# ").strip()
+    match = _FIELD.match(clean)
+    if match:
+        name = "duration" if match.group(1).lower() == "duration" else "objective"
+        return name, match.group(2).strip()
+    match = _RATING_FIELD.search(clean)
+    if match and _RATING.match(match.group(1)):
+        return "rating", match.group(1).strip()
+    return None
+
+
+def is_separator(line: str) -> bool:
+    """Check whether a line is a ``---`` session separator."""
+    return line.rstrip() == "---"
+
+
+class _SessionBuilder:
+    """Accumulates the lines of one session into a SessionRecord."""
+
+    def __init__(self, record: SessionRecord, keep_body: bool):
+        self.record = record
+        self.body: Optional[List[str]] = [] if keep_body else None
+        self.has_content = False
+        self.has_body = False  # content other than session headings
+        self.section: Optional[List[str]] = None
+        self.paragraph: List[str] = []
+
+    def add(self, line: str):
+        if self.body is not None:
+            self.body.append(line)
+        stripped = line.strip()
+        if not stripped:
+            self._end_paragraph()
+            return
+        self.has_content = True
+        if not SESSION_HEADING.match(stripped):
+            self.has_body = True
+
+        record = self.record
+        field = parse_field(stripped)
+        if field is not None:
+            name, value = field
+            if name == "duration" and record.duration is None:
+                record.duration = value
+                record.duration_minutes = parse_duration_minutes(value)
+            elif name == "objective" and record.objective is None:
+                record.objective = value
+            elif name == "rating" and record.rating is None:
+                record.rating = parse_rating(value)
+
+        if stripped.startswith("### "):
+            self._end_paragraph()
+            heading = strip_emoji(stripped[4:])
+            self.section = record.sections.setdefault(heading, [])
+            return
+        if self.section is None:
+            return
+
+        bullet = _BULLET.match(line)
+        if bullet:
+            self._end_paragraph()
+            self.section.append(bullet.group(1).strip())
+        else:
+            self.paragraph.append(stripped)
+
+    def _end_paragraph(self):
+        if self.paragraph and self.section is not None:
+            self.section.append(" ".join(self.paragraph))
+        self.paragraph = []
+
+    def finish(self) -> SessionRecord:
+        self._end_paragraph()
+        if self.body is not None:
+            self.record.body = "".join(self.body)
+        return self.record
+
+
+def iter_session_lines(
+    lines: Iterable[bytes],
+    path: Optional[Path] = None,
+    keep_body: bool = False,
+) -> Iterator[SessionRecord]:
+    """Yield sessions from an iterable of raw (bytes) log lines.
+
+    A session ends at a date heading, a ``---`` separator or a session
+    heading that follows other content of the current session (so
+    ``### Session 2`` directly above ``### Session Overview`` stays one
+    session).
+    Content before the first date heading is ignored; sessions without any
+    non-blank lines (e.g. between two consecutive ``---``) are skipped.
+
+    Args:
+        lines: Lines including their newline characters
+        path: Source file recorded on each SessionRecord
+        keep_body: Also keep each session's raw markdown on ``body``
+    """
+    counts: Dict[str, int] = {}
+    builder: Optional[_SessionBuilder] = None
+    date: Optional[str] = None
+    offset = 0
+    start = 0
+
+    def finish():
+        if builder is not None and builder.has_content:
+            counts[date] = builder.record.session
+            return builder.finish()
+        return None
+
+    for raw in lines:
+        line = raw.decode("utf-8")
+        heading = DATE_HEADING.match(line)
+        if heading or is_separator(line):
+            record = finish()
+            if record is not None:
+                yield record
+            builder = None
+            if heading:
+                date = heading.group(1)
+                start = offset
+            else:
+                start = offset + len(raw)
+        elif date is not None:
+            if builder is not None and builder.has_body and SESSION_HEADING.match(line):
+                # A second session heading without a "---" before it
+                record = finish()
+                if record is not None:
+                    yield record
+                builder = None
+                start = offset
+            if builder is None:
+                session = SessionRecord(date, counts.get(date, 0) + 1, path, start)
+                builder = _SessionBuilder(session, keep_body)
+            builder.add(line)
+        offset += len(raw)
+
+    record = finish()
+    if record is not None:
+        yield record
+
+
+def iter_sessions(path: Path, keep_body: bool = False) -> Iterator[SessionRecord]:
+    """Stream the sessions in one monthly log file.
+
+    Args:
+        path: Monthly log (``YYYY-MM.md``)
+        keep_body: Also keep each session's raw markdown on ``body``
+
+    Yields:
+        SessionRecord per session, in file order
+    """
+    path = Path(path)
+    with open(path, "rb") as f:
+        yield from iter_session_lines(f, path, keep_body)
+
+
+def monthly_files(root: Optional[Path] = None) -> List[Path]:
+    """Return the monthly log files under a daily-log root, oldest first."""
+    root = Path(root) if root else Path.home() / ".claude" / "daily-logs"
+    return sorted(
+        path for path in root.glob("[0-9][0-9][0-9][0-9]/[0-9][0-9][0-9][0-9]-[0-9][0-9].md")
+    )
+
+
+def iter_all_sessions(root: Optional[Path] = None, keep_body: bool = False) -> Iterator[SessionRecord]:
+    """Stream every session under a daily-log root, oldest month first.
+
+    Args:
+        root: Daily-log directory (defaults to ~/.claude/daily-logs)
+        keep_body: Also keep each session's raw markdown on ``body``
+    """
+    for path in monthly_files(root):
+        yield from iter_sessions(path, keep_body)
@@ -0,0 +1,442 @@
+"""Session analytics over daily logs, stored column-wise.
+
+Sessions are loaded into ``array``-backed columns (date, month, rating,
+duration, repo bitmask) and aggregated per month, per year or overall.
+Columns can be filled from parsed sessions or, much faster, from the
+``DailyLogIndex`` sidecars, which makes it cheap enough to run after every
+append. ``update_year_index`` rewrites the computed lines of a
+``daily-logs/YYYY/index.md`` file and leaves the hand-written parts alone.
+
+Usage:
+    python -m agents.tests.lib.daily_log_stats [--root DIR] [--year YYYY]
+        [--by month|year|all] [--repos] [--json] [--update-index]
+"""
+
+import argparse
+import calendar
+import json
+import math
+import os
+import re
+import sys
+import warnings
+from array import array
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import date as Date
+from functools import lru_cache
+from itertools import groupby
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Pattern, Sequence, Tuple
+
+from .daily_log_index import DailyLogIndex
+from .daily_log_parser import SessionRecord, iter_all_sessions, monthly_files
+
+NAN = float("nan")
+
+# Repo names are listed after these labels in the year index files
+_REPO_LIST = re.compile(
+    r"^(?:\*\*Repos Worked On:\*\*\s*\n|- \*\*Primary repositories\*\*:)(.+)$",
+    re.MULTILINE,
+)
+
+
+@dataclass
+class PeriodStats:
+    """Aggregates for one month, one year or all sessions."""
+    period: str  # "YYYY-MM", "YYYY" or "all"
+    sessions: int
+    days: int
+    rated: int
+    average_rating: Optional[float]
+    timed: int
+    total_minutes: float
+    rating_distribution: Dict[float, int] = field(default_factory=dict)
+    repos: Dict[str, int] = field(default_factory=dict)
+
+
+def _valid(values: Sequence[float]) -> List[float]:
+    return [v for v in values if v == v]  # drops NaN
+
+
+def _default_root(root: Optional[Path]) -> Path:
+    return Path(root) if root else Path.home() / ".claude" / "daily-logs"
+
+
+class SessionColumns:
+    """Column store of session facts; one row per session."""
+
+    def __init__(self, repo_names: Iterable[str] = ()):
+        """Create empty columns.
+
+        Args:
+            repo_names: Repo vocabulary for the ``repos`` bitmask (max 64)
+        """
+        self.repo_names = list(repo_names)[:64]
+        self.dates = array("l")    # date ordinals
+        self.months = array("l")   # YYYYMM
+        self.ratings = array("d")  # NaN when unrated
+        self.minutes = array("d")  # NaN when unknown
+        self.repos = array("Q")    # bit i set: repo_names[i] mentioned
+
+    def append(
+        self,
+        day: str,
+        rating: Optional[float] = None,
+        minutes: Optional[float] = None,
+        repo_mask: int = 0,
+    ):
+        """Add one session row."""
+        parsed = Date.fromisoformat(day)
+        self.dates.append(parsed.toordinal())
+        self.months.append(parsed.year * 100 + parsed.month)
+        self.ratings.append(NAN if rating is None else rating)
+        self.minutes.append(NAN if minutes is None else minutes)
+        self.repos.append(repo_mask)
+
+    @classmethod
+    def from_sessions(
+        cls,
+        sessions: Iterable[SessionRecord],
+        repo_names: Iterable[str] = (),
+    ) -> "SessionColumns":
+        """Build columns from parsed sessions, tagging mentioned repos."""
+        columns = cls(repo_names)
+        bits = {name: 1 << bit for bit, name in enumerate(columns.repo_names)}
+        for session in sessions:
+            mask = 0
+            for name in mentioned_repos(session, columns.repo_names):
+                mask |= bits[name]
+            columns.append(session.date, session.rating, session.duration_minutes, mask)
+        return columns
+
+    @classmethod
+    def from_index(
+        cls,
+        root: Optional[Path] = None,
+        index: Optional[DailyLogIndex] = None,
+    ) -> "SessionColumns":
+        """Build columns from the daily-log sidecar indexes.
+
+        Only the per-date session counts, ratings and durations are
+        available there, so rows carry no repo tags and a date's ratings and
+        durations are assigned to its sessions in order. Aggregates are the
+        same as when built from parsed sessions.
+        """
+        root = _default_root(root)
+        index = index or DailyLogIndex(root)
+        columns = cls()
+        for path in monthly_files(root):
+            month = index.load(path)
+            for day in sorted(month.dates):
+                entry = month.dates[day]
+                for i in range(entry.sessions):
+                    columns.append(
+                        day,
+                        entry.ratings[i] if i < len(entry.ratings) else None,
+                        entry.duration_minutes[i] if i < len(entry.duration_minutes) else None,
+                    )
+        return columns
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def _groups(self, by: str) -> Iterator[Tuple[str, List[int]]]:
+        if by == "all":
+            yield "all", list(range(len(self)))
+            return
+        if by == "month":
+            keys = self.months
+            label = lambda k: f"{k // 100:04d}-{k % 100:02d}"
+        elif by == "year":
+            keys = array("l", (m // 100 for m in self.months))
+            label = lambda k: f"{k:04d}"
+        else:
+            raise ValueError(f"Unknown grouping {by!r}; expected month, year or all")
+
+        rows = range(len(self))
+        if any(keys[i] > keys[i + 1] for i in range(len(keys) - 1)):
+            rows = sorted(rows, key=keys.__getitem__)
+        for key, group in groupby(rows, key=keys.__getitem__):
+            yield label(key), list(group)
+
+    def stats(self, by: str = "month") -> List[PeriodStats]:
+        """Aggregate sessions per month, per year or overall.
+
+        Args:
+            by: "month", "year" or "all"
+
+        Returns:
+            PeriodStats per period, oldest first
+        """
+        results = []
+        for period, rows in self._groups(by):
+            # Rows are contiguous unless the input was out of order
+            if rows and rows[-1] - rows[0] == len(rows) - 1:
+                window = slice(rows[0], rows[-1] + 1)
+                ratings = _valid(self.ratings[window])
+                minutes = _valid(self.minutes[window])
+                dates = self.dates[window]
+                masks = self.repos[window]
+            else:
+                ratings = _valid([self.ratings[i] for i in rows])
+                minutes = _valid([self.minutes[i] for i in rows])
+                dates = [self.dates[i] for i in rows]
+                masks = [self.repos[i] for i in rows]
+
+            repos = {}
+            for bit, name in enumerate(self.repo_names):
+                count = sum(1 for mask in masks if mask >> bit & 1)
+                if count:
+                    repos[name] = count
+
+            results.append(PeriodStats(
+                period=period,
+                sessions=len(rows),
+                days=len(set(dates)),
+                rated=len(ratings),
+                average_rating=math.fsum(ratings) / len(ratings) if ratings else None,
+                timed=len(minutes),
+                total_minutes=math.fsum(minutes),
+                rating_distribution=dict(sorted(Counter(ratings).items())),
+                repos=repos,
+            ))
+        return results
+
+
+def known_repos(root: Optional[Path] = None) -> List[str]:
+    """Collect repo names listed in the year index files."""
+    names: Dict[str, None] = {}
+    for index_md in sorted(_default_root(root).glob("[0-9][0-9][0-9][0-9]/index.md")):
+        for match in _REPO_LIST.finditer(index_md.read_text()):
+            for name in match.group(1).split(","):
+                name = name.strip().strip("`")
+                if name:
+                    names.setdefault(name, None)
+    return list(names)
+
+
+@lru_cache(maxsize=256)
+def _repo_pattern(name: str) -> Pattern:
+    return re.compile(rf"(?<![\w-]){re.escape(name)}(?![\w-])", re.IGNORECASE)
+
+
+def mentioned_repos(session: SessionRecord, repo_names: Iterable[str]) -> List[str]:
+    """Return the repo names mentioned in a session's objective or sections.
+
+    Names match as whole words, so ``front-end`` does not match inside
+    ``front-end-infra``.
+    """
+    text = "\n".join([
+        session.objective or "",
+        *(item for items in session.sections.values() for item in items),
+    ])
+    return [name for name in repo_names if _repo_pattern(name).search(text)]
+
+
+def format_number(value: float) -> str:
+    """Format a rating or count with at most one decimal (9.0 -> "9")."""
+    text = f"{value:.1f}"
+    return text[:-2] if text.endswith(".0") else text
+
+
+def _sessions(count: int) -> str:
+    return f"{count} session" if count == 1 else f"{count} sessions"
+
+
+def _month_name(period: str) -> str:
+    year, month = period.split("-")
+    return f"{calendar.month_name[int(month)]} {year}"
+
+
+def _count(line: str, unit: str, computed: int) -> str:
+    """Text for the ``unit`` ("session" or "day") count on a line.
+
+    The computed value, unless the line holds a larger approximate
+    hand-written count ("~20 sessions", "20+ sessions"), which is kept
+    with a warning ("72+ logged sessions" counts too). Exact counts are
+    always regenerated.
+    """
+    match = re.search(rf"(~\s*(\d+)|(\d+)\+)(?:\s+\w+)?\s+{unit}s?\b", line)
+    if match and int(match.group(2) or match.group(3)) > computed:
+        warnings.warn(
+            f"kept {match.group(1)!r} {unit}s in {line.strip()!r}: computed {computed} is lower",
+            stacklevel=3,
+        )
+        return match.group(1)
+    return str(computed)
+
+
+def _plural(text: str, unit: str) -> str:
+    return f"{text} {unit}" if text == "1" else f"{text} {unit}s"
+
+
+def update_year_index(text: str, months: Dict[str, PeriodStats]) -> str:
+    """Rewrite the computed lines of a year ``index.md``.
+
+    Updates the "(N sessions)" counts in the Monthly Files list (adding
+    lines for months that are missing), the **Total Sessions** and
+    **Average Rating** lines of existing monthly summaries, and the
+    **Total sessions** statistics line. Everything else is kept verbatim.
+
+    The index is partly maintained by hand. Session and day counts are
+    handled separately; an approximate count ("~20", "20+") larger than
+    the computed one is kept with a warning, since the logs for that
+    period are incomplete. Exact counts are always replaced.
+
+    Args:
+        text: Current index.md content
+        months: PeriodStats for the year's months, keyed by "YYYY-MM"
+
+    Returns:
+        Updated index.md content
+    """
+    lines = text.split("\n")
+    listed = set()
+    current: Optional[PeriodStats] = None
+    last_file_line = None
+
+    for i, line in enumerate(lines):
+        file_line = re.match(r"^- \*\*\[(\d{4}-\d{2})\.md\]", line)
+        if file_line:
+            period = file_line.group(1)
+            listed.add(period)
+            last_file_line = i
+            if period in months:
+                count = _count(line, "session", months[period].sessions)
+                lines[i] = re.sub(r"\([^()]*sessions?\)\s*$", f"({_plural(count, 'session')})", line)
+            continue
+
+        summary = re.match(r"^### (\w+) (\d{4}) Summary", line)
+        if summary:
+            month = list(calendar.month_name).index(summary.group(1)) if (
+                summary.group(1) in calendar.month_name
+            ) else 0
+            current = months.get(f"{summary.group(2)}-{month:02d}")
+            continue
+        if line.startswith("## "):
+            current = None
+
+        trailing = line[len(line.rstrip()):]
+        if current is not None and line.startswith("**Total Sessions:**"):
+            sessions = _count(line, "session", current.sessions)
+            days = _count(line, "day", current.days)
+            lines[i] = (
+                f"**Total Sessions:** {_plural(sessions, 'session')} across "
+                f"{_plural(days, 'day')}{trailing}"
+            )
+        elif current is not None and line.startswith("**Average Rating:**"):
+            if current.average_rating is not None:
+                lines[i] = (
+                    f"**Average Rating:** {format_number(current.average_rating)}/10{trailing}"
+                )
+        elif line.startswith("- **Total sessions**:") and months:
+            total = _count(line, "session", sum(stats.sessions for stats in months.values()))
+            first, last = min(months), max(months)
+            lines[i] = re.sub(
+                r"(\*\*Total sessions\*\*: )[~]?\d+\+?( [^(]*)\((?:[^)]*?( [-–] ))?[^)]*\)",
+                lambda m: (
+                    f"{m.group(1)}{total}{m.group(2)}"
+                    f"({_month_name(first).split()[0]}{m.group(3) or ' – '}{_month_name(last)})"
+                ),
+                line,
+            )
+
+    missing = [period for period in sorted(months) if period not in listed]
+    if missing and last_file_line is not None:
+        new_lines = [
+            f"- **[{period}.md]({period}.md)** - {_month_name(period)} "
+            f"({_sessions(months[period].sessions)})"
+            for period in missing
+        ]
+        lines[last_file_line + 1:last_file_line + 1] = new_lines
+
+    return "\n".join(lines)
+
+
+def update_index_files(
+    root: Optional[Path] = None,
+    columns: Optional[SessionColumns] = None,
+    years: Optional[Iterable[str]] = None,
+) -> List[Path]:
+    """Regenerate the computed lines of every year ``index.md``.
+
+    Args:
+        root: Daily-log directory (defaults to ~/.claude/daily-logs)
+        columns: Prebuilt columns (default: built from the sidecar indexes)
+        years: Only update these years' index files
+
+    Returns:
+        Index files that changed
+    """
+    root = _default_root(root)
+    columns = columns if columns is not None else SessionColumns.from_index(root)
+    by_month = {stats.period: stats for stats in columns.stats("month")}
+    years = set(years) if years is not None else None
+
+    changed = []
+    for index_md in sorted(root.glob("[0-9][0-9][0-9][0-9]/index.md")):
+        year = index_md.parent.name
+        if years is not None and year not in years:
+            continue
+        months = {p: s for p, s in by_month.items() if p.startswith(f"{year}-")}
+        text = index_md.read_text()
+        updated = update_year_index(text, months)
+        if updated != text:
+            tmp_path = index_md.with_name(f".{index_md.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(updated)
+            os.replace(tmp_path, index_md)
+            changed.append(index_md)
+    return changed
+
+
+def _print_table(stats: List[PeriodStats], out):
+    out.write(f"{'period':<8} {'sessions':>8} {'days':>5} {'avg':>5} {'hours':>7}\n")
+    for s in stats:
+        average = format_number(s.average_rating) if s.average_rating is not None else "-"
+        out.write(
+            f"{s.period:<8} {s.sessions:>8} {s.days:>5} {average:>5} "
+            f"{s.total_minutes / 60:>7.1f}\n"
+        )
+        if s.repos:
+            repos = ", ".join(f"{name} ({count})" for name, count in s.repos.items())
+            out.write(f"{'':<8} repos: {repos}\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Daily-log session statistics")
+    parser.add_argument("--root", type=Path, default=None,
+                        help="Daily-log directory (default ~/.claude/daily-logs)")
+    parser.add_argument("--year", help="Only report this year")
+    parser.add_argument("--by", choices=["month", "year", "all"], default="month")
+    parser.add_argument("--repos", action="store_true",
+                        help="Parse full sessions to count repo mentions")
+    parser.add_argument("--json", action="store_true", help="Print JSON")
+    parser.add_argument("--update-index", action="store_true",
+                        help="Rewrite computed lines in each year's index.md")
+    args = parser.parse_args(argv)
+
+    root = _default_root(args.root)
+    if args.repos:
+        columns = SessionColumns.from_sessions(iter_all_sessions(root), known_repos(root))
+    else:
+        columns = SessionColumns.from_index(root)
+
+    stats = columns.stats(args.by)
+    if args.year:
+        stats = [s for s in stats if s.period == "all" or s.period.startswith(args.year)]
+
+    if args.json:
+        json.dump([asdict(s) for s in stats], sys.stdout, indent=2, default=str)
+        sys.stdout.write("\n")
+    else:
+        _print_table(stats, sys.stdout)
+
+    if args.update_index:
+        for path in update_index_files(root, columns):
+            print(f"updated {path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+"""Concurrency-safe appends to the daily logs.
+
+Several sessions can finish at once and all write to the same
+``daily-logs/YYYY/YYYY-MM.md``. ``DailyLogWriter.append`` serializes them
+with an advisory ``fcntl`` lock on a hidden ``.YYYY-MM.md.lock`` file next
+to the log, decides whether the date heading exists from the
+``DailyLogIndex`` (no rescan of the month), writes the session with a
+single ``O_APPEND`` write and fsyncs it. With ``update_index_md`` (CLI
+``--update-index``) the year ``index.md`` counters are then regenerated
+under a per-year lock; this is off by default because the hand-written
+year summaries are authoritative.
+
+Usage:
+    python -m agents.tests.lib.daily_log_writer [--root DIR] [--date YYYY-MM-DD] [--update-index] < session.md
+    python -m agents.tests.lib.daily_log_writer --stress [--processes N] [--sessions N] --root DIR
+"""
+
+import argparse
+import calendar
+import os
+import sys
+from dataclasses import dataclass
+from datetime import date as Date
+from pathlib import Path
+from typing import List, Optional
+
+from .common import DateLike, lock_path_for, locked
+from .daily_log_index import DailyLogIndex, DateEntry
+from .daily_log_parser import DATE_HEADING, is_separator
+
+# Bytes read before the write position to decide on separators
+_TAIL_BYTES = 256
+
+_SESSION_OVERVIEW = "### Session Overview"
+
+
+@dataclass
+class AppendResult:
+    """Where and how a session was written."""
+    path: Path
+    date: str
+    session: int  # session number within the date
+    offset: int  # byte offset of the written text
+    size: int  # bytes written
+    created_heading: bool
+
+
+def _last_line(tail: bytes) -> str:
+    lines = tail.decode("utf-8", errors="replace").rstrip().splitlines()
+    return lines[-1] if lines else ""
+
+
+def _gap(tail: bytes) -> str:
+    """Newlines needed so the next text starts after a blank line."""
+    if not tail:
+        return ""
+    trailing = len(tail) - len(tail.rstrip(b"\n"))
+    return "\n" * max(0, 2 - trailing)
+
+
+def _fsync_dir(directory: Path):
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def session_date(body: str) -> Optional[str]:
+    """Return the date of a leading ``## YYYY-MM-DD`` heading, if any."""
+    match = DATE_HEADING.match(body.lstrip())
+    return match.group(1) if match else None
+
+
+def normalize_session(body: str, day: str, session: int) -> str:
+    """Prepare a session body for writing under an existing heading.
+
+    Drops a leading ``## <day>`` heading and trailing ``---`` separators
+    (the writer adds its own) and numbers ``### Session Overview`` for
+    second and later sessions of a day.
+    """
+    lines = body.strip().splitlines()
+    if lines and session_date(lines[0]) == day:
+        lines = lines[1:]
+    while lines and (is_separator(lines[-1]) or not lines[-1].strip()):
+        lines.pop()
+    while lines and not lines[0].strip():
+        lines.pop(0)
+    text = "\n".join(lines)
+    if session > 1 and text.count(_SESSION_OVERVIEW) == 1:
+        text = text.replace(_SESSION_OVERVIEW, f"### Session {session} Overview")
+    return text + "\n"
+
+
+class DailyLogWriter:
+    """Appends sessions to monthly logs under a daily-log root."""
+
+    def __init__(self, root: Optional[Path] = None, update_index_md: bool = False):
+        """Initialize the writer.
+
+        Args:
+            root: Daily-log directory (defaults to ~/.claude/daily-logs)
+            update_index_md: Regenerate the year ``index.md`` counters
+                after each append (off by default)
+        """
+        self.root = Path(root) if root else Path.home() / ".claude" / "daily-logs"
+        self.update_index_md = update_index_md
+        self.index = DailyLogIndex(self.root)
+
+    def append(self, body: str, day: Optional[DateLike] = None) -> AppendResult:
+        """Add a session to the log for ``day`` (default today).
+
+        The date heading is created when the month has none. Sessions for
+        the last date in the file (the normal case) are appended with one
+        ``O_APPEND`` write. A session for an earlier date, whether or not
+        it already has a heading, is inserted before the next later date
+        heading and the file is replaced atomically, so dates stay in order.
+
+        Args:
+            body: Session markdown, with or without the ``## <day>`` heading
+            day: Session date; defaults to the body's heading date, then today
+
+        Returns:
+            AppendResult describing the write
+
+        Raises:
+            ValueError: If ``day`` isn't a ``YYYY-MM-DD`` date or the body's
+                heading names a different date
+        """
+        heading = session_date(body)
+        # Validate and normalize (e.g. "20260301" -> "2026-03-01")
+        day = Date.fromisoformat(str(day or heading or Date.today())).isoformat()
+        if heading is not None and heading != day:
+            raise ValueError(f"Session heading {heading} doesn't match date {day}")
+        path = self.index.month_path(day)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with locked(lock_path_for(path)):
+            fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                month = self.index.load(path)
+                entry = month.dates.get(day) if month else None
+                if month and any(other > day for other in month.dates):
+                    result = self._insert(path, day, body)
+                else:
+                    result = self._append(fd, path, day, body, entry, bool(month and month.dates))
+            finally:
+                os.close(fd)
+
+        if self.update_index_md:
+            self.update_year_index(day[:4])
+        return result
+
+    def _append(
+        self,
+        fd: int,
+        path: Path,
+        day: str,
+        body: str,
+        entry: Optional[DateEntry],
+        has_dates: bool,
+    ) -> AppendResult:
+        offset = os.fstat(fd).st_size
+        tail = _read_tail(path, offset)
+        session = entry.sessions + 1 if entry is not None else 1
+
+        if offset == 0:
+            year, month = int(day[:4]), int(day[5:7])
+            prefix = f"# Daily Logs - {calendar.month_name[month]} {year}\n\n## {day}\n\n"
+        else:
+            prefix = _gap(tail)
+            # Sessions and date sections are closed by a separator
+            if has_dates and _last_line(tail) != "---":
+                prefix += "---\n\n"
+            if entry is None:
+                prefix += f"## {day}\n\n"
+
+        data = (prefix + normalize_session(body, day, session)).encode("utf-8")
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        os.fsync(fd)
+        return AppendResult(path, day, session, offset, len(data), entry is None)
+
+    def _insert(self, path: Path, day: str, body: str) -> AppendResult:
+        month = self.index.load(path)
+        entry = month.dates.get(day)
+        if entry is not None:
+            # End of the existing date section
+            position = min(e.offset for e in month.dates.values() if e.offset > entry.offset)
+            session = entry.sessions + 1
+        else:
+            # Start of the first later date section
+            position = min(e.offset for other, e in month.dates.items() if other > day)
+            session = 1
+
+        content = path.read_bytes()
+        before = content[:position]
+        prefix = _gap(before[-_TAIL_BYTES:])
+        # Close the previous section, unless this goes before the first date
+        closes = entry is not None or any(other < day for other in month.dates)
+        if closes and _last_line(before[-_TAIL_BYTES:]) != "---":
+            prefix += "---\n\n"
+        if entry is None:
+            prefix += f"## {day}\n\n"
+        text = prefix + normalize_session(body, day, session) + "\n---\n\n"
+        data = text.encode("utf-8")
+
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(before + data + content[position:])
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        _fsync_dir(path.parent)
+        return AppendResult(path, day, session, position, len(data), entry is None)
+
+    def update_year_index(self, year: str) -> bool:
+        """Regenerate the counters in ``<root>/<year>/index.md``.
+
+        Returns:
+            True if the file changed
+        """
+        index_md = self.root / year / "index.md"
+        if not index_md.exists():
+            return False
+        # Only needed when regenerating; keeps short-lived CLIs fast
+        from .daily_log_stats import SessionColumns, update_index_files
+
+        with locked(lock_path_for(index_md)):
+            columns = SessionColumns.from_index(self.root, self.index)
+            return bool(update_index_files(self.root, columns, years=[year]))
+
+
+def _read_tail(path: Path, end: int) -> bytes:
+    if end == 0:
+        return b""
+    with open(path, "rb") as f:
+        return os.pread(f.fileno(), min(end, _TAIL_BYTES), max(0, end - _TAIL_BYTES))
+
+
+def _stress_worker(root: str, worker: int, sessions: int, days: List[str]) -> int:
+    writer = DailyLogWriter(Path(root), update_index_md=True)
+    for n in range(sessions):
+        day = days[(worker + n) % len(days)]
+        writer.append(
+            f"### Session Overview\n**Main Objective:** stress worker {worker} session {n}\n"
+            f"**Success Rating:** 9/10\n",
+            day,
+        )
+    return sessions
+
+
+def stress(root: Path, processes: int = 8, sessions: int = 25, days: Optional[List[str]] = None) -> int:
+    """Append from many processes at once (a local stress harness).
+
+    Each worker appends ``sessions`` sessions spread over ``days``.
+
+    Returns:
+        Total sessions written
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    days = days or [str(Date.today())]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [
+            pool.submit(_stress_worker, str(root), worker, sessions, days)
+            for worker in range(processes)
+        ]
+        return sum(future.result() for future in futures)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Append a session to the daily log")
+    parser.add_argument("--root", type=Path, default=None,
+                        help="Daily-log directory (default ~/.claude/daily-logs)")
+    parser.add_argument("--date", help="Session date (default today)")
+    parser.add_argument("--update-index", action="store_true", help="Also regenerate the year index.md counters")
+    parser.add_argument("--stress", action="store_true", help="Run the multi-process stress harness")
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--sessions", type=int, default=25, help="Sessions per stress process")
+    args = parser.parse_args(argv)
+
+    if args.stress:
+        if args.root is None:
+            parser.error("--stress needs an explicit --root")
+        total = stress(args.root, args.processes, args.sessions, [args.date] if args.date else None)
+        print(f"wrote {total} sessions")
+        return 0
+
+    result = DailyLogWriter(args.root, args.update_index).append(sys.stdin.read(), args.date)
+    action = "new heading" if result.created_heading else f"session {result.session}"
+    print(f"{result.path}: {result.date} {action} at byte {result.offset}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
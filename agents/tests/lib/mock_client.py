@@ -1,7 +1,8 @@
 """Mock LLM client for testing Claude agents without API calls."""
 
-from typing import Callable, List, Optional, Union
-from dataclasses import dataclass
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Union
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -105,3 +106,57 @@ def create_callable_mock(fn: Callable[[str], str]) -> MockLLMClient:
         Configured MockLLMClient
     """
     return MockLLMClient(responses=fn)
+
+
+@dataclass
+class MockTextBlock:
+    """Text content block in a mock SDK message."""
+    text: str
+
+
+@dataclass
+class MockToolUse:
+    """Tool use in a mock SDK message."""
+    name: str
+    input: Dict[str, Any]
+    result: Optional[str] = None
+
+
+@dataclass
+class MockSDKMessage:
+    """Message shaped like those streamed by ``claude_agent_sdk.query``."""
+    content: List[Any] = field(default_factory=list)
+    tool_uses: List[MockToolUse] = field(default_factory=list)
+    duration_ms: Optional[int] = None
+
+
+class MockQuery:
+    """Stand-in for ``claude_agent_sdk.query`` that streams scripted messages.
+
+    Pass an instance as ``AgentRunner(query_fn=...)`` to exercise the SDK
+    message-handling path without the SDK or an API key.
+    """
+
+    def __init__(self, messages: List[MockSDKMessage], delay: float = 0.0):
+        """Initialize with the messages to stream.
+
+        Args:
+            messages: Messages yielded in order for every call
+            delay: Seconds to sleep before each message after the first
+        """
+        self.messages = messages
+        self.delay = delay
+        self.calls = 0
+        self.yielded = 0
+        self.closed = False
+
+    async def __call__(self, prompt: str, options: Dict[str, Any]):
+        self.calls += 1
+        try:
+            for index, message in enumerate(self.messages):
+                if index and self.delay:
+                    await asyncio.sleep(self.delay)
+                self.yielded += 1
+                yield message
+        finally:
+            self.closed = True
@@ -0,0 +1,124 @@
+"""Pytest plugin that makes the suite safe and fast under pytest-xdist.
+
+Registered from ``conftest.py``; ``./run_tests.sh parallel`` runs the suite
+with ``pytest -n auto``.
+
+On each xdist worker:
+    * ``HOME`` points at a private temporary directory whose ``.claude``
+      holds symlinks to the real ``~/.claude`` entries, so skills, agents
+      and commands still resolve. ``skills``, ``agents`` and ``commands``
+      are real directories of per-entry symlinks, so a test that adds a
+      skill or file at the top of ``~/.claude`` or of one of those
+      directories only touches the worker's copy; writes *inside* an
+      existing linked entry still reach the real file. The directory is
+      removed when the worker finishes.
+    * The process-wide skill cache is cleared so no entry loaded before
+      ``HOME`` changed is reused.
+    * Tests are collected slowest first, using call durations from earlier
+      runs, so long tests don't start last and leave other workers idle.
+      Every worker reads the same history, which keeps collections
+      identical across workers as xdist requires.
+
+Durations are recorded in the pytest cache (``agents/durations``) by the
+controller only (or by the single process in a serial run), from the
+reports xdist forwards to it; workers never write the cache.
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from .skill_loader import get_skill_cache
+
+
+DURATIONS_KEY = "agents/durations"
+
+# ~/.claude directories tests add entries to; linked per entry, not whole
+SHADOWED_DIRS = ("skills", "agents", "commands")
+
+
+def is_worker(config: pytest.Config) -> bool:
+    """True inside an xdist worker process."""
+    return hasattr(config, "workerinput")
+
+
+def make_worker_home(real_home: Path, worker_id: str) -> Path:
+    """Create an isolated HOME whose ``.claude`` entries link to the real ones.
+
+    Entries named in ``SHADOWED_DIRS`` become real directories holding a
+    symlink per child, so new entries in them stay in the worker home.
+    """
+    home = Path(tempfile.mkdtemp(prefix=f"agents-tests-{worker_id}-"))
+    claude = home / ".claude"
+    claude.mkdir()
+    real_claude = real_home / ".claude"
+    if real_claude.is_dir():
+        for entry in real_claude.iterdir():
+            if entry.name in SHADOWED_DIRS and entry.is_dir():
+                shadow = claude / entry.name
+                shadow.mkdir()
+                for child in entry.iterdir():
+                    (shadow / child.name).symlink_to(child)
+            else:
+                (claude / entry.name).symlink_to(entry)
+    return home
+
+
+def order_by_duration(items: List[pytest.Item], durations: Dict[str, float]) -> None:
+    """Sort ``items`` in place, slowest first.
+
+    Tests without history go first (they may be slow); ties keep
+    collection order.
+    """
+    items.sort(key=lambda item: -durations.get(item.nodeid, float("inf")))
+
+
+class ParallelSupport:
+    """Per-worker isolation, duration-ordered collection and duration history."""
+
+    def __init__(self, config: pytest.Config):
+        self.config = config
+        cache = getattr(config, "cache", None)
+        self.durations: Dict[str, float] = dict(cache.get(DURATIONS_KEY, {})) if cache else {}
+        self._new: Dict[str, float] = {}
+        self._real_home = None
+        self._worker_home = None
+
+        if is_worker(config):
+            worker_id = config.workerinput["workerid"]
+            self._real_home = os.environ.get("HOME")
+            self._worker_home = make_worker_home(Path.home(), worker_id)
+            os.environ["HOME"] = str(self._worker_home)
+            get_skill_cache().clear()
+
+    def pytest_collection_modifyitems(self, config, items):
+        if is_worker(config):
+            order_by_duration(items, self.durations)
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call" and not is_worker(self.config):
+            self._new[report.nodeid] = round(report.duration, 4)
+
+    def pytest_sessionfinish(self, session):
+        cache = getattr(self.config, "cache", None)
+        if cache is None or is_worker(self.config) or not self._new:
+            return
+        self.durations.update(self._new)
+        cache.set(DURATIONS_KEY, self.durations)
+
+    def pytest_unconfigure(self, config):
+        if self._worker_home is None:
+            return
+        if self._real_home is None:
+            os.environ.pop("HOME", None)
+        else:
+            os.environ["HOME"] = self._real_home
+        shutil.rmtree(self._worker_home, ignore_errors=True)
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(ParallelSupport(config), "agents-parallel-support")
@@ -0,0 +1,232 @@
+"""Pytest plugin that reports agent latency, prompt size and token usage.
+
+Registered from ``conftest.py``. Every ``AgentResult`` produced while a test
+runs is recorded against the skill and the test's markers; at session end a
+terminal summary is printed and, optionally, a JSON report is written and
+compared against a baseline.
+
+Under pytest-xdist each worker collects its own records and hands them to
+the controller through ``workeroutput``; the controller merges them and
+does the reporting, so the summary and JSON report cover the whole run.
+
+Options:
+    --perf-report PATH       Write the aggregated report as JSON
+    --perf-baseline PATH     Compare against a previous report
+    --perf-threshold FLOAT   Allowed p95 latency growth before failing
+                             (fraction, default 0.25 = +25%)
+"""
+
+import json
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import pytest
+
+from .agent_runner import add_result_listener, remove_result_listener
+
+
+# Ignore regressions smaller than this; mock runs are sub-millisecond noise
+MIN_REGRESSION_MS = 5.0
+
+# workeroutput key used to send records from xdist workers to the controller
+WORKER_OUTPUT_KEY = "agent_perf_records"
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the nearest-rank percentile of ``values`` (0 if empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate run records into latency, size and token statistics."""
+    records = list(records)
+    latencies = [r["total_ms"] for r in records if r["total_ms"] is not None]
+    prompt_sizes = [r["prompt_bytes"] for r in records if r["prompt_bytes"] is not None]
+    return {
+        "calls": len(records),
+        "failures": sum(1 for r in records if not r["success"]),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "max_ms": round(max(latencies, default=0.0), 3),
+        "prompt_bytes_mean": round(sum(prompt_sizes) / len(prompt_sizes)) if prompt_sizes else 0,
+        "prompt_bytes_max": max(prompt_sizes, default=0),
+        "tool_calls": sum(r["tool_calls"] for r in records),
+        "input_tokens": sum(r["input_tokens"] for r in records),
+        "output_tokens": sum(r["output_tokens"] for r in records),
+    }
+
+
+def build_report(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Group records per skill and per marker and summarize each group."""
+    by_skill: Dict[str, List[Dict[str, Any]]] = {}
+    by_marker: Dict[str, List[Dict[str, Any]]] = {}
+    for record in records:
+        by_skill.setdefault(record["skill"], []).append(record)
+        for marker in record["markers"]:
+            by_marker.setdefault(marker, []).append(record)
+
+    return {
+        "total": summarize(records),
+        "skills": {name: summarize(group) for name, group in sorted(by_skill.items())},
+        "markers": {name: summarize(group) for name, group in sorted(by_marker.items())},
+    }
+
+
+def find_regressions(
+    report: Dict[str, Any],
+    baseline: Dict[str, Any],
+    threshold: float,
+) -> List[str]:
+    """List skills whose p95 latency grew by more than ``threshold``."""
+    regressions = []
+    for name, current in report["skills"].items():
+        previous = baseline.get("skills", {}).get(name)
+        if not previous:
+            continue
+        allowed = previous["p95_ms"] * (1 + threshold)
+        if (
+            current["p95_ms"] > allowed
+            and current["p95_ms"] - previous["p95_ms"] >= MIN_REGRESSION_MS
+        ):
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']:.1f}ms vs baseline "
+                f"{previous['p95_ms']:.1f}ms (+{threshold:.0%} allowed)"
+            )
+    return regressions
+
+
+def _record(item: Optional[pytest.Item], markers: set, runner, result) -> Dict[str, Any]:
+    timing = result.timing
+    usage = result.usage or {}
+    return {
+        "test": item.nodeid if item is not None else None,
+        "skill": runner.skill_name,
+        "markers": sorted(
+            m.name for m in (item.iter_markers() if item is not None else [])
+            if m.name in markers
+        ),
+        "success": result.success,
+        "total_ms": timing.total_ms if timing else None,
+        "first_message_ms": timing.first_message_ms if timing else None,
+        "tool_calls": len(result.tool_calls),
+        "prompt_bytes": result.prompt_bytes,
+        "input_tokens": usage.get("input_tokens", 0) or 0,
+        "output_tokens": usage.get("output_tokens", 0) or 0,
+    }
+
+
+class AgentPerfCollector:
+    """Collects AgentResults per test and reports at session end."""
+
+    def __init__(self, config: pytest.Config):
+        self.config = config
+        self.records: List[Dict[str, Any]] = []
+        self.report: Optional[Dict[str, Any]] = None
+        self.regressions: List[str] = []
+        self._item: Optional[pytest.Item] = None
+        self._markers = {
+            line.split(":", 1)[0].strip() for line in config.getini("markers")
+        }
+        add_result_listener(self._on_result)
+
+    def _on_result(self, runner, result):
+        self.records.append(_record(self._item, self._markers, runner, result))
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        self._item = item
+        try:
+            yield
+        finally:
+            self._item = None
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        """Merge records sent back by an xdist worker."""
+        records = getattr(node, "workeroutput", {}).get(WORKER_OUTPUT_KEY)
+        if records:
+            self.records.extend(json.loads(records))
+
+    def pytest_sessionfinish(self, session):
+        remove_result_listener(self._on_result)
+        workeroutput = getattr(self.config, "workeroutput", None)
+        if workeroutput is not None:
+            workeroutput[WORKER_OUTPUT_KEY] = json.dumps(self.records)
+            return
+        if not self.records:
+            return
+
+        self.report = build_report(self.records)
+
+        report_path = self.config.getoption("perf_report")
+        if report_path:
+            Path(report_path).write_text(json.dumps(self.report, indent=2) + "\n")
+
+        baseline_path = self.config.getoption("perf_baseline")
+        if baseline_path and Path(baseline_path).exists():
+            baseline = json.loads(Path(baseline_path).read_text())
+            threshold = self.config.getoption("perf_threshold")
+            self.regressions = find_regressions(self.report, baseline, threshold)
+            if self.regressions and session.exitstatus == 0:
+                session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.report:
+            return
+
+        tr = terminalreporter
+        tr.write_sep("=", "agent performance")
+        header = (
+            f"{'skill':<32} {'calls':>6} {'p50 ms':>9} {'p95 ms':>9} "
+            f"{'max ms':>9} {'prompt B':>9} {'tokens':>9}"
+        )
+        tr.write_line(header)
+        for name, stats in self.report["skills"].items():
+            tr.write_line(
+                f"{name:<32} {stats['calls']:>6} {stats['p50_ms']:>9.1f} "
+                f"{stats['p95_ms']:>9.1f} {stats['max_ms']:>9.1f} "
+                f"{stats['prompt_bytes_mean']:>9} "
+                f"{stats['input_tokens'] + stats['output_tokens']:>9}"
+            )
+        for name, stats in self.report["markers"].items():
+            tr.write_line(
+                f"{'@' + name:<32} {stats['calls']:>6} {stats['p50_ms']:>9.1f} "
+                f"{stats['p95_ms']:>9.1f} {stats['max_ms']:>9.1f}"
+            )
+
+        if self.regressions:
+            tr.write_sep("-", "performance regressions", red=True)
+            for line in self.regressions:
+                tr.write_line(line, red=True)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("agent-perf", "agent performance reporting")
+    group.addoption(
+        "--perf-report",
+        dest="perf_report",
+        default=None,
+        help="Write per-skill latency/token report JSON to this path",
+    )
+    group.addoption(
+        "--perf-baseline",
+        dest="perf_baseline",
+        default=None,
+        help="Baseline report JSON to compare p95 latency against",
+    )
+    group.addoption(
+        "--perf-threshold",
+        dest="perf_threshold",
+        type=float,
+        default=0.25,
+        help="Allowed p95 growth over baseline before failing (default 0.25)",
+    )
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(AgentPerfCollector(config), "agent-perf-collector")
@@ -0,0 +1,437 @@
+"""Full-text search over daily logs, skills, commands and agents.
+
+An inverted index with positional postings is kept in a SQLite database
+(``~/.claude/search-index/index.sqlite3`` by default). Each daily-log
+session is one document; each skill, command and agent file is another.
+``update()`` re-indexes only source files whose mtime or size changed and
+drops documents for deleted files. ``search()`` ranks matches with BM25,
+supports quoted phrase queries and filters by kind, date range and rating.
+
+Usage:
+    python -m agents.tests.lib.search_index [--root DIR] [--db PATH]
+        [--kind session|skill|command|agent] [--since YYYY-MM-DD]
+        [--until YYYY-MM-DD] [--min-rating N] [--limit N] [--rebuild] QUERY
+"""
+
+import argparse
+import math
+import re
+import sqlite3
+import sys
+from array import array
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .daily_log_parser import iter_sessions, monthly_files
+from .skill_loader import read_frontmatter
+
+SCHEMA_VERSION = 1
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+KINDS = ("session", "skill", "command", "agent")
+
+_TOKEN = re.compile(r"[^\W_]+")
+_QUERY = re.compile(r'"([^"]*)"|(\S+)')
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE sources (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE documents (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    title TEXT NOT NULL,
+    date TEXT,
+    rating REAL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX documents_source ON documents (source);
+CREATE TABLE postings (
+    term TEXT NOT NULL,
+    doc INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    positions BLOB NOT NULL,
+    PRIMARY KEY (term, doc)
+) WITHOUT ROWID;
+CREATE INDEX postings_doc ON postings (doc);
+"""
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens (``front-end`` -> front, end)."""
+    return _TOKEN.findall(text.lower())
+
+
+def parse_query(query: str) -> List[Tuple[str, ...]]:
+    """Split a query into clauses of one or more tokens.
+
+    Quoted text and hyphenated words become phrase clauses; every other
+    word is a single-token clause.
+
+    Returns:
+        Clauses in query order
+    """
+    clauses = []
+    for phrase, word in _QUERY.findall(query):
+        tokens = tuple(tokenize(phrase or word))
+        if tokens:
+            clauses.append(tokens)
+    return clauses
+
+
+@dataclass
+class Document:
+    """A unit of indexed text."""
+    kind: str
+    title: str
+    text: str
+    date: Optional[str] = None
+    rating: Optional[float] = None
+    offset: int = 0  # byte offset of the document in its source file
+
+
+@dataclass
+class SearchHit:
+    """One ranked search result."""
+    score: float
+    kind: str
+    title: str
+    path: Path
+    offset: int
+    date: Optional[str] = None
+    rating: Optional[float] = None
+
+
+@dataclass
+class UpdateStats:
+    """What an ``update()`` call did."""
+    indexed: int = 0    # source files (re)indexed
+    removed: int = 0    # source files dropped
+    unchanged: int = 0  # source files skipped
+    documents: int = 0  # documents written
+
+
+def _session_documents(path: Path) -> Iterator[Document]:
+    for session in iter_sessions(path, keep_body=True):
+        title = f"{session.date} session {session.session}"
+        if session.objective:
+            title = f"{title}: {session.objective}"
+        yield Document("session", title, session.body, session.date, session.rating, session.offset)
+
+
+def _definition_documents(path: Path, kind: str, name: str) -> Iterator[Document]:
+    frontmatter, body = read_frontmatter(path)
+    if not isinstance(frontmatter, dict):
+        frontmatter = {}
+    title = str(frontmatter.get("name") or name)
+    description = str(frontmatter.get("description") or "")
+    yield Document(kind, title, f"{title}\n{description}\n{body.read()}")
+
+
+class SearchIndex:
+    """Persistent inverted index over the ``~/.claude`` markdown corpus."""
+
+    def __init__(self, path: Optional[Path] = None, root: Optional[Path] = None):
+        """Open (creating if needed) the index database.
+
+        Args:
+            path: SQLite file (defaults to <root>/search-index/index.sqlite3)
+            root: Directory holding daily-logs/, skills/, commands/ and
+                agents/ (defaults to ~/.claude)
+        """
+        self.root = Path(root) if root else Path.home() / ".claude"
+        if path is None:
+            path = self.root / "search-index" / "index.sqlite3"
+        self.path = Path(path)
+        if not self.path.parent.exists():
+            self.path.parent.mkdir(parents=True)
+            # Keep the generated index out of the config repo
+            (self.path.parent / ".gitignore").write_text("*\n")
+
+        self._db = sqlite3.connect(self.path)
+        self._ensure_schema()
+
+    def close(self):
+        """Close the database connection."""
+        self._db.close()
+
+    def __enter__(self) -> "SearchIndex":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _ensure_schema(self):
+        try:
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        except sqlite3.OperationalError:
+            row = None
+        if row is not None and row[0] == str(SCHEMA_VERSION):
+            return
+        with self._db:
+            for table in ("meta", "sources", "documents", "postings"):
+                self._db.execute(f"DROP TABLE IF EXISTS {table}")
+            self._db.executescript(_SCHEMA)
+            self._db.execute("INSERT INTO meta VALUES ('version', ?)", (str(SCHEMA_VERSION),))
+
+    def sources(self) -> Iterator[Tuple[Path, str, str]]:
+        """Yield (path, kind, name) for every indexable file under root."""
+        for path in monthly_files(self.root / "daily-logs"):
+            yield path, "session", path.stem
+
+        skills = self.root / "skills"
+        for path in sorted(skills.glob("*/SKILL.md")):
+            yield path, "skill", path.parent.name
+        for path in sorted(skills.glob("*.md")):
+            if path.name != "README.md":
+                yield path, "skill", path.stem
+
+        for directory, kind in (("commands", "command"), ("agents", "agent")):
+            for path in sorted((self.root / directory).glob("*.md")):
+                if path.name != "README.md":
+                    yield path, kind, path.stem
+
+    def update(self) -> UpdateStats:
+        """Bring the index up to date with the files under root.
+
+        Returns:
+            Counts of indexed, removed and unchanged source files
+        """
+        stats = UpdateStats()
+        known = dict(
+            (path, (mtime_ns, size))
+            for path, mtime_ns, size in self._db.execute("SELECT path, mtime_ns, size FROM sources")
+        )
+
+        with self._db:
+            for path, kind, name in self.sources():
+                key = str(path)
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                signature = known.pop(key, None)
+                if signature == (stat.st_mtime_ns, stat.st_size):
+                    stats.unchanged += 1
+                    continue
+
+                self._remove_source(key)
+                if kind == "session":
+                    documents = _session_documents(path)
+                else:
+                    documents = _definition_documents(path, kind, name)
+                for document in documents:
+                    self._add_document(key, document)
+                    stats.documents += 1
+                self._db.execute(
+                    "INSERT OR REPLACE INTO sources VALUES (?, ?, ?)",
+                    (key, stat.st_mtime_ns, stat.st_size),
+                )
+                stats.indexed += 1
+
+            for key in known:
+                self._remove_source(key)
+                self._db.execute("DELETE FROM sources WHERE path = ?", (key,))
+                stats.removed += 1
+
+        return stats
+
+    def rebuild(self) -> UpdateStats:
+        """Drop everything and index all sources from scratch."""
+        with self._db:
+            self._db.execute("DELETE FROM postings")
+            self._db.execute("DELETE FROM documents")
+            self._db.execute("DELETE FROM sources")
+        return self.update()
+
+    def _remove_source(self, key: str):
+        self._db.execute(
+            "DELETE FROM postings WHERE doc IN (SELECT id FROM documents WHERE source = ?)",
+            (key,),
+        )
+        self._db.execute("DELETE FROM documents WHERE source = ?", (key,))
+
+    def _add_document(self, key: str, document: Document):
+        tokens = tokenize(document.text)
+        cursor = self._db.execute(
+            "INSERT INTO documents (source, kind, title, date, rating, offset, length) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, document.kind, document.title, document.date, document.rating,
+             document.offset, len(tokens)),
+        )
+        doc = cursor.lastrowid
+
+        positions: Dict[str, array] = defaultdict(lambda: array("I"))
+        for position, token in enumerate(tokens):
+            positions[token].append(position)
+        self._db.executemany(
+            "INSERT INTO postings VALUES (?, ?, ?, ?)",
+            ((term, doc, len(hits), hits.tobytes()) for term, hits in positions.items()),
+        )
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        kinds: Optional[Sequence[str]] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        min_rating: Optional[float] = None,
+        max_rating: Optional[float] = None,
+    ) -> List[SearchHit]:
+        """Run a ranked query.
+
+        Every clause must match (single words anywhere, phrases as
+        consecutive tokens); matches are ranked by BM25 over all query
+        tokens. Date and rating filters only match sessions.
+
+        Args:
+            query: Words and "quoted phrases"
+            limit: Maximum number of hits
+            kinds: Restrict to these document kinds
+            since: Earliest session date (YYYY-MM-DD, inclusive)
+            until: Latest session date (YYYY-MM-DD, inclusive)
+            min_rating: Lowest session rating
+            max_rating: Highest session rating
+
+        Returns:
+            Hits, best first
+        """
+        clauses = parse_query(query)
+        if not clauses:
+            return []
+
+        postings: Dict[str, Dict[int, Tuple[int, bytes]]] = {}
+        for term in {token for clause in clauses for token in clause}:
+            postings[term] = {
+                doc: (tf, positions)
+                for doc, tf, positions in self._db.execute(
+                    "SELECT doc, tf, positions FROM postings WHERE term = ?", (term,)
+                )
+            }
+
+        # Rarest clause first keeps the candidate set small
+        candidates: Optional[set] = None
+        for clause in sorted(clauses, key=lambda c: min(len(postings[t]) for t in c)):
+            docs = set.intersection(*(set(postings[t]) for t in clause))
+            if candidates is not None:
+                docs &= candidates
+            if len(clause) > 1:
+                docs = {doc for doc in docs if _has_phrase(clause, doc, postings)}
+            candidates = docs
+            if not candidates:
+                return []
+
+        conditions, params = [], []
+        if kinds:
+            conditions.append(f"kind IN ({', '.join('?' * len(kinds))})")
+            params.extend(kinds)
+        for column, op, value in (
+            ("date", ">=", since),
+            ("date", "<=", until),
+            ("rating", ">=", min_rating),
+            ("rating", "<=", max_rating),
+        ):
+            if value is not None:
+                conditions.append(f"{column} {op} ?")
+                params.append(value)
+
+        total, average_length = self._db.execute(
+            "SELECT COUNT(*), AVG(length) FROM documents"
+        ).fetchone()
+        document_frequency = {term: len(docs) for term, docs in postings.items()}
+
+        hits = []
+        ordered = sorted(candidates)
+        for start in range(0, len(ordered), 500):
+            chunk = ordered[start:start + 500]
+            where = " AND ".join([f"id IN ({', '.join('?' * len(chunk))})", *conditions])
+            for doc, kind, title, source, offset, date, rating, length in self._db.execute(
+                "SELECT id, kind, title, source, offset, date, rating, length "
+                f"FROM documents WHERE {where}",
+                (*chunk, *params),
+            ):
+                norm = K1 * (1 - B + B * length / (average_length or 1))
+                score = 0.0
+                for term, docs in postings.items():
+                    if doc in docs:
+                        tf = docs[doc][0]
+                        df = document_frequency[term]
+                        idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+                        score += idf * tf * (K1 + 1) / (tf + norm)
+                hits.append(SearchHit(score, kind, title, Path(source), offset, date, rating))
+
+        hits.sort(key=lambda hit: (-hit.score, hit.title))
+        return hits[:limit]
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+
+def _has_phrase(clause: Tuple[str, ...], doc: int, postings: Dict[str, Dict[int, Tuple[int, bytes]]]) -> bool:
+    positions = []
+    for term in clause:
+        hits = array("I")
+        hits.frombytes(postings[term][doc][1])
+        positions.append(hits)
+    following = [set(hits) for hits in positions[1:]]
+    return any(
+        all(start + i + 1 in hits for i, hits in enumerate(following))
+        for start in positions[0]
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Search daily logs, skills, commands and agents")
+    parser.add_argument("query", nargs="*", help='Words and "quoted phrases"')
+    parser.add_argument("--root", type=Path, default=None, help="Config directory (default ~/.claude)")
+    parser.add_argument("--db", type=Path, default=None, help="Index database path")
+    parser.add_argument("--kind", action="append", choices=KINDS, help="Restrict to a document kind")
+    parser.add_argument("--since", help="Earliest session date (YYYY-MM-DD)")
+    parser.add_argument("--until", help="Latest session date (YYYY-MM-DD)")
+    parser.add_argument("--min-rating", type=float)
+    parser.add_argument("--max-rating", type=float)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--rebuild", action="store_true", help="Re-index everything first")
+    args = parser.parse_args(argv)
+
+    with SearchIndex(args.db, args.root) as index:
+        stats = index.rebuild() if args.rebuild else index.update()
+        if stats.indexed or stats.removed:
+            print(
+                f"indexed {stats.indexed} files ({stats.documents} documents), "
+                f"removed {stats.removed}",
+                file=sys.stderr,
+            )
+        if not args.query:
+            return 0
+
+        hits = index.search(
+            " ".join(args.query),
+            limit=args.limit,
+            kinds=args.kind,
+            since=args.since,
+            until=args.until,
+            min_rating=args.min_rating,
+            max_rating=args.max_rating,
+        )
+        for hit in hits:
+            rating = f"  {hit.rating:g}/10" if hit.rating is not None else ""
+            print(f"{hit.score:6.2f}  {hit.kind:<7}  {hit.title}{rating}")
+            location = f" (byte {hit.offset})" if hit.kind == "session" else ""
+            print(f"        {hit.path}{location}")
+    return 0 if hits else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
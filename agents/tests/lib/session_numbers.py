@@ -0,0 +1,167 @@
+"""Session-number allocation for the second-brain session logs.
+
+The session-log skill writes ``01-sessions/YYYY/MM/YYYY-MM-DD-session-N.md``
+and used to pick ``N`` by listing the month directory, which costs a scan
+per write and races when two sessions finish together. ``allocate`` keeps
+a small per-month counter file, ``.session-counter.json`` (date -> last
+number handed out), and updates it under an exclusive ``flock``. The month
+is scanned once, only when the counter file is missing; after that each
+allocation reads and rewrites a file of at most 31 entries.
+
+Usage:
+    python -m agents.tests.lib.session_numbers [--root DIR] [--date YYYY-MM-DD] [--path]
+    python -m agents.tests.lib.session_numbers --stress [--processes N] [--sessions N] --root DIR
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass
+from datetime import date as Date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .common import DateLike, lock_path_for, locked
+
+DEFAULT_ROOT = Path.home() / "github" / "nicksteffens" / "second-brain" / "01-sessions"
+
+COUNTER_NAME = ".session-counter.json"
+
+_SESSION_FILE = re.compile(r"^(\d{4}-\d{2}-\d{2})-session-(\d+)\.md$")
+
+
+@dataclass
+class SessionSlot:
+    """A session number reserved for one date."""
+    date: str
+    session: int
+    path: Path  # where the session file belongs (not created)
+
+
+def month_dir(root: Path, day: str) -> Path:
+    """Return ``<root>/YYYY/MM`` for a ``YYYY-MM-DD`` date."""
+    year, month, _ = day.split("-")
+    return root / year / month
+
+
+def scan_month(directory: Path) -> Dict[str, int]:
+    """Highest existing session number per date, from the file names."""
+    counts: Dict[str, int] = {}
+    if not directory.is_dir():
+        return counts
+    for entry in os.scandir(directory):
+        match = _SESSION_FILE.match(entry.name)
+        if match:
+            day, number = match.group(1), int(match.group(2))
+            counts[day] = max(counts.get(day, 0), number)
+    return counts
+
+
+def _read_counter(path: Path) -> Optional[Dict[str, int]]:
+    try:
+        data = json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return None
+    return {day: int(number) for day, number in data.items()}
+
+
+def _write_counter(path: Path, counts: Dict[str, int]):
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(dict(sorted(counts.items())), f, indent=2)
+        f.write("\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def allocate(day: Optional[DateLike] = None, root: Optional[Path] = None) -> SessionSlot:
+    """Reserve the next session number for a date.
+
+    Safe across processes: the read-increment-write of the counter happens
+    under an exclusive lock, so concurrent callers always get distinct
+    numbers. A session file that already exists for the candidate number
+    (e.g. written by hand) is skipped over.
+
+    Args:
+        day: Session date (defaults to today)
+        root: Sessions directory (defaults to second-brain ``01-sessions``)
+
+    Returns:
+        The reserved slot
+    """
+    day = str(day or Date.today())
+    Date.fromisoformat(day)  # validate
+    directory = month_dir(Path(root) if root else DEFAULT_ROOT, day)
+    directory.mkdir(parents=True, exist_ok=True)
+    counter = directory / COUNTER_NAME
+
+    with locked(lock_path_for(counter)):
+        counts = _read_counter(counter)
+        if counts is None:
+            counts = scan_month(directory)
+        number = counts.get(day, 0) + 1
+        while (directory / f"{day}-session-{number}.md").exists():
+            number += 1
+        counts[day] = number
+        _write_counter(counter, counts)
+
+    return SessionSlot(day, number, directory / f"{day}-session-{number}.md")
+
+
+def _stress_worker(root: str, sessions: int, days: List[str]) -> List[str]:
+    names = []
+    for n in range(sessions):
+        slot = allocate(days[n % len(days)], Path(root))
+        # O_EXCL: a duplicate number would fail loudly here
+        fd = os.open(slot.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        os.close(fd)
+        names.append(slot.path.name)
+    return names
+
+
+def stress(root: Path, processes: int = 8, sessions: int = 25, days: Optional[List[str]] = None) -> List[str]:
+    """Allocate and create session files from many processes at once.
+
+    Returns:
+        Names of all files created
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    days = days or [str(Date.today())]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(_stress_worker, str(root), sessions, days) for _ in range(processes)]
+        return [name for future in futures for name in future.result()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Reserve the next session-log number")
+    parser.add_argument("--root", type=Path, default=None,
+                        help="Sessions directory (default ~/github/nicksteffens/second-brain/01-sessions)")
+    parser.add_argument("--date", help="Session date (default today)")
+    parser.add_argument("--path", action="store_true", help="Print the session file path instead of N")
+    parser.add_argument("--stress", action="store_true", help="Run the multi-process stress harness")
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--sessions", type=int, default=25, help="Sessions per stress process")
+    args = parser.parse_args(argv)
+
+    if args.stress:
+        if args.root is None:
+            parser.error("--stress needs an explicit --root")
+        names = stress(args.root, args.processes, args.sessions, [args.date] if args.date else None)
+        print(f"created {len(names)} session files, {len(set(names))} unique")
+        return 0 if len(names) == len(set(names)) else 1
+
+    try:
+        slot = allocate(args.date, args.root)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(slot.path if args.path else slot.session)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,323 @@
+"""Indexed lookups over the Shortcut workspace reference data.
+
+``skills/shortcut-workspaces-data.json`` (schema as in
+``shortcut-workspaces-data.sample.json``) maps a workspace key to its name,
+MCP tool prefix, user and teams. ``load_workspaces`` parses it once into
+hash indexes by team name, mention, UUID and workflow_id across all
+workspaces. The compiled form is kept in memory and in a sidecar
+``.shortcut-workspaces-data.json.idx.json`` next to the data file, both
+keyed on the file's mtime and size, so each CLI call reuses it instead of
+re-indexing.
+
+Usage:
+    python -m agents.tests.lib.shortcut_workspaces team QUERY [-w WORKSPACE] [-f FIELD]
+    python -m agents.tests.lib.shortcut_workspaces user [-w WORKSPACE] [-f FIELD]
+    python -m agents.tests.lib.shortcut_workspaces teams [-w WORKSPACE]
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+DEFAULT_PATH = Path.home() / ".claude" / "skills" / "shortcut-workspaces-data.json"
+
+INDEX_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Team:
+    """A Shortcut team in one workspace."""
+    workspace: str
+    name: str
+    uuid: str
+    mention: str
+    workflow_id: Optional[int] = None
+
+
+@dataclass
+class Workspace:
+    """One Shortcut workspace from the data file."""
+    key: str
+    name: str
+    mcp_prefix: str
+    user: Dict = field(default_factory=dict)
+    teams: Tuple[Team, ...] = ()
+
+
+def _name_key(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+def _mention_key(mention: str) -> str:
+    return mention.strip().lstrip("@").lower()
+
+
+class WorkspaceDirectory:
+    """Compiled form of the workspace data file."""
+
+    def __init__(self, data: Dict):
+        """Build indexes from parsed JSON.
+
+        Args:
+            data: Workspace key -> workspace dict; keys starting with "_"
+                (e.g. "_instructions") are ignored
+        """
+        self._reset()
+        for key, raw in data.items():
+            if key.startswith("_") or not isinstance(raw, dict):
+                continue
+            teams = tuple(
+                Team(
+                    workspace=key,
+                    name=team.get("name", ""),
+                    uuid=team.get("uuid", ""),
+                    mention=team.get("mention", ""),
+                    workflow_id=team.get("workflow_id"),
+                )
+                for team in raw.get("teams", [])
+            )
+            self.workspaces[key] = Workspace(
+                key=key,
+                name=raw.get("workspace_name", key),
+                mcp_prefix=raw.get("mcp_prefix", ""),
+                user=raw.get("user", {}),
+                teams=teams,
+            )
+            for team in teams:
+                self._by_name.setdefault(_name_key(team.name), []).append(team)
+                self._by_mention.setdefault(_mention_key(team.mention), []).append(team)
+                self._by_uuid.setdefault(team.uuid.lower(), []).append(team)
+                if team.workflow_id is not None:
+                    self._by_workflow.setdefault(int(team.workflow_id), []).append(team)
+
+    def _reset(self):
+        self.workspaces: Dict[str, Workspace] = {}
+        self._by_name: Dict[str, List[Team]] = {}
+        self._by_mention: Dict[str, List[Team]] = {}
+        self._by_uuid: Dict[str, List[Team]] = {}
+        self._by_workflow: Dict[int, List[Team]] = {}
+
+    def to_compiled(self) -> Dict:
+        """Serializable form with teams stored once and indexes as positions."""
+        teams = self.teams()
+        position = {id(team): i for i, team in enumerate(teams)}
+
+        def positions(index):
+            return {str(key): [position[id(team)] for team in found] for key, found in index.items()}
+
+        return {
+            "workspaces": {
+                key: {"name": ws.name, "mcp_prefix": ws.mcp_prefix, "user": ws.user, "teams": len(ws.teams)}
+                for key, ws in self.workspaces.items()
+            },
+            "teams": [[t.workspace, t.name, t.uuid, t.mention, t.workflow_id] for t in teams],
+            "by_name": positions(self._by_name),
+            "by_mention": positions(self._by_mention),
+            "by_uuid": positions(self._by_uuid),
+            "by_workflow": positions(self._by_workflow),
+        }
+
+    @classmethod
+    def from_compiled(cls, compiled: Dict) -> "WorkspaceDirectory":
+        """Rebuild a directory from ``to_compiled`` output without re-indexing."""
+        directory = cls.__new__(cls)
+        directory._reset()
+        teams = [Team(*fields) for fields in compiled["teams"]]
+        start = 0
+        for key, ws in compiled["workspaces"].items():
+            end = start + ws["teams"]
+            directory.workspaces[key] = Workspace(key, ws["name"], ws["mcp_prefix"], ws["user"], tuple(teams[start:end]))
+            start = end
+        for name in ("by_name", "by_mention", "by_uuid"):
+            setattr(directory, f"_{name}", {k: [teams[i] for i in v] for k, v in compiled[name].items()})
+        directory._by_workflow = {int(k): [teams[i] for i in v] for k, v in compiled["by_workflow"].items()}
+        return directory
+
+    def find(self, query: Union[str, int], workspace: Optional[str] = None) -> List[Team]:
+        """Find teams by name, @mention, UUID or workflow_id.
+
+        Args:
+            query: Any of the team's identifiers (case-insensitive)
+            workspace: Restrict to one workspace key
+
+        Returns:
+            Matching teams (empty if none)
+        """
+        text = str(query).strip()
+        if text.isdigit():
+            candidates = [self._by_workflow.get(int(text), [])]
+        else:
+            candidates = [
+                self._by_uuid.get(text.lower(), []),
+                self._by_mention.get(_mention_key(text), []),
+                self._by_name.get(_name_key(text), []),
+            ]
+        # Filter before falling through, so a match in another workspace
+        # can't shadow the one asked for
+        for matches in candidates:
+            if workspace is not None:
+                matches = [team for team in matches if team.workspace == workspace]
+            if matches:
+                return list(matches)
+        return []
+
+    def team(self, query: Union[str, int], workspace: Optional[str] = None) -> Team:
+        """Return the single team matching ``query``.
+
+        Raises:
+            KeyError: If no team or more than one team matches
+        """
+        matches = self.find(query, workspace)
+        if len(matches) != 1:
+            problem = "No team" if not matches else "Several teams"
+            where = f" in {workspace}" if workspace else ""
+            raise KeyError(f"{problem} matching {query!r}{where}")
+        return matches[0]
+
+    def teams(self, workspace: Optional[str] = None) -> List[Team]:
+        """Return all teams, optionally for one workspace, in file order."""
+        keys = [workspace] if workspace else list(self.workspaces)
+        return [team for key in keys for team in self.workspace(key).teams]
+
+    def workspace(self, key: str) -> Workspace:
+        """Return a workspace by key (e.g. "coherentpath").
+
+        Raises:
+            KeyError: If the data file has no such workspace
+        """
+        try:
+            return self.workspaces[key]
+        except KeyError:
+            raise KeyError(f"Unknown workspace {key!r}") from None
+
+    def user(self, workspace: str) -> Dict:
+        """Return your user record in a workspace."""
+        return self.workspace(workspace).user
+
+    def __len__(self) -> int:
+        return len(self._by_uuid)
+
+
+_cache: Dict[Path, Tuple[int, int, WorkspaceDirectory]] = {}
+_cache_lock = threading.Lock()
+
+
+def index_path_for(path: Path) -> Path:
+    """Return the compiled-index sidecar for a data file."""
+    return path.with_name(f".{path.name}.idx.json")
+
+
+def _read_sidecar(path: Path, stat: os.stat_result) -> Optional[WorkspaceDirectory]:
+    try:
+        data = json.loads(index_path_for(path).read_text())
+        if (data.get("version"), data.get("mtime_ns"), data.get("size")) != (
+                INDEX_VERSION, stat.st_mtime_ns, stat.st_size):
+            return None
+        return WorkspaceDirectory.from_compiled(data["compiled"])
+    except (OSError, ValueError, KeyError, TypeError, IndexError, AttributeError):
+        # Missing, stale or unreadable sidecar: rebuild
+        return None
+
+
+def _write_sidecar(path: Path, stat: os.stat_result, directory: WorkspaceDirectory):
+    sidecar = index_path_for(path)
+    data = {
+        "version": INDEX_VERSION,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "compiled": directory.to_compiled(),
+    }
+    tmp_path = sidecar.with_name(f"{sidecar.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(json.dumps(data, separators=(",", ":")))
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        pass  # read-only directory: still works, just without the sidecar
+
+
+def load_workspaces(path: Optional[Path] = None) -> WorkspaceDirectory:
+    """Load the workspace data file, reusing the compiled form if unchanged.
+
+    Each call costs one ``stat``. Within a process the compiled directory
+    is reused from memory; a new process loads it from the sidecar. The
+    data file is re-read and re-indexed only when its mtime or size
+    changed.
+
+    Args:
+        path: Data file (defaults to ~/.claude/skills/shortcut-workspaces-data.json)
+
+    Raises:
+        FileNotFoundError: If the data file doesn't exist
+    """
+    path = Path(path) if path else DEFAULT_PATH
+    stat = path.stat()
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+    directory = _read_sidecar(path, stat)
+    if directory is None:
+        directory = WorkspaceDirectory(json.loads(path.read_text()))
+        _write_sidecar(path, stat, directory)
+    with _cache_lock:
+        _cache[path] = (stat.st_mtime_ns, stat.st_size, directory)
+    return directory
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Look up Shortcut teams and users")
+    parser.add_argument("--data", type=Path, default=None, help="Workspace data file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    team_parser = commands.add_parser("team", help="Find a team by name, mention, UUID or workflow_id")
+    team_parser.add_argument("query")
+    team_parser.add_argument("-w", "--workspace")
+    team_parser.add_argument("-f", "--field", choices=["name", "uuid", "mention", "workflow_id", "workspace"],
+                             help="Print only this field")
+
+    user_parser = commands.add_parser("user", help="Show your user record")
+    user_parser.add_argument("-w", "--workspace", default="coherentpath")
+    user_parser.add_argument("-f", "--field", help="Print only this field")
+
+    teams_parser = commands.add_parser("teams", help="List teams as a table")
+    teams_parser.add_argument("-w", "--workspace")
+
+    args = parser.parse_args(argv)
+    try:
+        directory = load_workspaces(args.data)
+        if args.command == "team":
+            matches = directory.find(args.query, args.workspace)
+            if not matches:
+                raise KeyError(f"No team matching {args.query!r}")
+            if args.field:
+                directory.team(args.query, args.workspace)  # must be unambiguous
+                print(getattr(matches[0], args.field))
+            else:
+                for team in matches:
+                    print(json.dumps(asdict(team)))
+        elif args.command == "user":
+            user = directory.user(args.workspace)
+            if args.field:
+                if args.field not in user:
+                    raise KeyError(f"No user field {args.field!r} in {args.workspace}")
+                value = user[args.field]
+                print("\n".join(value) if isinstance(value, list) else value)
+            else:
+                print(json.dumps(user, indent=2))
+        else:
+            for team in directory.teams(args.workspace):
+                print(f"{team.name} | {team.uuid} | @{team.mention} | {team.workflow_id}")
+    except (KeyError, FileNotFoundError) as e:
+        print(e.args[0] if isinstance(e, KeyError) else e, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
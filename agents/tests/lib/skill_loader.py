@@ -1,11 +1,19 @@
 """Utilities for loading and parsing Claude Code skill files."""
 
 import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Tuple
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
 import yaml
 
 
+# Small read buffer so frontmatter-only reads touch little more than the header
+_FRONTMATTER_BUFFER = 1024
+
+
 def parse_skill_frontmatter(content: str) -> Tuple[Dict, str]:
     """Parse YAML frontmatter and content from skill markdown.
 
@@ -33,34 +41,355 @@ def parse_skill_frontmatter(content: str) -> Tuple[Dict, str]:
     return frontmatter, remaining_content
 
 
-def load_skill(skill_name: str, skills_dir: Path = None) -> Tuple[Dict, str]:
-    """Load a skill file and parse its frontmatter and content.
+class LazyBody:
+    """Handle to the body of a markdown file, read only when accessed."""
+
+    __slots__ = ("path", "offset", "_text")
+
+    def __init__(self, path: Path, offset: int):
+        """Create a handle to the bytes of ``path`` from ``offset`` onward.
+
+        Args:
+            path: Markdown file
+            offset: Byte offset where the body starts
+        """
+        self.path = path
+        self.offset = offset
+        self._text: Optional[str] = None
+
+    @property
+    def loaded(self) -> bool:
+        """True once the body has been read from disk."""
+        return self._text is not None
+
+    def read(self) -> str:
+        """Read (once) and return the body text."""
+        if self._text is None:
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                self._text = f.read().decode("utf-8")
+        return self._text
+
+    def __str__(self) -> str:
+        return self.read()
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.loaded else "unread"
+        return f"LazyBody({str(self.path)!r}, offset={self.offset}, {state})"
+
+
+def read_frontmatter(path: Path) -> Tuple[Dict, LazyBody]:
+    """Read only the YAML frontmatter of a markdown file.
+
+    The file is streamed line by line up to the closing ``---`` delimiter;
+    the body is returned as a ``LazyBody`` and not read unless accessed.
+    Results match ``parse_skill_frontmatter`` on the full file.
 
     Args:
-        skill_name: Name of the skill (without .md extension)
-        skills_dir: Directory containing skills (defaults to ~/.claude/skills)
+        path: Markdown file with optional frontmatter
 
     Returns:
-        Tuple of (frontmatter_dict, skill_content)
+        Tuple of (frontmatter_dict, lazy_body)
+    """
+    path = Path(path)
+    with open(path, "rb", buffering=_FRONTMATTER_BUFFER) as f:
+        if f.readline().rstrip() != b"---":
+            return {}, LazyBody(path, 0)
 
-    Raises:
-        FileNotFoundError: If skill file doesn't exist
+        lines = []
+        while True:
+            line = f.readline()
+            if line.rstrip() == b"---" and line.endswith(b"\n") and lines:
+                break
+            if not line or line.rstrip() == b"---":
+                # No closing delimiter the regex would accept: all body
+                return {}, LazyBody(path, 0)
+            lines.append(line)
+
+        # Like the regex in parse_skill_frontmatter, swallow blank lines
+        # between the closing delimiter and the body
+        offset = f.tell()
+        while True:
+            line = f.readline()
+            if not line or line.strip() or not line.endswith(b"\n"):
+                break
+            offset = f.tell()
+
+    try:
+        frontmatter = yaml.safe_load(b"".join(lines).decode("utf-8"))
+    except yaml.YAMLError:
+        frontmatter = {}
+
+    return frontmatter, LazyBody(path, offset)
+
+
+def iter_frontmatter(directory: Path, pattern: str = "*.md") -> Iterator[Tuple[Path, Dict, LazyBody]]:
+    """Read frontmatter for every matching file in a directory.
+
+    Useful for indexing agents (``agents/*.md``) and commands
+    (``commands/*.md``) without reading their bodies.
+
+    Args:
+        directory: Directory to scan
+        pattern: Glob pattern for files to include
+
+    Yields:
+        Tuples of (path, frontmatter_dict, lazy_body), sorted by path
+    """
+    for path in sorted(Path(directory).glob(pattern)):
+        if path.is_file():
+            frontmatter, body = read_frontmatter(path)
+            yield path, frontmatter, body
+
+
+class CompiledSkillPrompt:
+    """A skill prompt prepared once and rendered for many user requests.
+
+    The skill body is stripped and joined with the request preamble a single
+    time, so rendering a request is one string concatenation regardless of
+    how large the skill is. The instance is shared through the skill cache,
+    so ``frontmatter`` is a read-only view of a private copy.
+    """
+
+    __slots__ = ("skill_name", "frontmatter", "prefix")
+
+    def __init__(self, skill_name: str, frontmatter: Dict, skill_content: str):
+        """Compile a prompt from parsed skill parts.
+
+        Args:
+            skill_name: Name of the skill
+            frontmatter: Parsed frontmatter dict (copied)
+            skill_content: Skill body (frontmatter removed)
+        """
+        self.skill_name = skill_name
+        frontmatter = _copy_frontmatter(frontmatter)
+        self.frontmatter = MappingProxyType(frontmatter) if isinstance(frontmatter, dict) else frontmatter
+        self.prefix = f"{skill_content.strip()}\n\nUser request: "
+
+    def render(self, user_request: str) -> str:
+        """Render the complete prompt for a single user request.
+
+        Args:
+            user_request: User's request to the skill
+
+        Returns:
+            Complete prompt string
+        """
+        return self.prefix + user_request
+
+    def render_many(self, user_requests: Iterable[str]) -> Iterator[str]:
+        """Lazily render prompts for a batch of user requests.
+
+        Args:
+            user_requests: Iterable of user requests
+
+        Yields:
+            Complete prompt strings, one per request, in input order
+        """
+        prefix = self.prefix
+        for user_request in user_requests:
+            yield prefix + user_request
+
+    def __len__(self) -> int:
+        return len(self.prefix)
+
+    def __repr__(self) -> str:
+        return f"CompiledSkillPrompt({self.skill_name!r}, {len(self.prefix)} chars)"
+
+
+class CacheInfo(NamedTuple):
+    """Snapshot of skill cache statistics."""
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+@dataclass
+class _CacheEntry:
+    """Parsed skill file plus the stat signature it was parsed from."""
+    mtime_ns: int
+    size: int
+    frontmatter: Dict
+    content: str
+    compiled: Optional[CompiledSkillPrompt] = None
+
+
+class SkillCache:
+    """Process-wide LRU cache of parsed skill files.
+
+    Entries are keyed by resolved skill path and revalidated on every lookup
+    with a single ``stat`` (mtime_ns + size), so edits to a SKILL.md are picked
+    up immediately while unchanged files are never re-read or re-parsed.
     """
+
+    def __init__(self, maxsize: int = 128):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of parsed skills to keep
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Path, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, skill_path: Path, stat=None) -> Tuple[Dict, str]:
+        """Return parsed (frontmatter, content) for a skill file.
+
+        Args:
+            skill_path: Path to the skill markdown file
+            stat: Optional ``os.stat_result`` already obtained by the caller
+
+        Returns:
+            Tuple of (frontmatter_dict, skill_content)
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist
+        """
+        entry = self._entry(skill_path, stat)
+        return _copy_frontmatter(entry.frontmatter), entry.content
+
+    def get_compiled(self, skill_path: Path, stat=None) -> CompiledSkillPrompt:
+        """Return the compiled prompt for a skill file, building it once.
+
+        Args:
+            skill_path: Path to the skill markdown file
+            stat: Optional ``os.stat_result`` already obtained by the caller
+
+        Returns:
+            CompiledSkillPrompt tied to the current version of the file
+        """
+        entry = self._entry(skill_path, stat)
+        if entry.compiled is None:
+            name = skill_path.parent.name if skill_path.name == "SKILL.md" else skill_path.stem
+            entry.compiled = CompiledSkillPrompt(name, entry.frontmatter, entry.content)
+        return entry.compiled
+
+    def _entry(self, skill_path: Path, stat=None) -> _CacheEntry:
+        key = skill_path.resolve()
+        if stat is None:
+            stat = key.stat()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if (
+                entry is not None
+                and entry.mtime_ns == stat.st_mtime_ns
+                and entry.size == stat.st_size
+            ):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        frontmatter, content = parse_skill_frontmatter(key.read_text())
+        entry = _CacheEntry(
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            frontmatter=frontmatter,
+            content=content,
+        )
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return entry
+
+    def info(self) -> CacheInfo:
+        """Return current hit/miss counters and size."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self):
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+def _copy_frontmatter(frontmatter):
+    # Callers may mutate the returned dict; never hand out the cached one.
+    return dict(frontmatter) if isinstance(frontmatter, dict) else frontmatter
+
+
+_skill_cache = SkillCache()
+
+
+def get_skill_cache() -> SkillCache:
+    """Return the process-wide skill cache used by ``load_skill``."""
+    return _skill_cache
+
+
+def _stat_or_none(path: Path):
+    try:
+        return path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def _find_skill(skill_name: str, skills_dir: Optional[Path]):
     if skills_dir is None:
         skills_dir = Path.home() / ".claude" / "skills"
 
     # Check for directory structure first (new format)
     skill_path = skills_dir / skill_name / "SKILL.md"
+    stat = _stat_or_none(skill_path)
 
     # Fall back to flat file (old format)
-    if not skill_path.exists():
+    if stat is None:
         skill_path = skills_dir / f"{skill_name}.md"
+        stat = _stat_or_none(skill_path)
 
-    if not skill_path.exists():
+    if stat is None:
         raise FileNotFoundError(f"Skill not found: {skill_path}")
 
-    content = skill_path.read_text()
-    return parse_skill_frontmatter(content)
+    return skill_path, stat
+
+
+def load_skill(skill_name: str, skills_dir: Path = None) -> Tuple[Dict, str]:
+    """Load a skill file and parse its frontmatter and content.
+
+    Parsed results are served from the process-wide ``SkillCache`` and
+    revalidated against the file's mtime and size on every call.
+
+    Args:
+        skill_name: Name of the skill (without .md extension)
+        skills_dir: Directory containing skills (defaults to ~/.claude/skills)
+
+    Returns:
+        Tuple of (frontmatter_dict, skill_content)
+
+    Raises:
+        FileNotFoundError: If skill file doesn't exist
+    """
+    skill_path, stat = _find_skill(skill_name, skills_dir)
+    return _skill_cache.get(skill_path, stat)
+
+
+def compile_skill_prompt(skill_name: str, skills_dir: Path = None) -> CompiledSkillPrompt:
+    """Load a skill and return its compiled prompt template.
+
+    The compiled prompt is cached alongside the parsed skill, so repeated
+    calls for an unchanged file return the same object.
+
+    Args:
+        skill_name: Name of the skill
+        skills_dir: Directory containing skills (defaults to ~/.claude/skills)
+
+    Returns:
+        CompiledSkillPrompt for the skill
+
+    Raises:
+        FileNotFoundError: If skill file doesn't exist
+    """
+    skill_path, stat = _find_skill(skill_name, skills_dir)
+    return _skill_cache.get_compiled(skill_path, stat)
 
 
 def build_skill_prompt(skill_name: str, user_request: str, skills_dir: Path = None) -> str:
@@ -74,9 +403,4 @@ def build_skill_prompt(skill_name: str, user_request: str, skills_dir: Path = No
     Returns:
         Complete prompt string combining skill instructions and user request
     """
-    frontmatter, skill_content = load_skill(skill_name, skills_dir)
-
-    prompt = f"{skill_content.strip()}\n\n"
-    prompt += f"User request: {user_request}"
-
-    return prompt
+    return compile_skill_prompt(skill_name, skills_dir).render(user_request)
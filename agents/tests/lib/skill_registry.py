@@ -0,0 +1,224 @@
+"""Index of available skills, built once instead of probed per lookup."""
+
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .skill_loader import (
+    CompiledSkillPrompt,
+    LazyBody,
+    get_skill_cache,
+    read_frontmatter,
+)
+
+
+@dataclass
+class SkillEntry:
+    """A skill found while scanning a skills directory."""
+    name: str
+    path: Path
+    frontmatter: Dict
+    scope: str  # "global" or "local"
+    body: Optional[LazyBody] = None
+    version: Optional[Tuple[int, int]] = None  # (mtime_ns, size) when read
+
+
+def find_local_skills_dir(start: Optional[Path] = None) -> Optional[Path]:
+    """Find the nearest repo-local ``.claude/skills`` above ``start``.
+
+    The global ``~/.claude/skills`` directory is never returned.
+
+    Args:
+        start: Directory to search upward from (defaults to cwd)
+
+    Returns:
+        Path to the local skills directory, or None
+    """
+    start = (start or Path.cwd()).resolve()
+    home = Path.home().resolve()
+    global_dir = (home / ".claude" / "skills").resolve()
+    for directory in (start, *start.parents):
+        if directory == home:
+            continue
+        candidate = directory / ".claude" / "skills"
+        # HOME may be a symlinked copy (e.g. per test worker); compare targets too
+        if candidate.is_dir() and candidate.resolve() != global_dir:
+            return candidate
+    return None
+
+
+def _mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _version(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _read_entry(name: str, path: Path, scope: str) -> SkillEntry:
+    version = _version(path)
+    frontmatter, body = read_frontmatter(path)
+    return SkillEntry(name, path, frontmatter, scope, body, version)
+
+
+class SkillRegistry:
+    """Name -> skill index over one or more skills directories.
+
+    Directories are scanned once; both the directory format
+    (``<name>/SKILL.md``) and the flat format (``<name>.md``) are indexed,
+    with the directory format winning as in ``load_skill``. When several
+    directories define the same skill, later directories win, so a
+    repo-local ``.claude/skills`` overrides the global one.
+
+    Lookups are answered from memory. ``refresh()`` rescans only when a
+    scanned directory's mtime changed (a skill was added, removed or
+    renamed); with ``refresh_interval`` set, lookups do that check
+    automatically at most once per interval. Scanning reads only each
+    skill's frontmatter, and a lookup re-reads it when that skill file's
+    mtime or size changed, so in-place edits to a SKILL.md are picked up
+    without a rescan. Skill content is read through the shared
+    ``SkillCache`` by ``load``/``compile``, so edits are never served stale.
+    """
+
+    def __init__(
+        self,
+        skills_dirs: Optional[List[Tuple[Path, str]]] = None,
+        refresh_interval: Optional[float] = None,
+    ):
+        """Initialize and scan the registry.
+
+        Args:
+            skills_dirs: (directory, scope) pairs in increasing precedence;
+                defaults to the global ~/.claude/skills plus the nearest
+                repo-local .claude/skills, if any
+            refresh_interval: Seconds between automatic staleness checks
+                on lookup; None disables automatic refresh
+        """
+        if skills_dirs is None:
+            skills_dirs = [(Path.home() / ".claude" / "skills", "global")]
+            local = find_local_skills_dir()
+            if local is not None:
+                skills_dirs.append((local, "local"))
+
+        self.skills_dirs = [(Path(d), scope) for d, scope in skills_dirs]
+        self.refresh_interval = refresh_interval
+        self.scans = 0
+        self._entries: Dict[str, SkillEntry] = {}
+        self._dir_mtimes: Dict[Path, Optional[int]] = {}
+        self._last_check = 0.0
+        self.scan()
+
+    def scan(self):
+        """Rebuild the index from disk."""
+        entries: Dict[str, SkillEntry] = {}
+        dir_mtimes: Dict[Path, Optional[int]] = {}
+
+        for skills_dir, scope in self.skills_dirs:
+            dir_mtimes[skills_dir] = _mtime_ns(skills_dir)
+            try:
+                children = list(os.scandir(skills_dir))
+            except OSError:
+                continue
+
+            found: Dict[str, Path] = {}
+            for child in children:
+                if child.is_dir():
+                    dir_mtimes[Path(child.path)] = child.stat().st_mtime_ns
+                    skill_path = Path(child.path) / "SKILL.md"
+                    if skill_path.is_file():
+                        found[child.name] = skill_path
+                elif (
+                    child.name.endswith(".md")
+                    and child.name != "README.md"
+                    and child.is_file()
+                ):
+                    found.setdefault(child.name[:-3], Path(child.path))
+
+            for name, skill_path in found.items():
+                entries[name] = _read_entry(name, skill_path, scope)
+
+        self._entries = entries
+        self._dir_mtimes = dir_mtimes
+        self._last_check = time.monotonic()
+        self.scans += 1
+
+    def is_stale(self) -> bool:
+        """Check whether any scanned directory changed since the last scan."""
+        return any(
+            _mtime_ns(directory) != mtime
+            for directory, mtime in self._dir_mtimes.items()
+        )
+
+    def refresh(self) -> bool:
+        """Rescan if the skills directories changed.
+
+        Returns:
+            True if a rescan happened
+        """
+        self._last_check = time.monotonic()
+        if self.is_stale():
+            self.scan()
+            return True
+        return False
+
+    def _maybe_refresh(self):
+        if (
+            self.refresh_interval is not None
+            and time.monotonic() - self._last_check >= self.refresh_interval
+        ):
+            self.refresh()
+
+    def _current(self, entry: SkillEntry) -> SkillEntry:
+        """Return ``entry``, re-read if its file changed in place."""
+        version = _version(entry.path)
+        if version is None or version == entry.version:
+            return entry
+        entry = _read_entry(entry.name, entry.path, entry.scope)
+        self._entries[entry.name] = entry
+        return entry
+
+    def get(self, name: str) -> SkillEntry:
+        """Look up a skill by name.
+
+        Raises:
+            FileNotFoundError: If no scanned directory defines the skill
+        """
+        self._maybe_refresh()
+        try:
+            entry = self._entries[name]
+        except KeyError:
+            raise FileNotFoundError(f"Skill not found in registry: {name}") from None
+        return self._current(entry)
+
+    def load(self, name: str) -> Tuple[Dict, str]:
+        """Load a skill's (frontmatter, content), like ``load_skill``."""
+        return get_skill_cache().get(self.get(name).path)
+
+    def compile(self, name: str) -> CompiledSkillPrompt:
+        """Return a skill's compiled prompt, like ``compile_skill_prompt``."""
+        return get_skill_cache().get_compiled(self.get(name).path)
+
+    def names(self) -> List[str]:
+        """Return all indexed skill names, sorted."""
+        self._maybe_refresh()
+        return sorted(self._entries)
+
+    def __contains__(self, name: str) -> bool:
+        self._maybe_refresh()
+        return name in self._entries
+
+    def __iter__(self) -> Iterator[SkillEntry]:
+        self._maybe_refresh()
+        return iter([self._current(self._entries[name]) for name in sorted(self._entries)])
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,10 +1,157 @@
 """Output validation utilities for agent tests."""
 
+import abc
+import copy
+import hashlib
+import mmap
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
 import re
 
 
+@dataclass(frozen=True)
+class PatternMatch:
+    """A single rule match found by ``ValidationEngine``."""
+    rule: str
+    start: int
+    end: int
+    text: str
+
+
+class ValidationEngine:
+    """Scans content once for many named patterns.
+
+    All rules are combined into a single pre-compiled alternation, so an
+    output is walked once no matter how many rules are registered. The
+    alternation is unnamed so ``re`` keeps its first-character prefilter;
+    each hit is then attributed by matching the individual rules at that
+    offset. Flags that differ per rule are written as scoped groups, e.g.
+    ``(?i:...)`` or ``(?m:^...)``. Rule patterns must not define named
+    groups or numbered backreferences.
+    """
+
+    def __init__(self, rules: Iterable[Tuple[str, str]]):
+        """Compile the engine.
+
+        Args:
+            rules: (name, regex) pairs; earlier rules are reported first
+                when several match at the same offset
+        """
+        self.rules = tuple(rules)
+        self._names = [name for name, _ in self.rules]
+        self._patterns = [re.compile(pattern) for _, pattern in self.rules]
+        self._combined = re.compile("|".join(f"(?:{pattern})" for _, pattern in self.rules))
+
+    @classmethod
+    def from_literals(cls, literals: Iterable[str], ignore_case: bool = False) -> "ValidationEngine":
+        """Build an engine matching plain substrings, each named by itself."""
+        flag = "(?i:{})" if ignore_case else "{}"
+        return cls((text, flag.format(re.escape(text))) for text in literals)
+
+    def finditer(self, content: str, pos: int = 0, endpos: Optional[int] = None) -> Iterator[PatternMatch]:
+        """Yield every rule match in ``content``, ordered by offset.
+
+        Overlapping matches are reported too, including different rules
+        starting at the same offset.
+
+        Args:
+            content: Text to scan
+            pos: First offset a match may start at
+            endpos: Matches must start before this offset (they may extend
+                past it); defaults to the end of ``content``
+        """
+        if not self.rules:
+            return
+        if endpos is None:
+            endpos = len(content) + 1
+        search = self._combined.search
+        while pos <= len(content):
+            hit = search(content, pos)
+            if hit is None or hit.start() >= endpos:
+                return
+            start = hit.start()
+            for name, pattern in zip(self._names, self._patterns):
+                m = pattern.match(content, start)
+                if m is not None:
+                    yield PatternMatch(name, start, m.end(), m.group())
+            pos = start + 1
+
+    def scan(self, content: str) -> List[PatternMatch]:
+        """Return every rule match in ``content``."""
+        return list(self.finditer(content))
+
+    def search(self, content: str) -> Optional[PatternMatch]:
+        """Return the first match in ``content``, or None."""
+        return next(self.finditer(content), None)
+
+    def matched_rules(self, content: str) -> Set[str]:
+        """Return the names of rules that match, stopping once all have."""
+        found: Set[str] = set()
+        for match in self.finditer(content):
+            found.add(match.rule)
+            if len(found) == len(self.rules):
+                break
+        return found
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def __repr__(self) -> str:
+        return f"ValidationEngine({len(self.rules)} rules)"
+
+
+@lru_cache(maxsize=64)
+def _literal_engine(literals: Tuple[str, ...], ignore_case: bool = False) -> ValidationEngine:
+    return ValidationEngine.from_literals(literals, ignore_case)
+
+
+PATH_TRAVERSAL_PATTERNS = ("..", "~", "/etc/", "/root/", "/var/")
+
+COMMAND_INJECTION_RULES = (
+    ("command_substitution", r"\$\("),
+    ("backtick", r"`"),
+    ("chained_rm", r";\s*rm"),
+    ("pipe_to_shell", r"\|\s*sh"),
+    ("redirect_to_device", r">\s*/dev/"),
+)
+
+MALFORMED_HEADING_RULE = ("malformed_heading", r"(?m:^#{1,6}[^\s#])")
+
+SESSION_TEMPLATE_SECTIONS = (
+    "Main Objectives",
+    "What Went Well",
+    "Challenges",
+    "Key Decisions",
+    "Follow-up Items",
+)
+
+
+@lru_cache(maxsize=None)
+def default_engine() -> ValidationEngine:
+    """Engine combining the built-in security, heading and template rules.
+
+    Rule names are prefixed ``path_traversal:``, ``injection:``,
+    ``markdown:`` and ``section:``, so one scan of a transcript or daily log
+    answers every built-in check.
+    """
+    rules = [
+        (f"path_traversal:{text}", f"(?i:{re.escape(text)})")
+        for text in PATH_TRAVERSAL_PATTERNS
+    ]
+    rules += [(f"injection:{name}", pattern) for name, pattern in COMMAND_INJECTION_RULES]
+    rules.append((f"markdown:{MALFORMED_HEADING_RULE[0]}", MALFORMED_HEADING_RULE[1]))
+    rules += [(f"section:{text}", re.escape(text)) for text in SESSION_TEMPLATE_SECTIONS]
+    return ValidationEngine(rules)
+
+
+_command_injection_engine = ValidationEngine(COMMAND_INJECTION_RULES)
+_heading_engine = ValidationEngine([MALFORMED_HEADING_RULE])
+
+
 class FileStructureValidator:
     """Validates file paths and structure."""
 
@@ -67,10 +214,10 @@ class TemplateValidator:
         Returns:
             True if all sections present
         """
-        for section in required_sections:
-            if section not in content:
-                return False
-        return True
+        sections = tuple(dict.fromkeys(required_sections))
+        if not sections:
+            return True
+        return len(_literal_engine(sections).matched_rules(content)) == len(sections)
 
     @staticmethod
     def has_complete_template(content: str) -> bool:
@@ -82,14 +229,7 @@ class TemplateValidator:
         Returns:
             True if template is complete
         """
-        required = [
-            "Main Objectives",
-            "What Went Well",
-            "Challenges",
-            "Key Decisions",
-            "Follow-up Items"
-        ]
-        return TemplateValidator.has_required_sections(content, required)
+        return TemplateValidator.has_required_sections(content, SESSION_TEMPLATE_SECTIONS)
 
 
 class MarkdownValidator:
@@ -106,8 +246,7 @@ class MarkdownValidator:
             True if headings are valid
         """
         # Check for malformed headings (missing space after #)
-        malformed = re.findall(r'^#{1,6}[^\s#]', content, re.MULTILINE)
-        return len(malformed) == 0
+        return _heading_engine.search(content) is None
 
     @staticmethod
     def no_duplicate_date_headings(content: str, date_str: str) -> bool:
@@ -139,9 +278,117 @@ class MarkdownValidator:
         if not new_content.endswith(insertion):
             return False
 
-        # Check that everything before the insertion matches original
-        expected_prefix = new_content[:-len(insertion)]
-        return original_content.strip() == expected_prefix.strip()
+        # Compare the stripped original against the stripped prefix of
+        # new_content in place, without slicing new_content
+        core = original_content.strip()
+        prefix_end = len(new_content) - len(insertion) if insertion else 0
+        start = 0
+        while start < prefix_end and new_content[start].isspace():
+            start += 1
+        end = prefix_end
+        while end > start and new_content[end - 1].isspace():
+            end -= 1
+        return end - start == len(core) and new_content.startswith(core, start, end)
+
+
+@contextmanager
+def _mapped(path: Path):
+    """Memory-map a file read-only (empty files map to ``b""``)."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            yield m
+
+
+_WHITESPACE = b" \t\n\r\x0b\x0c"
+
+
+def _digest(data, end: int) -> str:
+    """SHA-256 of ``data[:end]`` without copying it."""
+    view = memoryview(data)[:end]
+    try:
+        return hashlib.sha256(view).hexdigest()
+    finally:
+        view.release()
+
+
+@dataclass(frozen=True)
+class AppendSnapshot:
+    """State of a file captured before an append, for ``verify``.
+
+    Only the region just before the original's trailing whitespace (the
+    append boundary) is kept, plus a SHA-256 digest of everything up to it,
+    so verifying an append to a large log touches O(insertion) bytes unless
+    the full-prefix check is requested.
+    """
+    path: Path
+    core_end: int  # offset just past the original's last non-whitespace byte
+    boundary: bytes
+    digest: str
+
+    @classmethod
+    def capture(cls, path: Path, boundary_bytes: int = 4096) -> "AppendSnapshot":
+        """Snapshot a file before it is appended to.
+
+        Args:
+            path: File about to be appended to (missing files count as empty)
+            boundary_bytes: Bytes before the append boundary to keep
+
+        Returns:
+            AppendSnapshot for the current file contents
+        """
+        path = Path(path)
+        if not path.exists():
+            return cls(path, 0, b"", _digest(b"", 0))
+
+        with _mapped(path) as m:
+            core_end = len(m)
+            while core_end > 0 and m[core_end - 1] in _WHITESPACE:
+                core_end -= 1
+            digest = _digest(m, core_end)
+            boundary = bytes(m[max(0, core_end - boundary_bytes):core_end])
+        return cls(path, core_end, boundary, digest)
+
+    def verify(self, insertion=None, full: bool = False) -> bool:
+        """Check that the file was only appended to since the snapshot.
+
+        The original content up to its trailing whitespace must be
+        unchanged; that whitespace may be replaced by any whitespace before
+        the insertion, mirroring ``MarkdownValidator.appends_to_end``.
+
+        Args:
+            insertion: Text (str or bytes) the file must now end with;
+                None accepts any appended content
+            full: Also hash the whole original prefix instead of trusting
+                the boundary region and file size
+
+        Returns:
+            True if the file is the original plus an append
+        """
+        if isinstance(insertion, str):
+            insertion = insertion.encode("utf-8")
+        if not self.path.exists():
+            return False
+
+        with _mapped(self.path) as m:
+            size = len(m)
+            if size < self.core_end:
+                return False
+
+            start = self.core_end - len(self.boundary)
+            if m[start:self.core_end] != self.boundary:
+                return False
+
+            if insertion is not None:
+                gap_end = size - len(insertion)
+                if gap_end < self.core_end or m[gap_end:size] != insertion:
+                    return False
+                if m[self.core_end:gap_end].strip(_WHITESPACE):
+                    return False
+
+            return not full or _digest(m, self.core_end) == self.digest
 
 
 class SecurityValidator:
@@ -157,16 +404,7 @@ class SecurityValidator:
         Returns:
             True if no traversal detected
         """
-        dangerous_patterns = [
-            "..",
-            "~",
-            "/etc/",
-            "/root/",
-            "/var/",
-        ]
-
-        path_lower = path.lower()
-        return not any(pattern in path_lower for pattern in dangerous_patterns)
+        return _literal_engine(PATH_TRAVERSAL_PATTERNS, True).search(path) is None
 
     @staticmethod
     def no_command_injection(content: str) -> bool:
@@ -178,16 +416,257 @@ class SecurityValidator:
         Returns:
             True if no injection patterns found
         """
-        dangerous_patterns = [
-            r'\$\(',  # Command substitution
-            r'`',     # Backtick execution
-            r';\s*rm',  # Chained dangerous commands
-            r'\|\s*sh',
-            r'>\s*/dev/',
-        ]
+        return _command_injection_engine.search(content) is None
 
-        for pattern in dangerous_patterns:
-            if re.search(pattern, content):
-                return False
 
-        return True
+def _hold_start(buffer: str, overlap: int) -> int:
+    """Offset where the last ``overlap`` non-whitespace characters begin."""
+    i = len(buffer)
+    seen = 0
+    while i > 0 and seen < overlap:
+        i -= 1
+        if not buffer[i].isspace():
+            seen += 1
+    return i
+
+
+class StreamingValidator(abc.ABC):
+    """Chunk-fed validator that never holds the full output in memory.
+
+    Content is passed in arbitrary pieces through ``feed``; the end of each
+    piece is carried over so patterns split across chunk boundaries are
+    still found. The carried region spans the last ``overlap`` non-whitespace
+    characters, so runs of whitespace inside a pattern (``;\\s*rm``) cannot
+    push its start out of view. Rules must start with a non-whitespace
+    character and contain at most ``overlap + 1`` non-whitespace characters.
+
+    Results equal those of the matching whole-content validator once
+    ``finish`` has been called. Subclasses implement ``ok`` and
+    ``_on_match``.
+    """
+
+    def __init__(self, engine: ValidationEngine, overlap: int):
+        """Initialize the validator.
+
+        Args:
+            engine: Rules to scan for
+            overlap: Non-whitespace characters to carry between chunks
+        """
+        self.engine = engine
+        self.overlap = max(overlap, 1)
+        self.reset()
+
+    def reset(self):
+        """Forget all fed content."""
+        self._buffer = ""
+        self._base = 0  # absolute offset of _buffer[0]
+        self._pos = 0   # next unscanned offset within _buffer
+        self._reported = set()
+        self._done = False
+        self.finished = False
+
+    def fresh(self) -> "StreamingValidator":
+        """Return an unfed copy with the same configuration."""
+        clone = copy.copy(self)
+        clone.reset()
+        return clone
+
+    @property
+    @abc.abstractmethod
+    def ok(self) -> bool:
+        """Whether the content fed so far passes."""
+
+    def feed(self, chunk: str) -> bool:
+        """Validate the next piece of content.
+
+        Returns:
+            ``ok`` after this chunk
+        """
+        if chunk and not self._done:
+            self._buffer += chunk
+            self._scan(_hold_start(self._buffer, self.overlap))
+        return self.ok
+
+    def finish(self) -> bool:
+        """Validate the carried tail and return the final result."""
+        if not self._done:
+            self._scan(len(self._buffer))
+        self._done = True
+        self.finished = True
+        return self.ok
+
+    def _scan(self, end: int):
+        # Matches already complete in the carried tail are reported now;
+        # the tail is rescanned next time, so remember what was reported
+        buffer = self._buffer
+        for match in self.engine.finditer(buffer, self._pos):
+            start = match.start + self._base
+            key = (match.rule, start)
+            if key in self._reported:
+                continue
+            if match.start >= end:
+                self._reported.add(key)
+            self._on_match(PatternMatch(match.rule, start, match.end + self._base, match.text))
+            if self._done:
+                break
+        self._pos = max(self._pos, end)
+
+        # Keep one character before the unscanned region so "^" still sees
+        # whether it follows a newline
+        keep = max(0, self._pos - 1)
+        self._buffer = buffer[keep:]
+        self._base += keep
+        self._pos -= keep
+        self._reported = {
+            key for key in self._reported if key[1] >= self._base + self._pos
+        }
+
+    @abc.abstractmethod
+    def _on_match(self, match: PatternMatch):
+        """Record a rule match at an absolute offset."""
+
+    def __call__(self, content: str) -> bool:
+        """Validate a complete string in one go (state is reset first)."""
+        self.reset()
+        self.feed(content)
+        return self.finish()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class _FirstViolationValidator(StreamingValidator):
+    """Fails on the first match and stops scanning."""
+
+    def reset(self):
+        super().reset()
+        self.violation: Optional[PatternMatch] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.violation is None
+
+    def _on_match(self, match: PatternMatch):
+        self.violation = match
+        self._done = True
+
+
+class StreamingSecurityValidator(_FirstViolationValidator):
+    """Chunk-fed ``SecurityValidator.no_command_injection``.
+
+    Path traversal is checked by ``StreamingPathTraversalValidator``; use
+    both to cover everything ``SecurityValidator`` checks.
+    """
+
+    def __init__(self):
+        super().__init__(_command_injection_engine, overlap=8)
+
+
+class StreamingPathTraversalValidator(_FirstViolationValidator):
+    """Chunk-fed ``SecurityValidator.no_path_traversal``."""
+
+    def __init__(self):
+        engine = _literal_engine(PATH_TRAVERSAL_PATTERNS, True)
+        super().__init__(engine, overlap=max(len(text) for text in PATH_TRAVERSAL_PATTERNS))
+
+
+class StreamingTemplateValidator(StreamingValidator):
+    """Chunk-fed ``TemplateValidator.has_required_sections``.
+
+    Passes while content is still arriving; ``finish`` fails if any
+    required section was never seen. Scanning stops once all are found.
+    """
+
+    def __init__(self, required_sections: Iterable[str] = SESSION_TEMPLATE_SECTIONS):
+        """Initialize the validator.
+
+        Args:
+            required_sections: Section headers that must all appear
+                (defaults to the session log template)
+        """
+        self.required_sections = tuple(dict.fromkeys(required_sections))
+        longest = max((len(s) for s in self.required_sections), default=1)
+        super().__init__(_literal_engine(self.required_sections), overlap=longest - 1)
+
+    def reset(self):
+        super().reset()
+        self.found: Set[str] = set()
+        if not self.required_sections:
+            self._done = True
+
+    @property
+    def missing(self) -> List[str]:
+        """Required sections not seen so far, in declaration order."""
+        return [s for s in self.required_sections if s not in self.found]
+
+    @property
+    def ok(self) -> bool:
+        return not self.finished or not self.missing
+
+    def _on_match(self, match: PatternMatch):
+        self.found.add(match.rule)
+        if len(self.found) == len(self.required_sections):
+            self._done = True
+
+    def __repr__(self) -> str:
+        return f"StreamingTemplateValidator({list(self.required_sections)!r})"
+
+
+class StreamingMarkdownValidator(StreamingValidator):
+    """Chunk-fed ``MarkdownValidator`` heading checks.
+
+    Fails on the first malformed heading and, when ``date_str`` is given,
+    on a second ``## <date>`` heading.
+    """
+
+    def __init__(self, date_str: Optional[str] = None):
+        """Initialize the validator.
+
+        Args:
+            date_str: Date whose heading may appear at most once
+        """
+        self.date_str = date_str
+        rules = [MALFORMED_HEADING_RULE]
+        if date_str is not None:
+            rules.append(("duplicate_date_heading", f"(?m:^## {re.escape(date_str)})"))
+        overlap = max(7, len(date_str or "") + 3)
+        super().__init__(ValidationEngine(rules), overlap=overlap)
+
+    def reset(self):
+        super().reset()
+        self.violation: Optional[PatternMatch] = None
+        self.date_headings = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.violation is None
+
+    def _on_match(self, match: PatternMatch):
+        if match.rule == "duplicate_date_heading":
+            self.date_headings += 1
+            if self.date_headings < 2:
+                return
+        self.violation = match
+        self._done = True
+
+    def __repr__(self) -> str:
+        return f"StreamingMarkdownValidator(date_str={self.date_str!r})"
+
+
+def feed_file(validator: StreamingValidator, path: Path, block_size: int = 64 * 1024) -> bool:
+    """Validate a file by feeding it to ``validator`` in blocks.
+
+    Args:
+        validator: Streaming validator (reset before use)
+        path: File to read
+        block_size: Characters per block
+
+    Returns:
+        The validator's final result
+    """
+    validator.reset()
+    with open(path, encoding="utf-8") as f:
+        for block in iter(lambda: f.read(block_size), ""):
+            if not validator.feed(block):
+                break
+    return validator.finish()
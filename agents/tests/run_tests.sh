@@ -17,10 +17,40 @@ fi
 # Activate virtual environment
 source .venv/bin/activate
 
-# Install/upgrade dependencies
-echo "Installing test dependencies..."
-pip install -q --upgrade pip
-pip install -q -r requirements-test.txt
+REQUIREMENTS="requirements-test.txt"
+WHEELHOUSE=".wheelhouse"
+FINGERPRINT_FILE=".venv/.requirements-fingerprint"
+
+# Build wheels for offline installs into fresh venvs, then stop
+if [ "${1:-}" = "wheelhouse" ]; then
+    echo "Building wheelhouse in $WHEELHOUSE..."
+    pip wheel -q -r "$REQUIREMENTS" -w "$WHEELHOUSE"
+    echo "Done. Fresh venvs will install from $WHEELHOUSE without network access."
+    exit 0
+fi
+
+# Hash of the requirements and interpreter; reinstall only when it changes
+# (delete $FINGERPRINT_FILE to force a reinstall)
+FINGERPRINT=$(python - "$REQUIREMENTS" <<'PY'
+import hashlib, sys
+digest = hashlib.sha256(sys.version.encode())
+digest.update(open(sys.argv[1], "rb").read())
+print(digest.hexdigest())
+PY
+)
+
+if [ "$(cat "$FINGERPRINT_FILE" 2>/dev/null)" != "$FINGERPRINT" ]; then
+    echo "Installing test dependencies..."
+    if [ -d "$WHEELHOUSE" ]; then
+        pip install -q --no-index --find-links "$WHEELHOUSE" -r "$REQUIREMENTS" \
+            || pip install -q --find-links "$WHEELHOUSE" -r "$REQUIREMENTS"
+    else
+        pip install -q -r "$REQUIREMENTS"
+    fi
+    echo "$FINGERPRINT" > "$FINGERPRINT_FILE"
+else
+    echo "Test dependencies up to date"
+fi
 
 echo
 echo "=== Running Tests ==="
@@ -32,6 +62,10 @@ case "${1:-all}" in
         echo "Running all tests..."
         pytest integration/ -v
         ;;
+    parallel)
+        echo "Running all tests in parallel (${PYTEST_WORKERS:-auto} workers)..."
+        pytest integration/ -n "${PYTEST_WORKERS:-auto}" -q
+        ;;
     daily-log)
         echo "Running daily-log tests..."
         pytest integration/daily_log/ -v
@@ -51,14 +85,16 @@ case "${1:-all}" in
         echo "Coverage report generated in htmlcov/index.html"
         ;;
     *)
-        echo "Usage: $0 [all|daily-log|critical|security|coverage]"
+        echo "Usage: $0 [all|parallel|daily-log|critical|security|coverage|wheelhouse]"
         echo
         echo "Options:"
-        echo "  all       - Run all tests (default)"
-        echo "  daily-log - Run only daily-log skill tests"
-        echo "  critical  - Run only critical tests for known bugs"
-        echo "  security  - Run only security tests"
-        echo "  coverage  - Run tests with coverage report"
+        echo "  all        - Run all tests (default)"
+        echo "  parallel   - Run all tests across CPU cores (PYTEST_WORKERS=N to override)"
+        echo "  daily-log  - Run only daily-log skill tests"
+        echo "  critical   - Run only critical tests for known bugs"
+        echo "  security   - Run only security tests"
+        echo "  coverage   - Run tests with coverage report"
+        echo "  wheelhouse - Prebuild wheels in .wheelhouse/ for offline installs"
         exit 1
         ;;
 esac